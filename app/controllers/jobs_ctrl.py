@@ -0,0 +1,196 @@
+"""
+Controller for background jobs: enqueueing, status lookup and the handlers run by workers.
+"""
+import os
+import uuid
+import logging
+from typing import Awaitable, Optional
+
+import aiofiles
+from beanie import PydanticObjectId
+from fastapi import HTTPException, UploadFile
+
+from app.env_settings import env
+from app.controllers.mom_ctrl import MoMController
+from app.models.database.jobs_collection import JobCollection
+from app.models.database.meeting_collection import MeetingCollection
+from app.schemas.common_schema import UserJWT
+from app.schemas.mom_schema import GenerateMoMRequest
+from app.services.job_queue import JobQueue, JobHandler, DeadJobHook, PermanentJobError
+from app.services.storage import StorageService
+
+logger = logging.getLogger(__name__)
+
+# Job kinds
+MOM_FROM_TEXT = "mom_from_text"
+MOM_FROM_AUDIO = "mom_from_audio"
+MOM_FROM_RECORDING = "mom_from_recording"
+
+job_queue = JobQueue()
+
+# Uploaded audio waiting for a background job (not publicly served)
+upload_storage = StorageService(base_dir=os.path.join(env.AUDIO_DIR_PATH or "recordings", "job_uploads"))
+
+
+def _oid(value: Optional[str]) -> Optional[PydanticObjectId]:
+    return PydanticObjectId(value) if value else None
+
+
+async def enqueue_mom_from_text(request: GenerateMoMRequest, current_user: UserJWT, bypass_cache: bool = False) -> JobCollection:
+    """
+    Queues MoM generation from a transcript.
+    """
+    return await job_queue.enqueue(
+        MOM_FROM_TEXT,
+        {**request.model_dump(mode="json"), "bypass_cache": bypass_cache},
+        org_id=current_user.get("org_id"),
+        created_by=current_user.get("sub")
+    )
+
+
+async def enqueue_mom_from_audio(
+    file: UploadFile,
+    meeting_link: str,
+    meeting_date: str,
+    meeting_time: str,
+    current_user: UserJWT,
+    bypass_cache: bool = False
+) -> JobCollection:
+    """
+    Stores the uploaded audio, then queues transcription + MoM generation for it.
+    """
+    file_content = await file.read()
+    if not file_content:
+        raise HTTPException(status_code=400, detail="Empty file")
+
+    filename = file.filename or "audio.wav"
+    safe_name = "".join([c for c in filename if c.isalpha() or c.isdigit() or c in "._-"])
+    file_path = await upload_storage.save_file(f"{uuid.uuid4().hex}_{safe_name}", file_content)
+
+    return await job_queue.enqueue(
+        MOM_FROM_AUDIO,
+        {
+            "file_path": file_path,
+            "filename": filename,
+            "content_type": file.content_type,
+            "meeting_link": meeting_link,
+            "meeting_date": meeting_date,
+            "meeting_time": meeting_time,
+            "bypass_cache": bypass_cache,
+        },
+        org_id=current_user.get("org_id"),
+        created_by=current_user.get("sub")
+    )
+
+
+async def enqueue_mom_from_recording(recording_id: PydanticObjectId, current_user: UserJWT, bypass_cache: bool = False) -> JobCollection:
+    """
+    Queues MoM generation for an existing recording.
+    """
+    return await job_queue.enqueue(
+        MOM_FROM_RECORDING,
+        {"recording_id": str(recording_id), "bypass_cache": bypass_cache},
+        org_id=current_user.get("org_id"),
+        created_by=current_user.get("sub")
+    )
+
+
+async def get_job(job_id: PydanticObjectId, current_user: UserJWT) -> JobCollection:
+    """
+    Fetches a job, restricted to the caller's org (or the caller when there is no org).
+    """
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    org_id = current_user.get("org_id")
+    if org_id:
+        allowed = job.org_id == str(org_id)
+    else:
+        allowed = job.created_by == current_user.get("sub")
+    if not allowed:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+# --- Handlers (run inside the worker) ---
+
+async def _run_meeting_job(work: Awaitable[MeetingCollection]) -> dict:
+    """
+    Runs a MoM controller call; client errors (4xx) are not worth retrying.
+    """
+    try:
+        meeting = await work
+    except HTTPException as e:
+        if e.status_code < 500:
+            raise PermanentJobError(e.detail) from e
+        raise
+    return {"meeting_id": str(meeting.id)}
+
+
+async def handle_mom_from_text(job: JobCollection) -> Optional[dict]:
+    payload = job.payload
+    return await _run_meeting_job(MoMController.generate_mom_from_text(
+        transcription=payload["transcription"],
+        meeting_link=payload["meeting_link"],
+        audio_url=payload["audio_url"],
+        meeting_date=payload["meeting_date"],
+        meeting_time=payload["meeting_time"],
+        meeting_duration=payload["meeting_duration"],
+        org_id=_oid(job.org_id),
+        created_by=_oid(job.created_by),
+        bypass_cache=payload.get("bypass_cache", False)
+    ))
+
+
+async def handle_mom_from_audio(job: JobCollection) -> Optional[dict]:
+    payload = job.payload
+    file_path = payload["file_path"]
+    if not os.path.exists(file_path):
+        raise PermanentJobError(f"Uploaded audio not found at {file_path}")
+
+    async with aiofiles.open(file_path, "rb") as f:
+        file_content = await f.read()
+
+    result = await _run_meeting_job(MoMController.generate_mom_from_audio_bytes(
+        file_content=file_content,
+        filename=payload["filename"],
+        content_type=payload.get("content_type"),
+        meeting_link=payload["meeting_link"],
+        meeting_date=payload["meeting_date"],
+        meeting_time=payload["meeting_time"],
+        org_id=_oid(job.org_id),
+        created_by=_oid(job.created_by),
+        bypass_cache=payload.get("bypass_cache", False)
+    ))
+    # Kept until success so retries can re-read it (dead jobs: discard_uploaded_audio)
+    os.remove(file_path)
+    return result
+
+
+async def discard_uploaded_audio(job: JobCollection) -> None:
+    """
+    Dead-letter hook of MOM_FROM_AUDIO: no attempt will read the upload again.
+    """
+    file_path = job.payload.get("file_path")
+    if file_path and os.path.exists(file_path):
+        os.remove(file_path)
+
+
+async def handle_mom_from_recording(job: JobCollection) -> Optional[dict]:
+    return await _run_meeting_job(MoMController.generate_mom_from_recording(
+        recording_id=PydanticObjectId(job.payload["recording_id"]),
+        org_id=_oid(job.org_id),
+        bypass_cache=job.payload.get("bypass_cache", False)
+    ))
+
+
+JOB_HANDLERS: dict[str, JobHandler] = {
+    MOM_FROM_TEXT: handle_mom_from_text,
+    MOM_FROM_AUDIO: handle_mom_from_audio,
+    MOM_FROM_RECORDING: handle_mom_from_recording,
+}
+
+JOB_DEAD_HOOKS: dict[str, DeadJobHook] = {
+    MOM_FROM_AUDIO: discard_uploaded_audio,
+}
@@ -1,73 +1,161 @@
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Iterator, List, Optional, Tuple, Union
+import html
 from beanie import PydanticObjectId
+from fastapi import HTTPException
+from app.utils.pagination import keyset_pipeline, page_with_cursor
+from app.services.meeting_search import build_search_pipeline, to_hits
+from app.services.semantic_search import semantic_index, passages_for, enabled as semantic_search_enabled
+from app.services.mom_print import PrintVersion, page_cache, render_stream
 from app.models.database.meeting_collection import MeetingCollection
 from app.schemas.common_schema import UserJWT
 
+# MeetingSummary computed in Mongo (ids as strings, ready for JSON)
+MEETING_SUMMARY_PROJECTION = {
+    "_id": {"$toString": "$_id"},
+    "meeting_link": 1,
+    "meeting_date": 1,
+    "meeting_time": 1,
+    "meeting_duration": 1,
+    "recording_id": {"$toString": "$recording_id"},
+    "created_on": 1,
+    "headline": {"$substrCP": [
+        {"$ifNull": [{"$arrayElemAt": ["$general_summaries.general_summaries.executive_overview", 0]}, ""]}, 0, 200
+    ]},
+    "attendees_count": {"$size": {"$ifNull": ["$attendees.attendees", []]}},
+    "topics_count": {"$size": {"$ifNull": ["$topic_summaries.topic_summaries", []]}},
+    "decisions_count": {"$size": {"$ifNull": ["$decisions.decisions", []]}},
+    "action_items_count": {"$size": {"$ifNull": ["$action_items.action_items", []]}},
+    "facts_count": {"$size": {"$ifNull": ["$facts.facts", []]}},
+}
+
 class MeetingsController:
     @staticmethod
-    async def get_all_meetings(current_user: UserJWT, skip: int = 0, limit: int = 50) -> List[MeetingCollection]:
+    def scope(current_user: UserJWT) -> Optional[dict]:
+        """
+        Meetings visible to the user: their org's, or their own without an org.
+        """
         org_id = current_user.get("org_id")
         user_id = current_user.get("sub")
-        
-        query = {}
-        if org_id:
-            query["org_id"] = org_id
-        else:
-            # Assumes created_by or similar field exists in MeetingCollection/DBMeta
-            # MeetingCollection inherits DBMeta which likely has created_by
-            # But wait, MeetingCollection inherits MeetingBase & DBMeta. 
-            # DBMeta has updated_by, org_id. Does it have created_by?
-            # Let's check DBMeta definition again or add created_by.
-            # Actually, DBMeta usually has created_by if defined right.
-            # Let's check common_schema.py again.
-            pass 
-        
-        # Checking DBMeta in common_schema.py revealed it has 'updated_by' but not 'created_by'?
-        # Wait, I saw DBMeta in step 1046:
-        # class DBMeta(BaseModel):
-        #     org_id: PydanticObjectId
-        #     created_on: datetime
-        #     updated_on: datetime
-        #     updated_by: Optional[PydanticObjectId]
-        # It does NOT have created_by.
-        # But RecordingCollection has created_by. 
-        # MeetingCollection should logically have it too to filter by user.
-        # However, if org_id is present, we filter by that.
-        # If org_id is NOT present (personal account), we need created_by.
-        # If MeetingCollection lacks created_by, we might need to add it or rely on org_id common for single users?
-        # Let's assume for now we filter by org_id if present.
-        
+
+        # Meetings store org_id / created_by as ObjectIds
         if org_id:
-            return await MeetingCollection.find(MeetingCollection.org_id == org_id).sort("-created_on").skip(skip).limit(limit).to_list()
-        
-        # Fallback to user_id (created_by) if org_id is missing
-        # Note: created_by needs to be added to MeetingCollection if not present
+            return {"org_id": PydanticObjectId(org_id)}
         if user_id:
-             # Assuming we will add created_by
-             # query["created_by"] = user_id
-             return await MeetingCollection.find({"created_by": user_id}).sort("-created_on").skip(skip).limit(limit).to_list()
+            return {"created_by": PydanticObjectId(user_id)}
+        return None
+
+    @staticmethod
+    async def get_all_meetings(
+        current_user: UserJWT,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Meeting summaries (MeetingSummary shape) for list views, newest first, and the
+        cursor of the next page. Projected in Mongo, so transcripts and section bodies
+        never leave the database, and returned as raw dicts (no document validation on
+        this hot path). `cursor` (keyset) replaces `skip` for deep pages.
+        """
+        query = MeetingsController.scope(current_user)
+        if query is None:
+            return [], None
 
-        return []
+        rows = await MeetingCollection.aggregate([
+            *keyset_pipeline(query, "created_on", cursor, skip, limit),
+            {"$project": MEETING_SUMMARY_PROJECTION},
+        ]).to_list()
+        return page_with_cursor(rows, "created_on", limit)
+
+    @staticmethod
+    async def search_meetings(
+        current_user: UserJWT,
+        q: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        attendee: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[dict]:
+        """
+        Full-text search (MeetingSearchHit shape), best match first.
+        """
+        query = MeetingsController.scope(current_user)
+        if query is None:
+            return []
+
+        rows = await MeetingCollection.aggregate(build_search_pipeline(
+            q, query, MEETING_SUMMARY_PROJECTION,
+            date_from=date_from, date_to=date_to, attendee=attendee, skip=skip, limit=limit
+        )).to_list()
+        return to_hits(rows, q)
+
+    @staticmethod
+    async def semantic_search(current_user: UserJWT, q: str, limit: int = 10) -> List[dict]:
+        """
+        Meetings closest in meaning to `q` (MeetingSearchHit shape, cosine similarity
+        as score), each with the passage that matched best.
+        """
+        if not semantic_search_enabled():
+            raise HTTPException(status_code=503, detail="Semantic search is not enabled on this server")
+        query = MeetingsController.scope(current_user)
+        if query is None:
+            return []
+
+        try:
+            hits = await semantic_index.search(query, q, limit)
+        except ImportError as e:
+            raise HTTPException(status_code=503, detail="Semantic search is not available on this server") from e
+        if not hits:
+            return []
+
+        # Same scope again: the index may still hold meetings deleted or moved since it was loaded
+        rows = await MeetingCollection.aggregate([
+            {"$match": {**query, "_id": {"$in": [PydanticObjectId(meeting_id) for meeting_id, _, _ in hits]}}},
+            {"$project": MEETING_SUMMARY_PROJECTION},
+        ]).to_list()
+        summaries = {row["_id"]: row for row in rows}
+        passages = await passages_for(hits)
+
+        results = []
+        for meeting_id, score, _ in hits:
+            if meeting_id not in summaries:
+                continue
+            passage = passages.get(meeting_id) or {}
+            snippets = [{"field": passage["field"], "text": html.escape(passage["text"])}] if passage.get("text") else []
+            results.append({**summaries[meeting_id], "score": round(score, 4), "snippets": snippets})
+        return results
 
     @staticmethod
     async def get_meeting(meeting_id: PydanticObjectId) -> Optional[MeetingCollection]:
         return await MeetingCollection.get(meeting_id)
 
     @staticmethod
-    async def generate_html(meeting_id: PydanticObjectId) -> Optional[str]:
+    async def print_version(meeting_id: PydanticObjectId) -> Optional[PrintVersion]:
+        """
+        Version (ETag / Last-Modified) of a meeting's printable page, read without
+        loading the meeting itself. None if the meeting doesn't exist.
+        """
+        rows = await MeetingCollection.aggregate([
+            {"$match": {"_id": meeting_id}},
+            {"$project": {"updated_on": 1, "created_on": 1}},
+        ]).to_list()
+        if not rows:
+            return None
+        updated_on = rows[0].get("updated_on") or rows[0].get("created_on") or datetime.fromtimestamp(0)
+        return PrintVersion(meeting_id, updated_on)
+
+    @staticmethod
+    async def generate_html(meeting_id: PydanticObjectId, version: PrintVersion) -> Optional[Union[str, Iterator[str]]]:
+        """
+        The cached page for `version`, or a streaming render (cached when it completes).
+        """
+        cached = page_cache.get(version.key)
+        if cached is not None:
+            return cached
+
         meeting = await MeetingCollection.get(meeting_id)
         if not meeting:
             return None
-        
-        from jinja2 import Environment, FileSystemLoader
-        import os
-        from datetime import datetime
-        
-        template_dir = os.path.join(os.getcwd(), "app", "templates")
-        env = Environment(loader=FileSystemLoader(template_dir))
-        template = env.get_template("mom.html")
-        
-        return template.render(
-            meeting=meeting,
-            current_date=datetime.now().strftime("%Y-%m-%d")
-        )
+        return render_stream(meeting, version)
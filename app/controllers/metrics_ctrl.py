@@ -0,0 +1,23 @@
+"""
+Controller for MoM run metrics (tokens, latency, retries, cache hits).
+"""
+from beanie import PydanticObjectId
+from fastapi import HTTPException
+
+from app.schemas.common_schema import UserJWT
+from app.schemas.metrics_schema import MetricsSummary
+from app.services.run_metrics import summarize_runs
+
+
+async def get_metrics_summary(current_user: UserJWT, days: int = 30) -> MetricsSummary:
+    """
+    Aggregates per model and per step for the caller's org (or the caller when there is no org).
+    """
+    if days < 1:
+        raise HTTPException(status_code=400, detail="days must be >= 1")
+    org_id = current_user.get("org_id")
+    if org_id:
+        scope = {"org_id": PydanticObjectId(org_id)}
+    else:
+        scope = {"created_by": PydanticObjectId(current_user.get("sub"))}
+    return await summarize_runs(scope, days)
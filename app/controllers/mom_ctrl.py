@@ -1,26 +1,69 @@
 
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
-from typing import Optional
+from typing import AsyncIterator, Optional
 from datetime import datetime
+import asyncio
 import json
 import os
 
-from app.services.mom_service import MoMService
+import aiofiles
+
+from app.services.mom_service import MoMService, MomSection
 from app.services.transcribers import TranscriptionService, ModelChoices
 from app.utils.audio import convert_to_opus
 from app.models.database.meeting_collection import MeetingCollection
 from app.models.database.recordings_collection import RecordingCollection
 from app.schemas.meetings_schema import MeetingBase
+from app.services.transcript_timings import save_timings
+from app.services.job_progress import track_stage, reserve_job_meeting_id
+from app.services.transcript_preprocess import preprocess_transcript, combine_stats
+from app.services.tokens import count_tokens
+from app.services.run_metrics import records_run, recording_run, save_run
+from app.services.semantic_search import schedule_embedding
+from app.schemas.meetings_schema import TranscriptStats
+from app.env_settings import env
 from beanie import PydanticObjectId
 
 # Initialize Service
 mom_service = MoMService()
 transcription_service = TranscriptionService()
 
+# MomState sections stored on MeetingCollection
+MOM_SECTIONS = ("attendees", "general_summaries", "topic_summaries", "facts", "decisions", "action_items")
+
+async def _prepare_transcript(transcription: str) -> tuple[str, Optional[TranscriptStats]]:
+    """
+    Cleans the transcript for the LLM (filler words, repetitions, Whisper loops).
+    Disabled with TRANSCRIPT_PREPROCESS=false.
+    """
+    if (env.TRANSCRIPT_PREPROCESS or "true").lower() == "false":
+        print(f"📊 Input Token Count: {await asyncio.to_thread(count_tokens, transcription)}")
+        return transcription, None
+    async with track_stage("preprocessing"):
+        cleaned, stats = await asyncio.to_thread(preprocess_transcript, transcription)
+    print(f"📊 Input Token Count: {stats.original_tokens} -> {stats.processed_tokens} (-{stats.reduction_pct}%)")
+    return cleaned, stats
+
+
+async def _scoped_meeting(meeting_id: PydanticObjectId, scope: Optional[dict]) -> MeetingCollection:
+    """
+    The meeting if the caller may change it (scope from MeetingsController.scope: their org's
+    meetings, or their own without an org), else 404.
+    """
+    meeting = await MeetingCollection.find_one({"_id": meeting_id, **scope}) if scope else None
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return meeting
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 class MoMController:
     
     @staticmethod
+    @records_run
     async def generate_mom_from_text(
         transcription: str,
         meeting_link: str,
@@ -30,57 +73,167 @@ class MoMController:
         meeting_duration: str,
         org_id: Optional[PydanticObjectId] = None,
         recording_id: Optional[PydanticObjectId] = None,
-        created_by: Optional[PydanticObjectId] = None
+        created_by: Optional[PydanticObjectId] = None,
+        transcription_result: Optional[dict] = None,
+        bypass_cache: bool = False
     ) -> MeetingCollection:
         """
         Controller to generate MoM from raw text and metadata.
+        If the verbose_json `transcription_result` is given, its word/segment timings
+        are stored (compactly) alongside the meeting.
+        `bypass_cache` forces fresh LLM calls instead of cached structured outputs.
         """
         try:
             print(f"🚀 Starting MoM Generation for meeting on {meeting_date}")
             
+            cleaned, transcript_stats = await _prepare_transcript(transcription)
+
             # Invoke Graph
-            # Estimate token count (Char / 4)
-            token_count = len(transcription) // 4
-            print(f"📊 Estimated Input Token Count: {token_count}")
-            
-            result_state = mom_service.generate_mom(transcription)
-            
-            # Construct Meeting Object
-            # Note: The result_state keys match the fields in MeetingBase/MeetingCollection 
-            # (general_summaries, topic_summaries, etc.)
-            
-            meeting_data = {
-                "transcription": transcription,
-                "meeting_link": meeting_link,
-                "audio_url": audio_url,
-                "meeting_date": meeting_date,
-                "meeting_time": meeting_time,
-                "meeting_duration": meeting_duration,
-                
-                "general_summaries": result_state["general_summaries"],
-                "topic_summaries": result_state["topic_summaries"],
-                "decisions": result_state["decisions"],
-                "action_items": result_state["action_items"],
-                "facts": result_state["facts"],
-                "attendees": result_state["attendees"],
-                "org_id": org_id,
-                "recording_id": recording_id,
-                "created_by": created_by
-            }
-            
-            # Validate and Create Document
-            meeting_doc = MeetingCollection(**meeting_data)
-            
-            # Save to DB
-            await meeting_doc.insert()
-            print(f"✅ MoM Saved to DB: {meeting_doc.id}")
+            async with track_stage("extracting"):
+                result_state = await mom_service.agenerate_mom(cleaned, bypass_cache=bypass_cache)
             
+            meeting_doc = await MoMController.save_meeting(
+                transcription=transcription,
+                meeting_link=meeting_link,
+                audio_url=audio_url,
+                meeting_date=meeting_date,
+                meeting_time=meeting_time,
+                meeting_duration=meeting_duration,
+                result_state=result_state,
+                org_id=org_id,
+                recording_id=recording_id,
+                created_by=created_by,
+                transcription_result=transcription_result,
+                transcript_stats=transcript_stats
+            )
             return meeting_doc
 
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"❌ Error generating MoM: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    @staticmethod
+    async def save_meeting(
+        transcription: str,
+        meeting_link: str,
+        audio_url: str,
+        meeting_date: str,
+        meeting_time: str,
+        meeting_duration: str,
+        result_state: dict,
+        org_id: Optional[PydanticObjectId] = None,
+        recording_id: Optional[PydanticObjectId] = None,
+        created_by: Optional[PydanticObjectId] = None,
+        transcription_result: Optional[dict] = None,
+        transcript_stats: Optional[TranscriptStats] = None
+    ) -> MeetingCollection:
+        """
+        Persists a generated MoM (and the transcript timings, if any).
+        `transcription` is the raw transcript, not the pre-processed LLM input.
+        """
+        # Construct Meeting Object
+        # Note: The result_state keys match the fields in MeetingBase/MeetingCollection
+        # (general_summaries, topic_summaries, etc.)
+
+        meeting_data = {
+            "transcription": transcription,
+            "meeting_link": meeting_link,
+            "audio_url": audio_url,
+            "meeting_date": meeting_date,
+            "meeting_time": meeting_time,
+            "meeting_duration": meeting_duration,
+
+            "general_summaries": result_state["general_summaries"],
+            "topic_summaries": result_state["topic_summaries"],
+            "decisions": result_state["decisions"],
+            "action_items": result_state["action_items"],
+            "facts": result_state["facts"],
+            "attendees": result_state["attendees"],
+            "org_id": org_id,
+            "recording_id": recording_id,
+            "created_by": created_by,
+            "transcript_stats": transcript_stats
+        }
+
+        async with track_stage("saving"):
+            # Validate and Create Document
+            meeting_doc = MeetingCollection(**meeting_data)
+
+            # Save to DB. Inside a job, under the id reserved on the job: a retry after a
+            # failure further down replaces the meeting of the failed attempt instead of
+            # inserting a second one.
+            reserved_id = await reserve_job_meeting_id()
+            if reserved_id:
+                meeting_doc.id = reserved_id
+                await meeting_doc.save()
+            else:
+                await meeting_doc.insert()
+            print(f"✅ MoM Saved to DB: {meeting_doc.id}")
+
+            # Per-step tokens / latency / retries / cache hits of this run
+            await save_run("generate", meeting_doc.id, org_id, created_by)
+
+            if transcription_result:
+                await save_timings(
+                    transcription_result,
+                    recording_id=recording_id,
+                    meeting_id=meeting_doc.id,
+                    org_id=org_id,
+                    created_by=created_by
+                )
+
+        # Semantic search passages are embedded in the background (CPU, best effort)
+        schedule_embedding(meeting_doc)
+        return meeting_doc
+
+    @staticmethod
+    async def stream_mom_from_text(
+        transcription: str,
+        meeting_link: str,
+        audio_url: str,
+        meeting_date: str,
+        meeting_time: str,
+        meeting_duration: str,
+        org_id: Optional[PydanticObjectId] = None,
+        created_by: Optional[PydanticObjectId] = None,
+        bypass_cache: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Server-Sent Events for MoM generation from text:
+        one `section` event per extracted MomState section (as its node completes),
+        then `meeting` with the saved meeting ID, or `error`.
+        """
+        with recording_run():
+            try:
+                print(f"🚀 Starting streamed MoM Generation for meeting on {meeting_date}")
+                cleaned, transcript_stats = await _prepare_transcript(transcription)
+                result_state = {"transcription": cleaned}
+                async for update in mom_service.astream_mom(cleaned, bypass_cache=bypass_cache):
+                    for section, value in update.items():
+                        result_state[section] = value
+                        yield _sse("section", {"section": section, "data": value.model_dump(mode="json") if value else None})
+
+                meeting_doc = await MoMController.save_meeting(
+                    transcription=transcription,
+                    meeting_link=meeting_link,
+                    audio_url=audio_url,
+                    meeting_date=meeting_date,
+                    meeting_time=meeting_time,
+                    meeting_duration=meeting_duration,
+                    result_state=result_state,
+                    org_id=org_id,
+                    created_by=created_by,
+                    transcript_stats=transcript_stats
+                )
+                yield _sse("meeting", {"meeting_id": str(meeting_doc.id)})
+
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Headers are already sent: report the failure as an event
+                print(f"❌ Error streaming MoM: {str(e)}")
+                yield _sse("error", {"detail": str(e)})
+
     @staticmethod
     async def generate_mom_from_audio(
         file: UploadFile,
@@ -88,7 +241,8 @@ class MoMController:
         meeting_date: str,
         meeting_time: str,
         org_id: Optional[PydanticObjectId] = None,
-        created_by: Optional[PydanticObjectId] = None
+        created_by: Optional[PydanticObjectId] = None,
+        bypass_cache: bool = False
     ) -> MeetingCollection:
         """
         Controller to generate MoM from audio file.
@@ -97,18 +251,44 @@ class MoMController:
         2. Transcription
         3. MOM Generation
         """
+        print(f"🚀 Starting Audio MoM Generation for {file.filename}")
+
+        # 1. Read File
+        file_content = await file.read()
+        if not file_content:
+            raise HTTPException(status_code=400, detail="Empty file")
+
+        return await MoMController.generate_mom_from_audio_bytes(
+            file_content=file_content,
+            filename=file.filename or "audio.wav",
+            content_type=file.content_type,
+            meeting_link=meeting_link,
+            meeting_date=meeting_date,
+            meeting_time=meeting_time,
+            org_id=org_id,
+            created_by=created_by,
+            bypass_cache=bypass_cache
+        )
+
+    @staticmethod
+    @records_run
+    async def generate_mom_from_audio_bytes(
+        file_content: bytes,
+        filename: str,
+        content_type: Optional[str],
+        meeting_link: str,
+        meeting_date: str,
+        meeting_time: str,
+        org_id: Optional[PydanticObjectId] = None,
+        created_by: Optional[PydanticObjectId] = None,
+        bypass_cache: bool = False
+    ) -> MeetingCollection:
+        """
+        Audio MoM pipeline on already-read bytes (shared by the request path and background jobs).
+        """
         try:
-            print(f"🚀 Starting Audio MoM Generation for {file.filename}")
-            
-            # 1. Read File
-            file_content = await file.read()
-            if not file_content:
-                raise HTTPException(status_code=400, detail="Empty file")
-            
-            filename = file.filename or "audio.wav"
-            
             # 2. Smart Conversion
-            is_ogg = filename.lower().endswith('.ogg') or file.content_type == 'audio/ogg'
+            is_ogg = filename.lower().endswith('.ogg') or content_type == 'audio/ogg'
             
             if is_ogg:
                 print(f"✅ File {filename} is already OGG. Skipping conversion.")
@@ -116,16 +296,19 @@ class MoMController:
                 transcribe_filename = filename
             else:
                 print(f"⚠️ File {filename} is NOT OGG. Converting to Opus/OGG...")
-                transcribe_content = convert_to_opus(file_content)
+                async with track_stage("transcoding"):
+                    transcribe_content = await asyncio.to_thread(convert_to_opus, file_content)
                 transcribe_filename = f"{filename}.ogg"
 
-            # 3. Transcription
+            # 3. Transcription (blocking client -> worker thread, keeps the event loop free)
             print(f"🎤 Transcribing {transcribe_filename}...")
-            transcription_result = transcription_service.whisper_transcribe(
-                transcribe_content, 
-                transcribe_filename, 
-                ModelChoices.WHISPER_LARGE_TURBO
-            )
+            async with track_stage("transcribing"):
+                transcription_result = await asyncio.to_thread(
+                    transcription_service.whisper_transcribe,
+                    transcribe_content,
+                    transcribe_filename,
+                    ModelChoices.WHISPER_LARGE_TURBO
+                )
             
             transcript_text = transcription_result.get("text", "")
             duration_s = transcription_result.get("duration", 0.0)
@@ -144,17 +327,23 @@ class MoMController:
                 meeting_time=meeting_time,
                 meeting_duration=meeting_duration,
                 org_id=org_id,
-                created_by=created_by
+                created_by=created_by,
+                transcription_result=transcription_result,
+                bypass_cache=bypass_cache
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"❌ Error generating Audio MoM: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
     @staticmethod
+    @records_run
     async def generate_mom_from_recording(
         recording_id: PydanticObjectId,
-        org_id: Optional[PydanticObjectId] = None
+        org_id: Optional[PydanticObjectId] = None,
+        bypass_cache: bool = False
     ) -> MeetingCollection:
         """
         Controller to generate MoM from an existing recording ID.
@@ -180,8 +369,8 @@ class MoMController:
                 raise HTTPException(status_code=404, detail=f"Recording file not found at {file_path}")
 
             # 3. Read File
-            with open(file_path, "rb") as f:
-                file_content = f.read()
+            async with aiofiles.open(file_path, "rb") as f:
+                file_content = await f.read()
 
             # 4. Smart Conversion (Reuse logic via util or just inline)
             # Assuming logic similar to from_audio
@@ -193,16 +382,19 @@ class MoMController:
                  transcribe_filename = filename
             else:
                  print(f"Converting {filename} to Opus...")
-                 transcribe_content = convert_to_opus(file_content)
+                 async with track_stage("transcoding"):
+                     transcribe_content = await asyncio.to_thread(convert_to_opus, file_content)
                  transcribe_filename = f"{filename}.ogg"
 
             # 5. Transcription
             print(f"🎤 Transcribing {transcribe_filename}...")
-            transcription_result = transcription_service.whisper_transcribe(
-                transcribe_content, 
-                transcribe_filename, 
-                ModelChoices.WHISPER_LARGE_TURBO
-            )
+            async with track_stage("transcribing"):
+                transcription_result = await asyncio.to_thread(
+                    transcription_service.whisper_transcribe,
+                    transcribe_content,
+                    transcribe_filename,
+                    ModelChoices.WHISPER_LARGE_TURBO
+                )
 
             transcript_text = transcription_result.get("text", "")
             duration_s = transcription_result.get("duration", 0.0)
@@ -226,9 +418,105 @@ class MoMController:
                 meeting_duration=meeting_duration,
                 org_id=recording.org_id if recording.org_id else org_id,
                 recording_id=recording.id,
-                created_by=recording.created_by
+                created_by=recording.created_by,
+                transcription_result=transcription_result,
+                bypass_cache=bypass_cache
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"❌ Error generating MoM from Recording: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
+
+    @staticmethod
+    @records_run
+    async def update_mom(
+        meeting_id: PydanticObjectId,
+        transcript_delta: str,
+        meeting_duration: Optional[str] = None,
+        scope: Optional[dict] = None,
+        bypass_cache: bool = False
+    ) -> MeetingCollection:
+        """
+        Controller to update an existing MoM with new transcript content (live / long meetings).
+        Only the delta is sent to the LLM; sections are merged and the document updated in place.
+        """
+        try:
+            meeting = await _scoped_meeting(meeting_id, scope)
+
+            print(f"🔄 Updating MoM {meeting_id}")
+            cleaned, delta_stats = await _prepare_transcript(transcript_delta)
+            previous = {section: getattr(meeting, section) for section in MOM_SECTIONS}
+            previous["transcription"] = meeting.transcription
+
+            result_state = await mom_service.aupdate_mom(previous, cleaned, bypass_cache=bypass_cache)
+
+            changes = {section: result_state[section] for section in MOM_SECTIONS}
+            # Stored transcript stays raw (the LLM only saw the cleaned delta)
+            changes["transcription"] = "\n".join(t for t in (meeting.transcription, transcript_delta) if t)
+            changes["updated_on"] = datetime.now()
+            if delta_stats:
+                changes["transcript_stats"] = combine_stats(meeting.transcript_stats, delta_stats)
+            if meeting_duration:
+                changes["meeting_duration"] = meeting_duration
+
+            # $set only the changed fields (the transcript is the only field that grows)
+            await meeting.set(changes)
+            await save_run("update", meeting.id, meeting.org_id, meeting.created_by)
+            schedule_embedding(meeting)
+            print(f"✅ MoM Updated: {meeting.id}")
+            return meeting
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"❌ Error updating MoM: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @staticmethod
+    @records_run
+    async def regenerate_section(
+        meeting_id: PydanticObjectId,
+        section: MomSection,
+        include_dependents: bool = False,
+        scope: Optional[dict] = None,
+        bypass_cache: bool = True
+    ) -> MeetingCollection:
+        """
+        Controller to re-extract one MoM section of a stored meeting (and optionally the
+        sections that depend on it) without re-transcribing or re-running the whole graph.
+        """
+        try:
+            meeting = await _scoped_meeting(meeting_id, scope)
+
+            sections = mom_service.regeneration_plan(section, include_dependents)
+            print(f"🔁 Regenerating {', '.join(sections)} of MoM {meeting_id}")
+
+            # Rebuild the graph state from the stored meeting; the LLM sees the cleaned transcript
+            cleaned, _ = await _prepare_transcript(meeting.transcription)
+            state = {name: getattr(meeting, name) for name in MOM_SECTIONS}
+            state["transcription"] = cleaned
+
+            changes = await mom_service.aregenerate_sections(state, sections, bypass_cache=bypass_cache)
+            changes["updated_on"] = datetime.now()
+
+            # $set only the regenerated fields
+            await meeting.set(changes)
+            await save_run("regenerate", meeting.id, meeting.org_id, meeting.created_by)
+            schedule_embedding(meeting)
+            print(f"✅ MoM Regenerated: {meeting.id}")
+            return meeting
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"❌ Error regenerating MoM section: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @staticmethod
+    def llm_backend_stats() -> list[dict]:
+        """
+        Rolling p50 / p95 latency and error rate of each routed LLM backend (this process).
+        """
+        return mom_service.llm_service.backend_stats()
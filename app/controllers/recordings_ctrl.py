@@ -6,11 +6,13 @@ import asyncio
 from datetime import datetime
 import json
 import logging
+from typing import Optional
 
 from fastapi import WebSocket, WebSocketDisconnect, status, UploadFile
 
 from app.services.storage import StorageService
 from app.utils import convert_to_opus
+from app.utils.pagination import keyset_pipeline, page_with_cursor
 from app.security import validate_jwt_token
 from app.models.database.recordings_collection import RecordingCollection, RecordingStatus
 from app.schemas.common_schema import UserJWT
@@ -21,6 +23,17 @@ logger = logging.getLogger(__name__)
 # Initialize Storage Service
 storage_service = StorageService()
 
+# RecordingOut fields (ids as strings, ready for JSON)
+RECORDING_OUT_PROJECTION = {
+    "_id": {"$toString": "$_id"},
+    "name": 1,
+    "meeting_link": 1,
+    "status": 1,
+    "creation_date": 1,
+    "org_id": 1,
+    "file_path": 1,
+}
+
 async def handle_websocket_recording(websocket: WebSocket) -> None:
     """
     Handles the WebSocket recording session:
@@ -207,9 +220,16 @@ async def upload_audio_file(file: UploadFile, current_user: UserJWT) -> dict:
     }
 
 
-async def get_recordings(current_user: UserJWT, skip: int = 0, limit: int = 5) -> list[RecordingCollection]:
+async def get_recordings(
+    current_user: UserJWT,
+    skip: int = 0,
+    limit: int = 5,
+    cursor: Optional[str] = None
+) -> tuple[list[dict], Optional[str]]:
     """
-    Fetches the most recent recordings for the user's organization.
+    Fetches the most recent recordings for the user's organization, and the cursor
+    of the next page. Returns raw projected dicts (RecordingOut shape) without
+    document validation. `cursor` (keyset) replaces `skip` for deep pages.
     """
     org_id = current_user.get("org_id")
     user_id = current_user.get("sub")
@@ -221,9 +241,12 @@ async def get_recordings(current_user: UserJWT, skip: int = 0, limit: int = 5) -
     else:
         query["created_by"] = user_id
 
-    # Find, Sort by Date Descending, Skip, Limit
-    recordings = await RecordingCollection.find(query).sort("-creation_date").skip(skip).limit(limit).to_list()
-    return recordings
+    # Find, Sort by Date Descending (then _id), page by cursor or skip, Limit
+    rows = await RecordingCollection.aggregate([
+        *keyset_pipeline(query, "creation_date", cursor, skip, limit),
+        {"$project": RECORDING_OUT_PROJECTION},
+    ]).to_list()
+    return page_with_cursor(rows, "creation_date", limit)
 
 async def get_recording_stats(current_user: UserJWT) -> dict:
     """
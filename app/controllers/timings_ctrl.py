@@ -0,0 +1,47 @@
+"""
+Controller for time-range lookups over stored transcript timings.
+"""
+from typing import Optional
+from beanie import PydanticObjectId
+from fastapi import HTTPException
+
+from app.models.database.transcript_timings_collection import TranscriptTimingsCollection
+from app.schemas.common_schema import UserJWT
+from app.services.transcript_timings import TranscriptTimings, parse_timestamp
+
+
+async def get_timings_window(
+    current_user: UserJWT,
+    start: str,
+    end: str,
+    recording_id: Optional[PydanticObjectId] = None,
+    meeting_id: Optional[PydanticObjectId] = None
+) -> dict:
+    """
+    Returns the words and segments between `start` and `end` (seconds or [hh:]mm:ss).
+    """
+    if recording_id:
+        doc = await TranscriptTimingsCollection.find_one(TranscriptTimingsCollection.recording_id == recording_id)
+    else:
+        doc = await TranscriptTimingsCollection.find_one(TranscriptTimingsCollection.meeting_id == meeting_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Timings not found")
+
+    org_id = current_user.get("org_id")
+    allowed = doc.org_id == str(org_id) if org_id else doc.created_by == current_user.get("sub")
+    if not allowed:
+        raise HTTPException(status_code=404, detail="Timings not found")
+
+    try:
+        start_s, end_s = parse_timestamp(start), parse_timestamp(end)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail="Invalid start/end timestamp") from e
+
+    timings = TranscriptTimings(doc)
+    return {
+        "start": start_s,
+        "end": end_s,
+        "text": timings.text_between(start_s, end_s),
+        "words": timings.words_between(start_s, end_s),
+        "segments": timings.segments_between(start_s, end_s),
+    }
@@ -28,8 +28,82 @@ class EnvSettings:
         self.REFRESH_TOKEN_EXPIRE_MINUTES=os.getenv('REFRESH_TOKEN_EXPIRE_MINUTES')        
         
         self.MONGODB_URL = os.getenv('MONGODB_URL')
+        self.DB_DROP_UNDECLARED_INDEXES = os.getenv('DB_DROP_UNDECLARED_INDEXES')
         self.GROQ_API_KEY = os.getenv('GROQ_API_KEY')
         self.MISTRAL_API_KEY = os.getenv('MISTRAL_API_KEY')
+
+        # Local (offline) Whisper backend
+        self.LOCAL_WHISPER_MODEL = os.getenv('LOCAL_WHISPER_MODEL') or "openai/whisper-small"
+        self.LOCAL_WHISPER_QUANTIZE = os.getenv('LOCAL_WHISPER_QUANTIZE') or "int8"
+        self.LOCAL_WHISPER_BATCH_SIZE = os.getenv('LOCAL_WHISPER_BATCH_SIZE')
+        self.LOCAL_WHISPER_CHUNK_SECONDS = os.getenv('LOCAL_WHISPER_CHUNK_SECONDS')
+        self.LOCAL_WHISPER_THREADS = os.getenv('LOCAL_WHISPER_THREADS')
+        self.LOCAL_WHISPER_LANGUAGE = os.getenv('LOCAL_WHISPER_LANGUAGE')
+
+        # Job queue / worker
+        self.JOB_VISIBILITY_TIMEOUT_SECONDS = os.getenv('JOB_VISIBILITY_TIMEOUT_SECONDS')
+        self.JOB_MAX_ATTEMPTS = os.getenv('JOB_MAX_ATTEMPTS')
+        self.JOB_BACKOFF_BASE_SECONDS = os.getenv('JOB_BACKOFF_BASE_SECONDS')
+        self.JOB_BACKOFF_MAX_SECONDS = os.getenv('JOB_BACKOFF_MAX_SECONDS')
+        self.WORKER_CONCURRENCY = os.getenv('WORKER_CONCURRENCY')
+        self.WORKER_POLL_INTERVAL_SECONDS = os.getenv('WORKER_POLL_INTERVAL_SECONDS')
+        self.BACKGROUND_WORKER_CONCURRENCY = os.getenv('BACKGROUND_WORKER_CONCURRENCY')
+        self.BACKGROUND_WORKER_SHUTDOWN_SECONDS = os.getenv('BACKGROUND_WORKER_SHUTDOWN_SECONDS')
+
+        # Provider rate limits, JSON: {"groq:llama-3.3-70b-versatile": {"rpm": 30, "tpm": 12000, "concurrency": 4}}
+        self.RATE_LIMITS = os.getenv('RATE_LIMITS')
+        self.RATE_LIMIT_MAX_RETRIES = os.getenv('RATE_LIMIT_MAX_RETRIES')
+        self.RATE_LIMIT_COMPLETION_RESERVE = os.getenv('RATE_LIMIT_COMPLETION_RESERVE')
+
+        # Fake Groq/Mistral provider: a URL (stand-in server) or "inprocess"
+        self.FAKE_PROVIDER_URL = os.getenv('FAKE_PROVIDER_URL')
+        self.FAKE_PROVIDER_CHAT_LATENCY = os.getenv('FAKE_PROVIDER_CHAT_LATENCY')
+        self.FAKE_PROVIDER_AUDIO_LATENCY = os.getenv('FAKE_PROVIDER_AUDIO_LATENCY')
+        self.FAKE_PROVIDER_429_RATE = os.getenv('FAKE_PROVIDER_429_RATE')
+        self.FAKE_PROVIDER_5XX_RATE = os.getenv('FAKE_PROVIDER_5XX_RATE')
+        self.FAKE_PROVIDER_RETRY_AFTER = os.getenv('FAKE_PROVIDER_RETRY_AFTER')
+        self.FAKE_PROVIDER_CANNED_PATH = os.getenv('FAKE_PROVIDER_CANNED_PATH')
+
+        # MoM generation
+        self.MOM_MAX_CONCURRENCY = os.getenv('MOM_MAX_CONCURRENCY')
+        self.MOM_LONG_TRANSCRIPT_TOKENS = os.getenv('MOM_LONG_TRANSCRIPT_TOKENS')
+        self.MOM_WINDOW_TOKENS = os.getenv('MOM_WINDOW_TOKENS')
+        self.MOM_WINDOW_OVERLAP_TOKENS = os.getenv('MOM_WINDOW_OVERLAP_TOKENS')
+        self.MOM_COMBINED_MAX_TOKENS = os.getenv('MOM_COMBINED_MAX_TOKENS')
+
+        # Transcript pre-processing / token counting
+        self.TRANSCRIPT_PREPROCESS = os.getenv('TRANSCRIPT_PREPROCESS')
+        self.TOKENIZER_NAME = os.getenv('TOKENIZER_NAME') or "Xenova/llama-3-tokenizer"
+        self.TOKENIZER_PATH = os.getenv('TOKENIZER_PATH')
+
+        # Structured LLM output cache
+        self.LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED')
+        self.LLM_CACHE_MAX_ENTRIES = os.getenv('LLM_CACHE_MAX_ENTRIES')
+        self.LLM_CACHE_TTL_SECONDS = os.getenv('LLM_CACHE_TTL_SECONDS')
+
+        # Multi-backend LLM routing ("provider:model,provider:model")
+        self.LLM_BACKENDS = os.getenv('LLM_BACKENDS')
+        self.LLM_HEDGE_AFTER_SECONDS = os.getenv('LLM_HEDGE_AFTER_SECONDS')
+        self.LLM_ROUTER_WINDOW = os.getenv('LLM_ROUTER_WINDOW')
+        self.LLM_ROUTER_MAX_ERROR_RATE = os.getenv('LLM_ROUTER_MAX_ERROR_RATE')
+        self.LLM_BACKEND_COOLDOWN_SECONDS = os.getenv('LLM_BACKEND_COOLDOWN_SECONDS')
+
+        # Semantic meeting search (local embeddings + in-process vector index), off unless "true"
+        self.SEMANTIC_SEARCH_ENABLED = os.getenv('SEMANTIC_SEARCH_ENABLED')
+        self.EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL') or "sentence-transformers/all-MiniLM-L6-v2"
+        self.EMBEDDING_BATCH_SIZE = os.getenv('EMBEDDING_BATCH_SIZE')
+        self.EMBEDDING_MAX_TOKENS = os.getenv('EMBEDDING_MAX_TOKENS')
+        self.EMBEDDING_THREADS = os.getenv('EMBEDDING_THREADS')
+        self.EMBEDDING_CHUNK_WORDS = os.getenv('EMBEDDING_CHUNK_WORDS')
+        self.VECTOR_INDEX_IVF_MIN_VECTORS = os.getenv('VECTOR_INDEX_IVF_MIN_VECTORS')
+        self.VECTOR_INDEX_NPROBE = os.getenv('VECTOR_INDEX_NPROBE')
+        self.VECTOR_INDEX_MAX_SCOPES = os.getenv('VECTOR_INDEX_MAX_SCOPES')
+        self.VECTOR_INDEX_SYNC_SECONDS = os.getenv('VECTOR_INDEX_SYNC_SECONDS')
+
+        # Printable MoM (GET /meetings/{meeting_id}/print)
+        self.JINJA_BYTECODE_CACHE_DIR = os.getenv('JINJA_BYTECODE_CACHE_DIR')
+        self.PRINT_CACHE_MAX_ENTRIES = os.getenv('PRINT_CACHE_MAX_ENTRIES')
+        self.PRINT_CACHE_MAX_CHARS = os.getenv('PRINT_CACHE_MAX_CHARS')
         
         
         
@@ -13,3 +13,16 @@ from app.models.database.recordings_collection import (
 from app.models.database.meeting_collection import (
     MeetingCollection
 )
+from app.models.database.jobs_collection import (
+    JobCollection,
+    JobStatus
+)
+from app.models.database.transcript_timings_collection import (
+    TranscriptTimingsCollection
+)
+from app.models.database.mom_runs_collection import (
+    MomRunCollection
+)
+from app.models.database.meeting_embeddings_collection import (
+    MeetingEmbeddingCollection
+)
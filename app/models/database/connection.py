@@ -0,0 +1,47 @@
+"""
+Database initialisation shared by the API server and the worker.
+"""
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.env_settings import env
+from app.models.database import (
+    UserCollection,
+    UserSecretsCollection,
+    IdentityCollection,
+    IdentityEmbeddingCollection,
+    RecordingCollection,
+    MeetingCollection,
+    JobCollection,
+    TranscriptTimingsCollection,
+    MomRunCollection,
+    MeetingEmbeddingCollection
+)
+
+DOCUMENT_MODELS = [
+    UserCollection,
+    UserSecretsCollection,
+    IdentityCollection,
+    IdentityEmbeddingCollection,
+    RecordingCollection,
+    MeetingCollection,
+    JobCollection,
+    TranscriptTimingsCollection,
+    MomRunCollection,
+    MeetingEmbeddingCollection
+]
+
+
+async def init_db() -> AsyncIOMotorClient:
+    """
+    Connects to MongoDB and initialises Beanie with every document model.
+    Beanie creates the indexes declared in each model's Settings (idempotent);
+    DB_DROP_UNDECLARED_INDEXES=true also drops indexes no model declares any more.
+    """
+    client = AsyncIOMotorClient(env.MONGODB_URL)
+    await init_beanie(
+        database=client.eazzmeetings,
+        document_models=DOCUMENT_MODELS,
+        allow_index_dropping=(env.DB_DROP_UNDECLARED_INDEXES or "false").lower() == "true"
+    )
+    return client
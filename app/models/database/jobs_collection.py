@@ -0,0 +1,61 @@
+"""
+Database model for background jobs (transcription, MoM generation).
+"""
+from datetime import datetime
+from typing import Optional, Any
+from enum import Enum
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel, ASCENDING
+
+class JobStatus(str, Enum):
+    """
+    Lifecycle of a job.
+    QUEUED -> RUNNING -> SUCCEEDED
+                      -> QUEUED (retry with backoff)
+                      -> DEAD (max attempts reached or permanent error)
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"
+
+class JobCollection(Document):
+    """
+    Durable job record. Workers claim jobs by taking a time-limited lease;
+    a job whose lease expires (worker crashed) becomes claimable again.
+    """
+    kind: str
+    payload: dict[str, Any] = Field(default_factory=dict)
+    status: JobStatus = Field(default=JobStatus.QUEUED)
+
+    attempts: int = 0
+    max_attempts: int = 5
+    run_after: datetime = Field(default_factory=datetime.now)
+    lease_expires_at: Optional[datetime] = None
+    worker_id: Optional[str] = None
+
+    last_error: Optional[str] = None
+    result: Optional[dict[str, Any]] = None
+
+    # Progress of the running attempt (e.g. transcribing, extracting_decisions, saving)
+    stage: Optional[str] = None
+    stage_timings: dict[str, float] = Field(default_factory=dict)
+    meeting_id: Optional[str] = None
+
+    org_id: Optional[str] = None
+    created_by: Optional[str] = None
+    creation_date: datetime = Field(default_factory=datetime.now)
+    updated_on: datetime = Field(default_factory=datetime.now)
+
+    class Settings:
+        """
+        Beanie settings.
+        """
+        name = "jobs"
+        indexes = [
+            # Claiming: queued jobs that are due, oldest first
+            IndexModel([("status", ASCENDING), ("run_after", ASCENDING)]),
+            # Reclaiming: running jobs whose lease has expired
+            IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)]),
+        ]
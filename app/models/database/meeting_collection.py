@@ -4,19 +4,43 @@ Meeting Collection Model
 
 from typing import Optional
 from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
 from app.schemas import (
                         MeetingBase,
-                        DBMeta
+                        DBMeta,
+                        TranscriptStats
                     )
 
+# Text-indexed fields and their relevance weights
+TEXT_SEARCH_WEIGHTS = {
+    "decisions.decisions.decision_headline": 10,
+    "action_items.action_items.task_title": 8,
+    "topic_summaries.topic_summaries.related_topic_title": 6,
+    "facts.facts.description": 3,
+    "transcription": 1,
+}
+
 class MeetingCollection(Document,MeetingBase,DBMeta):
     """
     Meeting Collection Model
     """
     created_by: Optional[PydanticObjectId] = None
+    transcript_stats: Optional[TranscriptStats] = None
 
     class Settings:
         """
         Beanie settings.
         """
-        name = "meetings"
\ No newline at end of file
+        name = "meetings"
+        indexes = [
+            # List pages: org / creator scope, newest first, _id tie-break (keyset cursor)
+            IndexModel([("org_id", ASCENDING), ("created_on", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("created_by", ASCENDING), ("created_on", DESCENDING), ("_id", DESCENDING)]),
+            # GET /meetings/search (one text index per collection; weights favour MoM headlines)
+            IndexModel(
+                [(field, TEXT) for field in TEXT_SEARCH_WEIGHTS],
+                weights=TEXT_SEARCH_WEIGHTS,
+                default_language="english",
+                name="meeting_text_search"
+            ),
+        ]
@@ -0,0 +1,37 @@
+"""
+Passage embeddings of a meeting (semantic search), one document per meeting.
+"""
+from datetime import datetime
+from typing import Optional, List
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from pymongo import IndexModel, ASCENDING
+
+class MeetingEmbeddingCollection(Document):
+    """
+    Kept out of the meeting document so reading meetings never pulls vectors.
+    `vectors` is a row-major float16 matrix (len(passages) x dim), passage i in row i.
+    """
+    meeting_id: PydanticObjectId
+    org_id: Optional[PydanticObjectId] = None
+    created_by: Optional[PydanticObjectId] = None
+
+    model: str
+    dim: int
+    fields: List[str] = Field(default_factory=list)     # section name or "transcription", per passage
+    passages: List[str] = Field(default_factory=list)   # passage text (truncated), shown as the snippet
+    vectors: bytes = b""
+
+    updated_on: datetime = Field(default_factory=datetime.now)
+
+    class Settings:
+        """
+        Beanie settings.
+        """
+        name = "meeting_embeddings"
+        indexes = [
+            IndexModel([("meeting_id", ASCENDING)], unique=True),
+            # Per-scope index loads and incremental syncs (updated_on > last sync)
+            IndexModel([("org_id", ASCENDING), ("updated_on", ASCENDING)]),
+            IndexModel([("created_by", ASCENDING), ("updated_on", ASCENDING)]),
+        ]
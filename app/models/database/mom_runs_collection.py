@@ -0,0 +1,39 @@
+"""
+Per-run metrics of MoM generation (one document per generate / update / section regeneration run).
+"""
+from datetime import datetime
+from typing import Optional, List
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
+from app.schemas.metrics_schema import StepMetrics
+
+class MomRunCollection(Document):
+    """
+    Compact run record stored alongside MeetingCollection (kept out of the
+    meeting document so listing meetings stays cheap).
+    """
+    meeting_id: Optional[PydanticObjectId] = None
+    org_id: Optional[PydanticObjectId] = None
+    created_by: Optional[PydanticObjectId] = None
+    kind: str = "generate"  # generate | update | regenerate
+
+    total_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    steps: List[StepMetrics] = Field(default_factory=list)
+
+    created_on: datetime = Field(default_factory=datetime.now)
+
+    class Settings:
+        """
+        Beanie settings.
+        """
+        name = "mom_runs"
+        indexes = [
+            IndexModel([("org_id", ASCENDING), ("created_on", DESCENDING)]),
+            # /mom/metrics for users without an org
+            IndexModel([("created_by", ASCENDING), ("created_on", DESCENDING)]),
+            IndexModel([("meeting_id", ASCENDING)]),
+        ]
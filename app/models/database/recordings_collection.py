@@ -6,6 +6,7 @@ from typing import Optional
 from enum import Enum
 from beanie import Document
 from pydantic import Field
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 class RecordingStatus(str, Enum):
     """
@@ -34,3 +35,9 @@ class RecordingCollection(Document):
         Beanie settings.
         """
         name = "recordings"
+        indexes = [
+            # Dashboard lists: org / creator scope, newest first, _id tie-break (keyset cursor)
+            IndexModel([("org_id", ASCENDING), ("creation_date", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("created_by", ASCENDING), ("creation_date", DESCENDING), ("_id", DESCENDING)]),
+        ]
+
@@ -0,0 +1,48 @@
+"""
+Database model for compact word/segment timestamps of a transcription.
+"""
+from datetime import datetime
+from typing import Optional
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from pymongo import IndexModel, ASCENDING
+
+class TranscriptTimingsCollection(Document):
+    """
+    Word and segment timings stored column-wise instead of verbose_json dicts.
+
+    - `tokens`: token table, unique words joined with NUL (utf-8)
+    - `word_start` / `word_end`: float32 arrays (seconds), sorted by start
+    - `word_token`: int32 array, index of each word in the token table
+    - `segment_start` / `segment_end`: float32 arrays (seconds)
+    - `segment_word_offset`: int32 array, index of the first word of each segment
+    """
+    recording_id: Optional[PydanticObjectId] = None
+    meeting_id: Optional[PydanticObjectId] = None
+    org_id: Optional[str] = None
+    created_by: Optional[str] = None
+
+    language: Optional[str] = None
+    duration: float = 0.0
+    word_count: int = 0
+    segment_count: int = 0
+
+    tokens: bytes = b""
+    word_start: bytes = b""
+    word_end: bytes = b""
+    word_token: bytes = b""
+    segment_start: bytes = b""
+    segment_end: bytes = b""
+    segment_word_offset: bytes = b""
+
+    creation_date: datetime = Field(default_factory=datetime.now)
+
+    class Settings:
+        """
+        Beanie settings.
+        """
+        name = "transcript_timings"
+        indexes = [
+            IndexModel([("recording_id", ASCENDING)]),
+            IndexModel([("meeting_id", ASCENDING)]),
+        ]
@@ -2,16 +2,28 @@ from datetime import datetime
 from typing import Optional
 from beanie import Document, Link, PydanticObjectId
 from pydantic import Field
+from pymongo import IndexModel, ASCENDING
 
 from app.schemas import UserBase,DBMeta
 
 
+# Both collections had a lowercase `settings` (ignored by Beanie), so their data lives under the class name
 class UserCollection(UserBase,DBMeta,Document):
     org_id: Optional[PydanticObjectId] = None
     
     
-    class settings:
-        name = "users"
+    class Settings:
+        name = "UserCollection"
+        indexes = [
+            # Login / register lookups
+            IndexModel([("username", ASCENDING)], unique=True),
+            # email is optional: only documents that have one take part in the unique index
+            IndexModel(
+                [("email", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"email": {"$type": "string"}}
+            ),
+        ]
 
 
 class UserSecretsCollection(DBMeta,Document):
@@ -23,8 +35,11 @@ class UserSecretsCollection(DBMeta,Document):
     groq_api_key_hash: Optional[str]=Field(None)
     gemini_api_key_hash: Optional[str]=Field(None)
     
-    class settings:
-        name = "user_secrets"
+    class Settings:
+        name = "UserSecretsCollection"
+        indexes = [
+            IndexModel([("user_id", ASCENDING)], unique=True),
+        ]
     
 
     
\ No newline at end of file
@@ -1,25 +1,78 @@
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import List, Optional
 from beanie import PydanticObjectId
 
 from app.controllers.meetings_ctrl import MeetingsController
+from app.controllers.timings_ctrl import get_timings_window
+from app.controllers.mom_ctrl import MoMController
+from app.services.mom_service import MomSection
+from app.utils.cancellation import cancel_on_disconnect
 from app.models.database.meeting_collection import MeetingCollection
 from app.security import get_current_user
 from app.schemas.common_schema import UserJWT
+from app.schemas.media_schema import TimingsWindowResponse
+from app.schemas.meetings_schema import MeetingSummary, MeetingSearchHit
+from fastapi.responses import ORJSONResponse
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
-@router.get("/meetings", response_model=List[MeetingCollection])
+@router.get("/meetings", response_model=List[MeetingSummary])
 async def list_meetings(
-    skip: int = 0, 
-    limit: int = 50,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: UserJWT = Depends(get_current_user)
 ):
     """
-    List all generated meetings (MoMs).
+    List generated meetings (MoMs) as summaries: headline and section counts.
+    Use GET /meetings/{meeting_id} for the full document.
+
+    Pagination: pass the `X-Next-Cursor` response header back as `?cursor=` for the
+    next page (constant cost at any depth); `skip` still works but slows down on deep pages.
+    """
+    meetings, next_cursor = await MeetingsController.get_all_meetings(current_user, skip, limit, cursor)
+    # Already projected to MeetingSummary in Mongo: serialise directly
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return ORJSONResponse(meetings, headers=headers)
+
+# Declared before /meetings/{meeting_id} so "search" / "semantic-search" are not parsed as ids
+@router.get("/meetings/search", response_model=List[MeetingSearchHit])
+async def search_meetings(
+    q: str = Query(..., min_length=1, description="Keywords; \"quoted phrases\" and -excluded words supported"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    attendee: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(20, ge=1, le=50),
+    current_user: UserJWT = Depends(get_current_user)
+):
+    """
+    Search transcripts and MoM sections (decision headlines, action item titles,
+    topic titles, facts). Ranked by weighted text relevance, with <mark>-highlighted
+    snippets; optionally filtered by creation date range and attendee name.
+    """
+    hits = await MeetingsController.search_meetings(
+        current_user, q, date_from=date_from, date_to=date_to, attendee=attendee, skip=skip, limit=limit
+    )
+    return ORJSONResponse(hits)
+
+@router.get("/meetings/semantic-search", response_model=List[MeetingSearchHit])
+async def semantic_search_meetings(
+    q: str = Query(..., min_length=1, description="Free-text question or description, e.g. \"when did we pick a cloud provider\""),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: UserJWT = Depends(get_current_user)
+):
+    """
+    Search meetings by meaning rather than keywords: MoM sections and transcript
+    passages are compared to the query with locally computed embeddings.
+    Each hit carries its best-matching passage as the snippet (not highlighted).
+    503 unless the server runs with SEMANTIC_SEARCH_ENABLED=true.
     """
-    return await MeetingsController.get_all_meetings(current_user, skip, limit)
+    hits = await MeetingsController.semantic_search(current_user, q, limit=limit)
+    return ORJSONResponse(hits)
 
 @router.get("/meetings/{meeting_id}", response_model=MeetingCollection)
 async def get_meeting(
@@ -34,17 +87,64 @@ async def get_meeting(
         raise HTTPException(status_code=404, detail="Meeting not found")
     return meeting
 
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 
 @router.get("/meetings/{meeting_id}/print", response_class=HTMLResponse)
 async def get_meeting_print(
     meeting_id: PydanticObjectId,
+    http_request: Request,
     current_user: UserJWT = Depends(get_current_user)
 ):
     """
     Get printable HTML for a meeting.
+    Sends ETag / Last-Modified; conditional requests for an unchanged meeting get a 304.
+    """
+    version = await MeetingsController.print_version(meeting_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    # no-cache: browsers keep the page but revalidate (cheap 304) before reusing it
+    headers = {"ETag": version.etag, "Last-Modified": version.last_modified, "Cache-Control": "private, no-cache"}
+    if version.not_modified(http_request.headers.get("if-none-match"), http_request.headers.get("if-modified-since")):
+        return Response(status_code=304, headers=headers)
+
+    html_content = await MeetingsController.generate_html(meeting_id, version)
+    if html_content is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    if isinstance(html_content, str):
+        return HTMLResponse(html_content, headers=headers)
+    return StreamingResponse(html_content, media_type="text/html; charset=utf-8", headers=headers)
+
+@router.get("/meetings/{meeting_id}/timings", response_model=TimingsWindowResponse)
+async def get_meeting_timings(
+    meeting_id: PydanticObjectId,
+    start: str,
+    end: str,
+    current_user: UserJWT = Depends(get_current_user)
+):
+    """
+    Words and segments spoken between `start` and `end` (seconds, mm:ss or hh:mm:ss).
+    """
+    return await get_timings_window(current_user, start, end, meeting_id=meeting_id)
+
+@router.post("/meetings/{meeting_id}/regenerate/{section}", response_model=MeetingCollection)
+async def regenerate_meeting_section(
+    meeting_id: PydanticObjectId,
+    section: MomSection,
+    http_request: Request,
+    dependents: bool = False,
+    bypass_cache: bool = True,
+    current_user: UserJWT = Depends(get_current_user)
+):
+    """
+    Re-extract a single MoM section from the stored transcript (one LLM call, no
+    re-transcription). `?dependents=true` also refreshes the sections built on it
+    (e.g. decisions -> action_items). Only the regenerated fields are updated.
     """
-    html_content = await MeetingsController.generate_html(meeting_id)
-    if not html_content:
-        raise HTTPException(status_code=404, detail="Meeting not found or template error")
-    return html_content
+    return await cancel_on_disconnect(http_request, MoMController.regenerate_section(
+        meeting_id=meeting_id,
+        section=section,
+        include_dependents=dependents,
+        scope=MeetingsController.scope(current_user),
+        bypass_cache=bypass_cache
+    ))
@@ -1,25 +1,52 @@
 
-from fastapi import APIRouter, Body, HTTPException, Depends, UploadFile, File, Form
+from fastapi import APIRouter, Body, HTTPException, Depends, UploadFile, File, Form, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import HttpUrl
 
+from app.controllers.meetings_ctrl import MeetingsController
 from app.controllers.mom_ctrl import MoMController
+from app.controllers.jobs_ctrl import (
+    enqueue_mom_from_text,
+    enqueue_mom_from_audio,
+    enqueue_mom_from_recording,
+    get_job
+)
 from app.models.database.meeting_collection import MeetingCollection
-from app.schemas.mom_schema import GenerateMoMRequest
+from app.schemas.mom_schema import GenerateMoMRequest, UpdateMoMRequest
 from app.security import get_current_user
 from app.schemas.common_schema import UserJWT
+from app.schemas.jobs_schema import JobOut, JobAccepted
+from app.schemas.metrics_schema import MetricsSummary
+from app.controllers.metrics_ctrl import get_metrics_summary
+from app.utils.cancellation import cancel_on_disconnect
+from app.services.llm_cache import llm_cache
 from beanie import PydanticObjectId
 
 router = APIRouter()
 
+# `?background=true`: respond 202 with a job ID, poll GET /mom/jobs/{job_id}
+BACKGROUND_RESPONSES = {202: {"model": JobAccepted, "description": "Queued (background=true)"}}
 
-@router.post("/mom/generate", response_model=MeetingCollection)
+
+def _accepted(job) -> JSONResponse:
+    return JSONResponse(status_code=202, content={"job_id": str(job.id), "status": job.status.value})
+
+
+@router.post("/mom/generate", response_model=MeetingCollection, responses=BACKGROUND_RESPONSES)
 async def generate_mom_endpoint(
     request: GenerateMoMRequest,
+    http_request: Request,
+    bypass_cache: bool = False,
+    background: bool = False,
     current_user: UserJWT = Depends(get_current_user)
 ):
     """
     Generate Minutes of Meeting (MoM) from a transcript.
+    With `background=true` the work is queued and a job ID is returned immediately.
     """
+    if background:
+        return _accepted(await enqueue_mom_from_text(request, current_user, bypass_cache))
+
     org_id = current_user.get("org_id")
     # if org_id is None, it might be in the user collection, but for now we assume it's in token or None
     # If strictly required, we should fetch user. But let's pass what we have.
@@ -30,7 +57,7 @@ async def generate_mom_endpoint(
     user_id = current_user.get("sub")
     uid = PydanticObjectId(user_id) if user_id else None
 
-    return await MoMController.generate_mom_from_text(
+    return await cancel_on_disconnect(http_request, MoMController.generate_mom_from_text(
         transcription=request.transcription,
         meeting_link=str(request.meeting_link),
         audio_url=str(request.audio_url),
@@ -38,48 +65,161 @@ async def generate_mom_endpoint(
         meeting_time=request.meeting_time,
         meeting_duration=request.meeting_duration,
         org_id=oid,
-        created_by=uid
+        created_by=uid,
+        bypass_cache=bypass_cache
+    ))
+
+@router.post("/mom/generate/stream")
+async def stream_mom_endpoint(
+    request: GenerateMoMRequest,
+    bypass_cache: bool = False,
+    current_user: UserJWT = Depends(get_current_user)
+):
+    """
+    Generate a MoM from a transcript, streamed as Server-Sent Events:
+    `section` events ({"section", "data"}) as each extraction node completes,
+    then `meeting` ({"meeting_id"}) once saved, or `error` ({"detail"}).
+    POST, so consume it with fetch() rather than EventSource. Closing the
+    connection cancels the generation.
+    """
+    org_id = current_user.get("org_id")
+    oid = PydanticObjectId(org_id) if org_id else None
+
+    user_id = current_user.get("sub")
+    uid = PydanticObjectId(user_id) if user_id else None
+
+    return StreamingResponse(
+        MoMController.stream_mom_from_text(
+            transcription=request.transcription,
+            meeting_link=str(request.meeting_link),
+            audio_url=str(request.audio_url),
+            meeting_date=request.meeting_date,
+            meeting_time=request.meeting_time,
+            meeting_duration=request.meeting_duration,
+            org_id=oid,
+            created_by=uid,
+            bypass_cache=bypass_cache
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
-@router.post("/mom/generate-from-audio", response_model=MeetingCollection)
+@router.post("/mom/generate-from-audio", response_model=MeetingCollection, responses=BACKGROUND_RESPONSES)
 async def generate_mom_from_audio_endpoint(
+    request: Request,
     file: UploadFile = File(...),
     meeting_link: str = Form(...),
     meeting_date: str = Form(...),
     meeting_time: str = Form(...),
+    bypass_cache: bool = False,
+    background: bool = False,
     current_user: UserJWT = Depends(get_current_user)
 ):
     """
     Generate MoM from an audio file.
     Accepts audio file, converts if necessary, transcribes, and generates MoM.
+    With `background=true` the upload is stored, queued and a job ID is returned immediately.
     """
+    if background:
+        return _accepted(await enqueue_mom_from_audio(file, meeting_link, meeting_date, meeting_time, current_user, bypass_cache))
+
     org_id = current_user.get("org_id")
     oid = PydanticObjectId(org_id) if org_id else None
     
     user_id = current_user.get("sub")
     uid = PydanticObjectId(user_id) if user_id else None
 
-    return await MoMController.generate_mom_from_audio(
+    return await cancel_on_disconnect(request, MoMController.generate_mom_from_audio(
         file=file,
         meeting_link=meeting_link,
         meeting_date=meeting_date,
         meeting_time=meeting_time,
         org_id=oid,
-        created_by=uid
-    )
+        created_by=uid,
+        bypass_cache=bypass_cache
+    ))
 
-@router.post("/mom/generate-from-recording/{recording_id}", response_model=MeetingCollection)
+@router.post("/mom/generate-from-recording/{recording_id}", response_model=MeetingCollection, responses=BACKGROUND_RESPONSES)
 async def generate_mom_from_recording_endpoint(
     recording_id: PydanticObjectId,
+    request: Request,
+    bypass_cache: bool = False,
+    background: bool = False,
     current_user: UserJWT = Depends(get_current_user)
 ):
     """
     Generate MoM from an existing recording.
+    With `background=true` the work is queued and a job ID is returned immediately.
     """
+    if background:
+        return _accepted(await enqueue_mom_from_recording(recording_id, current_user, bypass_cache))
+
     org_id = current_user.get("org_id")
     oid = PydanticObjectId(org_id) if org_id else None
 
-    return await MoMController.generate_mom_from_recording(
+    return await cancel_on_disconnect(request, MoMController.generate_mom_from_recording(
         recording_id=recording_id,
-        org_id=oid
-    )
+        org_id=oid,
+        bypass_cache=bypass_cache
+    ))
+
+@router.post("/mom/update/{meeting_id}", response_model=MeetingCollection)
+async def update_mom_endpoint(
+    meeting_id: PydanticObjectId,
+    request: UpdateMoMRequest,
+    http_request: Request,
+    bypass_cache: bool = False,
+    current_user: UserJWT = Depends(get_current_user)
+):
+    """
+    Incrementally update a MoM with the transcript added since the last update.
+    Only the new content is processed; the meeting is updated in place.
+    """
+    return await cancel_on_disconnect(http_request, MoMController.update_mom(
+        meeting_id=meeting_id,
+        transcript_delta=request.transcript_delta,
+        meeting_duration=request.meeting_duration,
+        scope=MeetingsController.scope(current_user),
+        bypass_cache=bypass_cache
+    ))
+
+@router.get("/mom/jobs/{job_id}", response_model=JobOut)
+async def get_mom_job_endpoint(
+    job_id: PydanticObjectId,
+    current_user: UserJWT = Depends(get_current_user)
+):
+    """
+    Get the status of a queued MoM job: current stage (transcoding, transcribing,
+    extracting_<section>, saving), per-stage timings and, once finished, the meeting ID.
+    """
+    return await get_job(job_id, current_user)
+
+@router.get("/mom/llm-cache/stats")
+async def llm_cache_stats_endpoint(
+    current_user: UserJWT = Depends(get_current_user)
+):
+    """
+    Hit/miss counters of the structured LLM output cache (this process).
+    Pass `?bypass_cache=true` to the generate endpoints to skip it for one request.
+    """
+    return llm_cache.stats()
+
+@router.get("/mom/llm-backends/stats")
+async def llm_backend_stats_endpoint(
+    current_user: UserJWT = Depends(get_current_user)
+):
+    """
+    Latency / error stats of the routed LLM backends (empty with a single backend).
+    """
+    return MoMController.llm_backend_stats()
+
+@router.get("/mom/metrics", response_model=MetricsSummary)
+async def mom_metrics_endpoint(
+    days: int = 30,
+    current_user: UserJWT = Depends(get_current_user)
+):
+    """
+    MoM pipeline metrics for the caller's org over the last `days`:
+    tokens, calls, retries and cache hits per model, latency and tokens per step.
+    """
+    return await get_metrics_summary(current_user, days)
@@ -2,9 +2,10 @@
 Router for audio recordings, handling streaming and upload endpoints.
 """
 import logging
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, WebSocket, UploadFile, File, Form, HTTPException, Depends
+from fastapi import APIRouter, WebSocket, UploadFile, File, Form, HTTPException, Depends, Query
+from fastapi.responses import ORJSONResponse
 
 from app.controllers import (
     handle_websocket_recording,
@@ -13,8 +14,13 @@ from app.controllers import (
     get_recordings,
     get_recording_stats
 )
+from beanie import PydanticObjectId
+
+from app.controllers.timings_ctrl import get_timings_window
+from app.utils.pagination import NEXT_CURSOR_HEADER
 from app.security import get_current_user
 from app.schemas import UserJWT, RecordingOut, RecordingStats
+from app.schemas.media_schema import TimingsWindowResponse
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -78,14 +84,19 @@ async def upload_audio_file_endpoint(
 
 @router.get("/recordings", response_model=List[RecordingOut])
 async def list_recordings(
-    skip: int = 0,
-    limit: int = 5,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(5, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: UserJWT = Depends(get_current_user)
 ):
     """
     Get recent recordings/meetings for the dashboard.
+    The next page's cursor is returned in the `X-Next-Cursor` header (pass it as `?cursor=`).
     """
-    return await get_recordings(current_user, skip, limit)
+    recordings, next_cursor = await get_recordings(current_user, skip, limit, cursor)
+    # Already projected to RecordingOut in Mongo: serialise directly
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return ORJSONResponse(recordings, headers=headers)
 
 @router.get("/recordings/stats", response_model=RecordingStats)
 async def get_stats(
@@ -95,3 +106,15 @@ async def get_stats(
     Get dashboard statistics.
     """
     return await get_recording_stats(current_user)
+
+@router.get("/recordings/{recording_id}/timings", response_model=TimingsWindowResponse)
+async def get_recording_timings(
+    recording_id: PydanticObjectId,
+    start: str,
+    end: str,
+    current_user: UserJWT = Depends(get_current_user)
+):
+    """
+    Words and segments spoken between `start` and `end` (seconds, mm:ss or hh:mm:ss).
+    """
+    return await get_timings_window(current_user, start, end, recording_id=recording_id)
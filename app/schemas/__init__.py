@@ -29,13 +29,29 @@ from app.schemas.mom_schema import (
                                Agendas,
                             
                                Attendee,
-                               Attendees
+                               Attendees,
+
+                               MeetingMinutes
                             )
 
 from app.schemas.meetings_schema import (
-                                        MeetingBase
+                                        MeetingBase,
+                                        MeetingSummary,
+                                        MeetingSearchHit,
+                                        SearchSnippet,
+                                        TranscriptStats
                                     )
 from app.schemas.recordings_schema import (
                                         RecordingOut,
                                         RecordingStats
                                     )
+from app.schemas.jobs_schema import (
+                                        JobOut,
+                                        JobAccepted
+                                    )
+from app.schemas.metrics_schema import (
+                                        StepMetrics,
+                                        ModelUsage,
+                                        StepUsage,
+                                        MetricsSummary
+                                    )
@@ -2,13 +2,14 @@
 from datetime import datetime
 from typing import Optional, TypedDict
 from beanie import PydanticObjectId
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class DBMeta(BaseModel):
     org_id: PydanticObjectId
-    created_on: datetime = datetime.now()
-    updated_on: datetime = datetime.now()
+    # default_factory: a plain default is evaluated once at import time
+    created_on: datetime = Field(default_factory=datetime.now)
+    updated_on: datetime = Field(default_factory=datetime.now)
     updated_by: Optional[PydanticObjectId]=None
     updated_by: Optional[PydanticObjectId]=None
 
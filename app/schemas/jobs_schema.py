@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Optional, Any
+from pydantic import BaseModel, Field
+from beanie import PydanticObjectId
+from app.models.database.jobs_collection import JobStatus
+
+class JobOut(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    kind: str
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    last_error: Optional[str] = None
+    result: Optional[dict[str, Any]] = None
+    stage: Optional[str] = None
+    stage_timings: dict[str, float] = Field(default_factory=dict)
+    meeting_id: Optional[str] = None
+    creation_date: datetime
+    updated_on: datetime
+
+    class Config:
+        from_attributes = True
+        populate_by_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {
+            PydanticObjectId: str
+        }
+
+class JobAccepted(BaseModel):
+    job_id: str
+    status: JobStatus
@@ -12,3 +12,21 @@ class ConvertResponse(BaseModel):
     filename: str
     media_type: str
     size: int
+
+class TimedWord(BaseModel):
+    word: str
+    start: float
+    end: float
+
+class TimedSegment(BaseModel):
+    id: int
+    start: float
+    end: float
+    text: str
+
+class TimingsWindowResponse(BaseModel):
+    start: float
+    end: float
+    text: str
+    words: List[TimedWord]
+    segments: List[TimedSegment]
@@ -11,9 +11,22 @@ from app.schemas import (
                         Facts,
                         Attendees
                         )
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
+from pydantic import Field
 from beanie import PydanticObjectId
 
+class TranscriptStats(BaseModel):
+    """
+    Token reduction from transcript pre-processing (what the LLM actually received).
+    """
+    original_tokens: int = 0
+    processed_tokens: int = 0
+    reduction_pct: float = 0.0
+    fillers_removed: int = 0
+    repetitions_collapsed: int = 0
+    loop_sentences_dropped: int = 0
+
 class MeetingBase(BaseModel):
     """
         The root model containing all extraction categories.
@@ -36,3 +49,35 @@ class MeetingBase(BaseModel):
     
     recording_id: Optional[PydanticObjectId] = None
 
+class MeetingSummary(BaseModel):
+    """
+    List view of a meeting: no transcript or section bodies, only a headline and counts.
+    The full document comes from GET /meetings/{meeting_id}.
+    """
+    id: PydanticObjectId = Field(alias="_id")
+    meeting_link: Optional[str] = None
+    meeting_date: Optional[str] = None
+    meeting_time: Optional[str] = None
+    meeting_duration: Optional[str] = None
+    recording_id: Optional[PydanticObjectId] = None
+    created_on: Optional[datetime] = None
+    headline: Optional[str] = None
+    attendees_count: int = 0
+    topics_count: int = 0
+    decisions_count: int = 0
+    action_items_count: int = 0
+    facts_count: int = 0
+
+class SearchSnippet(BaseModel):
+    """
+    Excerpt of a matching field, HTML-escaped, with matched terms wrapped in <mark>.
+    """
+    field: str
+    text: str
+
+class MeetingSearchHit(MeetingSummary):
+    """
+    Search result: the meeting summary plus relevance score and highlighted snippets.
+    """
+    score: float
+    snippets: List[SearchSnippet] = []
@@ -0,0 +1,50 @@
+from typing import Optional, List
+from pydantic import BaseModel, Field
+
+class StepMetrics(BaseModel):
+    """
+    One measured step of a MoM run (a graph node, the transcription call, ...).
+    Token counts come from the provider's response metadata.
+    """
+    name: str
+    provider: Optional[str] = None
+    model: Optional[str] = None
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    seconds: float = 0.0
+    retries: int = 0
+    cache_hits: int = 0
+    audio_seconds: Optional[float] = None
+
+class ModelUsage(BaseModel):
+    provider: Optional[str] = None
+    model: Optional[str] = None
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+    cache_hits: int = 0
+    seconds: float = 0.0
+
+class StepUsage(BaseModel):
+    name: str
+    count: int = 0
+    avg_seconds: float = 0.0
+    max_seconds: float = 0.0
+    avg_prompt_tokens: float = 0.0
+    avg_completion_tokens: float = 0.0
+    retries: int = 0
+    cache_hits: int = 0
+
+class MetricsSummary(BaseModel):
+    """
+    Aggregated MoM run metrics for the caller's org over a time window.
+    """
+    days: int
+    runs: int = 0
+    total_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    by_model: List[ModelUsage] = Field(default_factory=list)
+    by_step: List[StepUsage] = Field(default_factory=list)
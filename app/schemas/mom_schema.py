@@ -9,6 +9,10 @@ class GenerateMoMRequest(BaseModel):
     meeting_time: str
     meeting_duration: str
 
+class UpdateMoMRequest(BaseModel):
+    transcript_delta: str = Field(..., min_length=1, description='New transcript text since the last update')
+    meeting_duration: Optional[str] = None
+
 class Attendee(BaseModel):
     name: str=Field(...,description='Name of the attendee')
     designation:Optional[str]=Field(None,description='Designation of the attendee if it was mentioned in the transcript')
@@ -184,4 +188,33 @@ class GeneralSummaries(BaseModel):
     general_summaries: List[GeneralSummary] = Field(
         default_factory=list,
         description="Extract all high-level executive summaries."
-    )
\ No newline at end of file
+    )
+
+class MeetingMinutes(BaseModel):
+    """
+    All MoM sections extracted in a single pass (used for short meetings).
+    """
+    attendees: Attendees = Field(
+        default_factory=Attendees,
+        description="Attendees of the meeting."
+    )
+    general_summaries: GeneralSummaries = Field(
+        default_factory=GeneralSummaries,
+        description="High-level executive summary of the entire meeting."
+    )
+    topic_summaries: TopicSummaries = Field(
+        default_factory=TopicSummaries,
+        description="Summaries of every major topic discussed."
+    )
+    facts: Facts = Field(
+        default_factory=Facts,
+        description="Objective facts, metrics and status updates."
+    )
+    decisions: Decisions = Field(
+        default_factory=Decisions,
+        description="Binding decisions made during the meeting."
+    )
+    action_items: ActionItems = Field(
+        default_factory=ActionItems,
+        description="Actionable tasks, aligned with the decisions made."
+    )
@@ -2,25 +2,21 @@
 Main server configuration and startup logic.
 """
 import os
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from beanie import init_beanie
-from motor.motor_asyncio import AsyncIOMotorClient
 # Exception Handling
 from app.utils.exception_handler import global_exception_handler
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 from app.env_settings import env
 from app.routers import router as main_router
-from app.models.database import (
-    UserCollection,
-    UserSecretsCollection,
-    IdentityCollection,
-    IdentityEmbeddingCollection,
-    RecordingCollection,
-    MeetingCollection
-)
+from app.models.database.connection import init_db
+from app.services.job_queue import JobWorker
+from app.services.tokens import get_tokenizer
+from app.controllers.jobs_ctrl import job_queue, JOB_HANDLERS, JOB_DEAD_HOOKS
 
 
 @asynccontextmanager
@@ -29,17 +25,13 @@ async def lifespan(_app: FastAPI):
     Lifecycle manager for the FastAPI app.
     Handles startup (DB connection, dir creation) and shutdown events.
     """
-    # Init DB
-    client = AsyncIOMotorClient(env.MONGODB_URL)
-    await init_beanie(database=client.eazzmeetings, document_models=[
-        UserCollection,
-        UserSecretsCollection,
-        IdentityCollection,
-        IdentityEmbeddingCollection,
-        RecordingCollection,
-        MeetingCollection
-    ])
-    print("✅ Startup: Connected to Database")
+    # Init DB (also syncs the indexes declared on the document models)
+    await init_db()
+    print("✅ Startup: Connected to Database, indexes synced")
+
+    # Load the tokenizer now (may download it) rather than on the first MoM request
+    await asyncio.to_thread(get_tokenizer)
+    print("✅ Startup: Tokenizer ready")
 
     audio_dir = env.AUDIO_DIR_PATH or "recordings"
 
@@ -49,10 +41,27 @@ async def lifespan(_app: FastAPI):
     else:
         print(f"✅ Startup: Directory '{audio_dir}' exists")
 
+    # Opt-in bounded in-process executor for `?background=true` MoM jobs.
+    # Off by default (0): jobs are run by `python -m app.worker`.
+    background_concurrency = int(env.BACKGROUND_WORKER_CONCURRENCY or 0)
+    stop_event = asyncio.Event()
+    worker_task = None
+    if background_concurrency > 0:
+        worker = JobWorker(job_queue, JOB_HANDLERS, concurrency=background_concurrency, on_dead=JOB_DEAD_HOOKS)
+        worker_task = asyncio.create_task(worker.run(stop_event))
+        print(f"✅ Startup: Background worker running ({background_concurrency} slots)")
+
     yield  # Application runs here
 
     # --- Shutdown Logic (Optional) ---
     print("🛑 Shutting down...")
+    if worker_task:
+        stop_event.set()
+        try:
+            # Unfinished jobs are picked up again once their lease expires
+            await asyncio.wait_for(worker_task, timeout=float(env.BACKGROUND_WORKER_SHUTDOWN_SECONDS or 30))
+        except asyncio.TimeoutError:
+            worker_task.cancel()
 
 
 app = FastAPI(
@@ -66,7 +75,9 @@ app.add_middleware(
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    # Browsers only let JS read non-safelisted response headers that are exposed
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"]
 )
 
 app.add_exception_handler(Exception, global_exception_handler)
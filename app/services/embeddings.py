@@ -0,0 +1,87 @@
+"""
+Local sentence embeddings on CPU via transformers (semantic meeting search).
+
+A small sentence-embedding checkpoint (all-MiniLM-L6-v2 by default, 384 dims)
+is loaded once per worker process. Sentence vectors are the attention-masked
+mean of the last hidden state, L2-normalised, so a dot product is the cosine
+similarity. Texts are batched, sorted by length so each batch pads as little
+as possible, and stored as float16.
+
+Like local_whisper, this module imports torch at the top: import it lazily from
+code that may run on nodes without the model.
+"""
+import threading
+import logging
+
+import numpy as np
+import torch
+from transformers import AutoModel, AutoTokenizer
+
+from app.env_settings import env
+
+logger = logging.getLogger(__name__)
+
+# One (tokenizer, model) per checkpoint per process
+_models: dict = {}
+_models_lock = threading.Lock()
+
+
+def _load_model(model_id: str):
+    """
+    Loads (or returns the already loaded) tokenizer and encoder for a checkpoint.
+    """
+    if model_id in _models:
+        return _models[model_id]
+
+    with _models_lock:
+        if model_id in _models:
+            return _models[model_id]
+
+        if env.EMBEDDING_THREADS:
+            torch.set_num_threads(int(env.EMBEDDING_THREADS))
+
+        logger.info(f"Loading embedding checkpoint '{model_id}'")
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        model = AutoModel.from_pretrained(model_id, torch_dtype=torch.float32, low_cpu_mem_usage=True)
+        model.eval()
+        _models[model_id] = (tokenizer, model)
+        return _models[model_id]
+
+
+class LocalEmbedder:
+    """
+    Embeds texts with the EMBEDDING_MODEL checkpoint (loaded on first use).
+    """
+    def __init__(self, model_id: str | None = None):
+        self.model_id = model_id or env.EMBEDDING_MODEL
+        self.batch_size = int(env.EMBEDDING_BATCH_SIZE or 32)
+        self.max_tokens = int(env.EMBEDDING_MAX_TOKENS or 256)
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """
+        (len(texts), dim) float16 array of unit vectors, in input order.
+        """
+        tokenizer, model = _load_model(self.model_id)
+        dim = model.config.hidden_size
+        vectors = np.zeros((len(texts), dim), dtype=np.float16)
+        if not texts:
+            return vectors
+
+        # Similar lengths in the same batch: less padding to run through the encoder
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        with torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                encoded = tokenizer(
+                    [texts[i] for i in batch],
+                    padding=True,
+                    truncation=True,
+                    max_length=self.max_tokens,
+                    return_tensors="pt",
+                )
+                hidden = model(**encoded).last_hidden_state
+                mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+                vectors[batch] = pooled.numpy().astype(np.float16)
+        return vectors
@@ -0,0 +1,371 @@
+"""
+Local stand-in for the Groq / Mistral HTTP APIs.
+
+Implements the endpoints used by TranscriptionService and LLMService:
+- POST /openai/v1/audio/transcriptions   (Groq Whisper, verbose_json)
+- POST /openai/v1/chat/completions       (Groq chat, tools / json_schema structured output)
+- POST /v1/chat/completions              (Mistral chat)
+
+Responses are canned (FAKE_PROVIDER_CANNED_PATH) or synthesised from the
+requested tool / JSON schema, with configurable latency and 429/5xx injection.
+
+Enable it with FAKE_PROVIDER_URL:
+- "http://localhost:8090" -> clients talk to a stand-in server started with
+  `python -m app.services.fake_provider --port 8090`
+- "inprocess"             -> clients are wired to this ASGI app directly (no server, good for CI)
+
+Latency specs (FAKE_PROVIDER_CHAT_LATENCY / FAKE_PROVIDER_AUDIO_LATENCY), in milliseconds:
+    "constant:500", "uniform:200,1500", "normal:800,200", "lognormal:800,0.5"
+"""
+import json
+import math
+import time
+import random
+import uuid
+import asyncio
+import threading
+import argparse
+from typing import Any, Optional
+
+import httpx
+from fastapi import FastAPI, Request, UploadFile, File, Form
+from fastapi.responses import JSONResponse
+
+from app.env_settings import env
+from app.services.tokens import estimate_tokens
+
+INPROCESS = "inprocess"
+
+DEFAULT_TRANSCRIPT = (
+    "Alice: Let's start the meeting. The main goal today is to decide on the UI framework. "
+    "Bob: I suggest we use React because the team is already familiar with it. "
+    "Alice: Okay, agreed. Let's go with React. Bob, please set up the repository by tomorrow."
+)
+
+
+# --- Configuration ---
+
+def parse_latency(spec: Optional[str]):
+    """
+    Returns a sampler (-> seconds) for a latency spec such as "lognormal:800,0.5".
+    """
+    if not spec:
+        return lambda: 0.0
+    kind, _, args = spec.partition(":")
+    params = [float(p) for p in args.split(",") if p]
+    if kind == "constant":
+        return lambda: params[0] / 1000
+    if kind == "uniform":
+        return lambda: random.uniform(params[0], params[1]) / 1000
+    if kind == "normal":
+        return lambda: max(random.gauss(params[0], params[1]), 0) / 1000
+    if kind == "lognormal":
+        # params: median (ms), sigma
+        mu = math.log(params[0])
+        return lambda: random.lognormvariate(mu, params[1]) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class FakeProviderConfig:
+    def __init__(self):
+        self.chat_latency = parse_latency(env.FAKE_PROVIDER_CHAT_LATENCY)
+        self.audio_latency = parse_latency(env.FAKE_PROVIDER_AUDIO_LATENCY)
+        self.rate_429 = float(env.FAKE_PROVIDER_429_RATE or 0)
+        self.rate_5xx = float(env.FAKE_PROVIDER_5XX_RATE or 0)
+        self.retry_after = env.FAKE_PROVIDER_RETRY_AFTER or "1"
+        self.canned: dict[str, Any] = {}
+        if env.FAKE_PROVIDER_CANNED_PATH:
+            with open(env.FAKE_PROVIDER_CANNED_PATH, "r", encoding="utf-8") as f:
+                self.canned = json.load(f)
+
+    def canned_for(self, name: str) -> Optional[Any]:
+        """
+        Canned value for a tool/schema name (or "transcription", "chat").
+        A list value is treated as alternatives and one is picked at random.
+        """
+        value = self.canned.get(name)
+        if isinstance(value, list) and value and name not in ("transcription", "chat"):
+            return random.choice(value)
+        return value
+
+
+config = FakeProviderConfig()
+fake_provider_app = FastAPI(title="fake-provider")
+
+
+# --- Helpers ---
+
+def _resolve(schema: dict, root: dict) -> dict:
+    ref = schema.get("$ref")
+    if ref:
+        target = root
+        for part in ref.lstrip("#/").split("/"):
+            target = target[part]
+        return target
+    return schema
+
+
+def example_from_schema(schema: dict, root: Optional[dict] = None, name: str = "value") -> Any:
+    """
+    Builds a minimal instance that validates against a JSON schema.
+    """
+    root = root or schema
+    schema = _resolve(schema, root)
+
+    if "enum" in schema:
+        return schema["enum"][0]
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            options = [s for s in schema[key] if _resolve(s, root).get("type") != "null"]
+            return example_from_schema(options[0] if options else schema[key][0], root, name)
+
+    kind = schema.get("type")
+    if kind == "object" or "properties" in schema:
+        return {
+            prop: example_from_schema(sub, root, prop)
+            for prop, sub in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [example_from_schema(schema.get("items", {}), root, name)]
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 1.0
+    if kind == "boolean":
+        return False
+    if kind == "null":
+        return None
+    return f"Sample {name.replace('_', ' ')}"
+
+
+def _usage(prompt: str, completion: str) -> dict:
+    prompt_tokens = estimate_tokens(prompt)
+    completion_tokens = estimate_tokens(completion)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+async def _inject_faults(latency: float) -> Optional[JSONResponse]:
+    await asyncio.sleep(latency)
+    roll = random.random()
+    if roll < config.rate_429:
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after": config.retry_after},
+            content={"error": {"message": "Rate limit reached (fake provider)", "type": "tokens", "code": "rate_limit_exceeded"}},
+        )
+    if roll < config.rate_429 + config.rate_5xx:
+        return JSONResponse(
+            status_code=503,
+            content={"error": {"message": "Service unavailable (fake provider)", "type": "internal_server_error"}},
+        )
+    return None
+
+
+def _tool_name(body: dict) -> Optional[str]:
+    tool_choice = body.get("tool_choice")
+    if isinstance(tool_choice, dict):
+        return tool_choice.get("function", {}).get("name")
+    if isinstance(tool_choice, str) and tool_choice not in ("auto", "none", "required", "any"):
+        return tool_choice
+    tools = body.get("tools") or []
+    return tools[0]["function"]["name"] if tools else None
+
+
+# --- Endpoints ---
+
+async def _chat_completion(request: Request) -> JSONResponse:
+    body = await request.json()
+    fault = await _inject_faults(config.chat_latency())
+    if fault:
+        return fault
+
+    prompt = "\n".join(str(m.get("content") or "") for m in body.get("messages", []))
+    message: dict[str, Any] = {"role": "assistant", "content": ""}
+    finish_reason = "stop"
+
+    tool_name = _tool_name(body)
+    response_format = body.get("response_format") or {}
+    if tool_name:
+        tool = next(t for t in body["tools"] if t["function"]["name"] == tool_name)
+        arguments = config.canned_for(tool_name)
+        if arguments is None:
+            parameters = tool["function"].get("parameters", {})
+            arguments = example_from_schema(parameters, parameters, tool_name)
+        message["tool_calls"] = [{
+            "id": f"call_{uuid.uuid4().hex[:12]}",
+            "type": "function",
+            "function": {"name": tool_name, "arguments": json.dumps(arguments)},
+        }]
+        completion = message["tool_calls"][0]["function"]["arguments"]
+        finish_reason = "tool_calls"
+    elif response_format.get("type") == "json_schema":
+        json_schema = response_format["json_schema"]
+        content = config.canned_for(json_schema.get("name", ""))
+        if content is None:
+            content = example_from_schema(json_schema["schema"], json_schema["schema"], json_schema.get("name", "value"))
+        message["content"] = completion = json.dumps(content)
+    else:
+        message["content"] = completion = config.canned_for("chat") or "This is a response from the fake provider."
+
+    return JSONResponse(content={
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": _usage(prompt, completion),
+    })
+
+
+@fake_provider_app.post("/openai/v1/chat/completions")
+async def groq_chat_completions(request: Request):
+    return await _chat_completion(request)
+
+
+@fake_provider_app.post("/v1/chat/completions")
+async def mistral_chat_completions(request: Request):
+    return await _chat_completion(request)
+
+
+@fake_provider_app.post("/openai/v1/audio/transcriptions")
+async def groq_transcriptions(
+    file: UploadFile = File(...),
+    model: str = Form(...),
+    response_format: str = Form("json"),
+    language: Optional[str] = Form(None)
+):
+    content = await file.read()
+    fault = await _inject_faults(config.audio_latency())
+    if fault:
+        return fault
+
+    text = config.canned_for("transcription") or DEFAULT_TRANSCRIPT
+    # Opus at 24kbps -> ~3000 bytes per second of audio
+    duration = max(len(content) / 3000, 1.0)
+    tokens = text.split()
+    step = duration / max(len(tokens), 1)
+    words = [{"word": w, "start": round(i * step, 2), "end": round((i + 1) * step, 2)} for i, w in enumerate(tokens)]
+
+    segments = []
+    for seg_id, first in enumerate(range(0, len(words), 12)):
+        chunk = words[first:first + 12]
+        segments.append({
+            "id": seg_id,
+            "seek": 0,
+            "start": chunk[0]["start"],
+            "end": chunk[-1]["end"],
+            "text": " " + " ".join(w["word"] for w in chunk),
+            "tokens": [],
+            "temperature": 0.0,
+            "avg_logprob": -0.2,
+            "compression_ratio": 1.5,
+            "no_speech_prob": 0.01,
+        })
+
+    if response_format != "verbose_json":
+        return JSONResponse(content={"text": text})
+    return JSONResponse(content={
+        "task": "transcribe",
+        "language": language or "English",
+        "duration": duration,
+        "text": text,
+        "segments": segments,
+        "words": words,
+        "x_groq": {"id": f"req_{uuid.uuid4().hex}"},
+    })
+
+
+# --- Client wiring ---
+
+class SyncASGITransport(httpx.BaseTransport):
+    """
+    Lets synchronous httpx clients call an ASGI app in-process
+    (the app runs on a private event loop thread).
+    """
+    def __init__(self, app):
+        self._transport = httpx.ASGITransport(app=app)
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True, name="fake-provider").start()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        future = asyncio.run_coroutine_threadsafe(self._handle(request), self._loop)
+        return future.result()
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        content = await response.aread()
+        return httpx.Response(response.status_code, headers=response.headers, content=content, request=request)
+
+
+_sync_transport: Optional[SyncASGITransport] = None
+
+
+def is_enabled() -> bool:
+    return bool(env.FAKE_PROVIDER_URL)
+
+
+def _http_clients() -> tuple[Optional[httpx.Client], Optional[httpx.AsyncClient]]:
+    global _sync_transport  # pylint: disable=global-statement
+    if env.FAKE_PROVIDER_URL != INPROCESS:
+        return None, None
+    if _sync_transport is None:
+        _sync_transport = SyncASGITransport(fake_provider_app)
+    return (
+        httpx.Client(transport=_sync_transport),
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_provider_app)),
+    )
+
+
+def _base_url() -> str:
+    return "http://fake-provider" if env.FAKE_PROVIDER_URL == INPROCESS else env.FAKE_PROVIDER_URL.rstrip("/")
+
+
+def groq_client_kwargs() -> dict:
+    """
+    Extra kwargs for `groq.Groq(...)` when the fake provider is enabled.
+    """
+    if not is_enabled():
+        return {}
+    sync_client, _ = _http_clients()
+    kwargs: dict[str, Any] = {"base_url": _base_url(), "api_key": env.GROQ_API_KEY or "fake"}
+    if sync_client:
+        kwargs["http_client"] = sync_client
+    return kwargs
+
+
+def chat_client_kwargs(provider: str = "groq") -> dict:
+    """
+    Extra kwargs for LangChain chat models (ChatGroq / ChatMistralAI) when the fake provider is enabled.
+    """
+    if not is_enabled():
+        return {}
+    sync_client, async_client = _http_clients()
+    if provider == "mistral":
+        kwargs: dict[str, Any] = {"endpoint": f"{_base_url()}/v1", "api_key": env.MISTRAL_API_KEY or "fake"}
+        if sync_client:
+            kwargs["client"] = httpx.Client(transport=_sync_transport, base_url=f"{_base_url()}/v1")
+            kwargs["async_client"] = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=fake_provider_app), base_url=f"{_base_url()}/v1"
+            )
+        return kwargs
+
+    kwargs = {"base_url": _base_url(), "api_key": env.GROQ_API_KEY or "fake"}
+    if sync_client:
+        kwargs["http_client"] = sync_client
+        kwargs["http_async_client"] = async_client
+    return kwargs
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake Groq/Mistral provider")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    args = parser.parse_args()
+    uvicorn.run(fake_provider_app, host=args.host, port=args.port)
@@ -0,0 +1,85 @@
+"""
+Stage reporting for running jobs.
+
+The worker puts a JobProgress in a context variable while a handler runs; code
+anywhere below it (controllers, MoM graph nodes) wraps its steps in
+`track_stage(...)`. Outside a job it is a no-op, so request-path code is shared.
+"""
+import time
+import logging
+from contextvars import ContextVar
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Optional
+
+from beanie import PydanticObjectId
+
+logger = logging.getLogger(__name__)
+
+
+class JobProgress:
+    """
+    Records the current stage of a job and how long each stage took (seconds).
+    Stages may overlap (parallel graph nodes); the most recently entered one is current.
+    """
+    def __init__(self, write: Callable[[dict], Awaitable[None]], meeting_id: Optional[str] = None):
+        self._write = write
+        self.timings: dict[str, float] = {}
+        # Meeting saved (or about to be saved) by this job, kept across attempts
+        self.meeting_id = meeting_id
+
+    async def _safe_write(self, update: dict) -> None:
+        # Progress is best-effort: never fail the job because of it
+        try:
+            await self._write(update)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning(f"Could not record job progress: {e}")
+
+    @asynccontextmanager
+    async def stage(self, name: str):
+        await self._safe_write({"stage": name})
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = round(time.perf_counter() - t0, 3)
+            self.timings[name] = elapsed
+            await self._safe_write({f"stage_timings.{name}": elapsed})
+
+    async def reserve_meeting_id(self) -> PydanticObjectId:
+        """
+        The id this job saves its meeting under. A new id is recorded on the job
+        before the meeting is inserted (not best-effort: if this fails nothing was
+        saved yet), so a retry after a later failure reuses it instead of inserting
+        a duplicate meeting.
+        """
+        if self.meeting_id is None:
+            meeting_id = str(PydanticObjectId())
+            await self._write({"meeting_id": meeting_id})
+            self.meeting_id = meeting_id
+        return PydanticObjectId(self.meeting_id)
+
+
+current_job: ContextVar[Optional[JobProgress]] = ContextVar("current_job", default=None)
+
+
+async def reserve_job_meeting_id() -> Optional[PydanticObjectId]:
+    """
+    Meeting id reserved by the current job (see JobProgress.reserve_meeting_id), None outside a job.
+    """
+    progress = current_job.get()
+    if progress is None:
+        return None
+    return await progress.reserve_meeting_id()
+
+
+@asynccontextmanager
+async def track_stage(name: str):
+    """
+    Marks a step of the current job (if any) as running.
+    """
+    progress = current_job.get()
+    if progress is None:
+        yield
+        return
+    async with progress.stage(name):
+        yield
@@ -0,0 +1,273 @@
+"""
+Mongo-backed durable job queue with lease-based claiming.
+
+Jobs are claimed atomically with findAndModify. A claimed job carries a lease
+(visibility timeout) that the worker keeps extending while the job runs; if the
+worker dies the lease expires and another worker picks the job up. Failed jobs
+are retried with exponential backoff until max_attempts, then dead-lettered;
+a per-kind dead-letter hook can then release what the job held (uploads).
+"""
+import os
+import uuid
+import random
+import socket
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument
+
+from app.env_settings import env
+from app.models.database.jobs_collection import JobCollection, JobStatus
+from app.services.job_progress import JobProgress, current_job
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[JobCollection], Awaitable[Optional[dict]]]
+# Run once a job is dead-lettered (no attempt will follow)
+DeadJobHook = Callable[[JobCollection], Awaitable[None]]
+
+
+class PermanentJobError(Exception):
+    """
+    Raised by a handler when retrying cannot help (bad input, missing record).
+    The job goes straight to the dead-letter state.
+    """
+
+
+class JobQueue:
+    def __init__(self):
+        self.visibility_timeout = int(env.JOB_VISIBILITY_TIMEOUT_SECONDS or 300)
+        self.max_attempts = int(env.JOB_MAX_ATTEMPTS or 5)
+        self.backoff_base = float(env.JOB_BACKOFF_BASE_SECONDS or 10)
+        self.backoff_max = float(env.JOB_BACKOFF_MAX_SECONDS or 600)
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict,
+        org_id: Optional[str] = None,
+        created_by: Optional[str] = None,
+        max_attempts: Optional[int] = None
+    ) -> JobCollection:
+        """
+        Persists a new job in the QUEUED state.
+        """
+        job = JobCollection(
+            kind=kind,
+            payload=payload,
+            org_id=str(org_id) if org_id else None,
+            created_by=str(created_by) if created_by else None,
+            max_attempts=max_attempts or self.max_attempts
+        )
+        await job.insert()
+        return job
+
+    async def get(self, job_id: PydanticObjectId) -> Optional[JobCollection]:
+        return await JobCollection.get(job_id)
+
+    async def claim(self, worker_id: str, kinds: Optional[list[str]] = None) -> Optional[JobCollection]:
+        """
+        Atomically claims the next due job (or a job whose lease expired).
+        """
+        now = datetime.now()
+        query: dict[str, Any] = {
+            "$or": [
+                {"status": JobStatus.QUEUED.value, "run_after": {"$lte": now}},
+                {"status": JobStatus.RUNNING.value, "lease_expires_at": {"$lte": now}},
+            ]
+        }
+        if kinds:
+            query["kind"] = {"$in": kinds}
+
+        raw = await JobCollection.get_pymongo_collection().find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "worker_id": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=self.visibility_timeout),
+                    "stage": None,
+                    "stage_timings": {},
+                    "updated_on": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_after", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if raw is None:
+            return None
+        return JobCollection.model_validate(raw)
+
+    async def extend_lease(self, job: JobCollection, worker_id: str) -> bool:
+        """
+        Heartbeat: pushes the lease forward. Returns False if the lease was lost.
+        """
+        now = datetime.now()
+        res = await JobCollection.get_pymongo_collection().update_one(
+            {"_id": job.id, "worker_id": worker_id, "status": JobStatus.RUNNING.value},
+            {"$set": {
+                "lease_expires_at": now + timedelta(seconds=self.visibility_timeout),
+                "updated_on": now,
+            }},
+        )
+        return res.modified_count == 1
+
+    async def update_progress(self, job: JobCollection, worker_id: str, update: dict) -> None:
+        """
+        Records the running stage / stage timings of a job we hold the lease on.
+        """
+        await JobCollection.get_pymongo_collection().update_one(
+            {"_id": job.id, "worker_id": worker_id, "status": JobStatus.RUNNING.value},
+            {"$set": {**update, "updated_on": datetime.now()}},
+        )
+
+    async def complete(self, job: JobCollection, worker_id: str, result: Optional[dict]) -> None:
+        now = datetime.now()
+        await JobCollection.get_pymongo_collection().update_one(
+            {"_id": job.id, "worker_id": worker_id, "status": JobStatus.RUNNING.value},
+            {"$set": {
+                "status": JobStatus.SUCCEEDED.value,
+                "result": result,
+                "stage": "done",
+                "meeting_id": (result or {}).get("meeting_id"),
+                "lease_expires_at": None,
+                "updated_on": now,
+            }},
+        )
+
+    async def fail(self, job: JobCollection, worker_id: str, error: str, permanent: bool = False) -> JobStatus:
+        """
+        Records a failure: re-queues with backoff, or dead-letters the job.
+        """
+        now = datetime.now()
+        if permanent or job.attempts >= job.max_attempts:
+            update = {
+                "status": JobStatus.DEAD.value,
+                "last_error": error,
+                "lease_expires_at": None,
+                "updated_on": now,
+            }
+            new_status = JobStatus.DEAD
+        else:
+            update = {
+                "status": JobStatus.QUEUED.value,
+                "last_error": error,
+                "lease_expires_at": None,
+                "run_after": now + timedelta(seconds=self.backoff(job.attempts)),
+                "updated_on": now,
+            }
+            new_status = JobStatus.QUEUED
+
+        await JobCollection.get_pymongo_collection().update_one(
+            {"_id": job.id, "worker_id": worker_id, "status": JobStatus.RUNNING.value},
+            {"$set": update},
+        )
+        return new_status
+
+    def backoff(self, attempts: int) -> float:
+        """
+        Exponential backoff with full jitter.
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** max(attempts - 1, 0)))
+        return random.uniform(ceiling / 2, ceiling)
+
+
+class JobWorker:
+    """
+    Runs up to `concurrency` jobs at a time from the queue.
+    """
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: dict[str, JobHandler],
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        worker_id: Optional[str] = None,
+        on_dead: Optional[dict[str, DeadJobHook]] = None
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.on_dead = on_dead or {}
+        self.concurrency = concurrency or int(env.WORKER_CONCURRENCY or 2)
+        self.poll_interval = poll_interval or float(env.WORKER_POLL_INTERVAL_SECONDS or 2)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """
+        Runs the slot loops until `stop_event` is set. In-flight jobs are allowed to finish.
+        """
+        logger.info(f"Worker {self.worker_id} started (concurrency={self.concurrency}, kinds={list(self.handlers)})")
+        slots = [asyncio.create_task(self._slot(stop_event)) for _ in range(self.concurrency)]
+        await asyncio.gather(*slots)
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    async def _slot(self, stop_event: asyncio.Event) -> None:
+        while not stop_event.is_set():
+            try:
+                job = await self.queue.claim(self.worker_id, list(self.handlers))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error(f"Claim failed: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self.process(job)
+
+    async def process(self, job: JobCollection) -> None:
+        if job.attempts > job.max_attempts:
+            # Lease expired on the final attempt (worker crashed mid-run)
+            await self.queue.fail(job, self.worker_id, job.last_error or "Lease expired", permanent=True)
+            logger.warning(f"Job {job.id} dead-lettered after {job.max_attempts} attempts")
+            await self._dead(job)
+            return
+
+        handler = self.handlers[job.kind]
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        # Handlers report their stages through track_stage()
+        progress = current_job.set(JobProgress(
+            lambda update: self.queue.update_progress(job, self.worker_id, update),
+            meeting_id=job.meeting_id
+        ))
+        try:
+            logger.info(f"Job {job.id} ({job.kind}) attempt {job.attempts}/{job.max_attempts}")
+            result = await handler(job)
+            await self.queue.complete(job, self.worker_id, result)
+            logger.info(f"Job {job.id} succeeded")
+        except PermanentJobError as e:
+            await self.queue.fail(job, self.worker_id, str(e), permanent=True)
+            logger.error(f"Job {job.id} dead-lettered: {e}")
+            await self._dead(job)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            status = await self.queue.fail(job, self.worker_id, str(e))
+            logger.error(f"Job {job.id} failed ({status.value}): {e}")
+            if status == JobStatus.DEAD:
+                await self._dead(job)
+        finally:
+            current_job.reset(progress)
+            heartbeat.cancel()
+
+    async def _dead(self, job: JobCollection) -> None:
+        hook = self.on_dead.get(job.kind)
+        if hook is None:
+            return
+        try:
+            await hook(job)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning(f"Dead-letter hook of job {job.id} failed: {e}")
+
+    async def _heartbeat(self, job: JobCollection) -> None:
+        interval = max(self.queue.visibility_timeout / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            if not await self.queue.extend_lease(job, self.worker_id):
+                logger.warning(f"Lost lease on job {job.id}")
+                return
@@ -0,0 +1,170 @@
+"""
+Cache of validated structured LLM outputs.
+
+Keyed by model name + hash of the rendered prompt + hash of the output JSON
+schema, so an unchanged transcript re-run against the same prompts and schemas
+never reaches the provider again. Entries expire after a TTL and the cache is
+size-bounded (LRU eviction).
+"""
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from pydantic import BaseModel
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import Runnable, RunnableConfig, ensure_config
+
+from app.env_settings import env
+from app.services.run_metrics import note_cache_hit
+
+logger = logging.getLogger(__name__)
+
+# RunnableConfig["configurable"] key to skip the cache for one request
+BYPASS_KEY = "llm_cache_bypass"
+
+
+def _sha256(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def schema_hash(schema: type[BaseModel]) -> str:
+    return _sha256(json.dumps(schema.model_json_schema(), sort_keys=True))
+
+
+def prompt_hash(prompt_value: PromptValue) -> str:
+    messages = [{"type": m.type, "content": m.content} for m in prompt_value.to_messages()]
+    return _sha256(json.dumps(messages, sort_keys=True, default=str))
+
+
+class StructuredOutputCache:
+    """
+    Thread-safe TTL + LRU cache with hit/miss counters.
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.bypasses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def note_bypass(self) -> None:
+        """
+        Counts a lookup skipped on request (bypass_cache); the result is still stored.
+        """
+        with self._lock:
+            self.bypasses += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "bypasses": self.bypasses,
+            }
+
+
+class CachedStructuredOutput(Runnable):
+    """
+    prompt -> llm.with_structured_output(schema), with the cache in front of the LLM call.
+    """
+    def __init__(self, prompt, llm, schema: type[BaseModel], cache: StructuredOutputCache, model_name: str):
+        self.prompt = prompt
+        self.structured_llm = llm.with_structured_output(schema)
+        self.schema = schema
+        self.cache = cache
+        self.model_name = model_name
+        self.schema_hash = schema_hash(schema)
+        self.name = f"cached_{schema.__name__}"
+
+    def _key(self, prompt_value: PromptValue) -> str:
+        return _sha256(f"{self.model_name}:{prompt_hash(prompt_value)}:{self.schema_hash}")
+
+    def _lookup(self, config: RunnableConfig, prompt_value: PromptValue) -> tuple[Optional[str], Optional[BaseModel]]:
+        if not self.cache.enabled:
+            return None, None
+        if config.get("configurable", {}).get(BYPASS_KEY):
+            self.cache.note_bypass()
+            return self._key(prompt_value), None
+        key = self._key(prompt_value)
+        cached = self.cache.get(key)
+        if cached is None:
+            return key, None
+        logger.info(f"LLM cache hit ({self.schema.__name__})")
+        note_cache_hit(self.model_name)
+        return key, self.schema.model_validate(cached)
+
+    def _store(self, key: Optional[str], result: BaseModel) -> None:
+        if key and result is not None:
+            self.cache.set(key, result.model_dump(mode="json"))
+
+    def invoke(self, input: dict, config: Optional[RunnableConfig] = None, **kwargs) -> BaseModel:  # pylint: disable=redefined-builtin
+        config = ensure_config(config)
+        prompt_value = self.prompt.invoke(input, config)
+        key, cached = self._lookup(config, prompt_value)
+        if cached is not None:
+            return cached
+        result = self.structured_llm.invoke(prompt_value, config)
+        self._store(key, result)
+        return result
+
+    async def ainvoke(self, input: dict, config: Optional[RunnableConfig] = None, **kwargs) -> BaseModel:  # pylint: disable=redefined-builtin
+        config = ensure_config(config)
+        prompt_value = await self.prompt.ainvoke(input, config)
+        key, cached = self._lookup(config, prompt_value)
+        if cached is not None:
+            return cached
+        result = await self.structured_llm.ainvoke(prompt_value, config)
+        self._store(key, result)
+        return result
+
+
+llm_cache = StructuredOutputCache(
+    max_entries=int(env.LLM_CACHE_MAX_ENTRIES or 512),
+    ttl_seconds=float(env.LLM_CACHE_TTL_SECONDS or 86400),
+    enabled=(env.LLM_CACHE_ENABLED or "true").lower() != "false"
+)
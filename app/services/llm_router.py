@@ -0,0 +1,241 @@
+"""
+Latency-aware router over several chat backends (e.g. Groq and Mistral).
+
+LLMRouter is a chat model itself, so it drops in wherever `self.llm` is used
+(`with_structured_output`, prompt chains, the MoM graph). Per backend it keeps
+a rolling window of latencies and outcomes; each call goes to the healthy
+backend with the lowest p50. Optionally a second request is hedged on the
+next backend once the first has been running for LLM_HEDGE_AFTER_SECONDS, and
+429 / 5xx / connection errors fail over to the next backend (which is then
+cooled down for a while).
+"""
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Optional
+
+from pydantic import ConfigDict, PrivateAttr
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatResult
+
+from app.services.rate_limiter import is_rate_limit_error, is_transient_error
+
+logger = logging.getLogger(__name__)
+
+
+class BackendStats:
+    """
+    Rolling latency / error window of one backend.
+    """
+    def __init__(self, name: str, window: int):
+        self.name = name
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    def record_success(self, seconds: float) -> None:
+        with self._lock:
+            self.latencies.append(seconds)
+            self.outcomes.append(True)
+
+    def record_error(self, cooldown_seconds: float = 0.0) -> None:
+        with self._lock:
+            self.outcomes.append(False)
+            if cooldown_seconds:
+                self.cooldown_until = max(self.cooldown_until, time.monotonic() + cooldown_seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self.latencies:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self.outcomes:
+                return 0.0
+            return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    def healthy(self, max_error_rate: float) -> bool:
+        return time.monotonic() >= self.cooldown_until and self.error_rate <= max_error_rate
+
+    def snapshot(self) -> dict:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "backend": self.name,
+            "p50_seconds": round(p50, 3) if p50 is not None else None,
+            "p95_seconds": round(p95, 3) if p95 is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "samples": len(self.outcomes),
+            "cooling_down": time.monotonic() < self.cooldown_until,
+        }
+
+
+class RoutedTools:
+    """
+    Tools bound on the router; resolved lazily into each backend's own bind_tools kwargs
+    (computed once per backend, not per call).
+    """
+    def __init__(self, tools: list, tool_choice: Any, kwargs: dict):
+        self.tools = tools
+        self.tool_choice = tool_choice
+        self.kwargs = kwargs
+        self._per_backend: dict[int, dict] = {}
+
+    def for_backend(self, index: int, backend: BaseChatModel) -> dict:
+        if index not in self._per_backend:
+            bound = backend.bind_tools(self.tools, tool_choice=self.tool_choice, **self.kwargs)
+            # Tracing-only kwargs are consumed by BaseChatModel.generate, which we bypass
+            self._per_backend[index] = {k: v for k, v in bound.kwargs.items() if not k.startswith("ls_")}
+        return self._per_backend[index]
+
+
+def is_failover_error(exc: BaseException) -> bool:
+    return is_rate_limit_error(exc) or is_transient_error(exc)
+
+
+class LLMRouter(BaseChatModel):
+    """
+    Chat model that routes each call to the fastest healthy backend.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    backends: list[BaseChatModel]
+    backend_names: list[str]
+    model_name: str = "router"
+    hedge_after_seconds: Optional[float] = None
+    max_error_rate: float = 0.5
+    cooldown_seconds: float = 30.0
+    window: int = 100
+
+    _stats: list[BackendStats] = PrivateAttr(default_factory=list)
+
+    def model_post_init(self, __context: Any) -> None:
+        # Bad config fails when the router is built, not on the first call
+        if not self.backends:
+            raise ValueError("LLMRouter needs at least one backend")
+        if len(self.backend_names) != len(self.backends):
+            raise ValueError(f"LLMRouter got {len(self.backends)} backends but {len(self.backend_names)} backend names")
+        self._stats = [BackendStats(name, self.window) for name in self.backend_names]
+
+    @property
+    def _llm_type(self) -> str:
+        return "llm-router"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"backends": self.backend_names, "hedge_after_seconds": self.hedge_after_seconds}
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        return self.bind(routed_tools=RoutedTools(list(tools), tool_choice, kwargs))
+
+    def stats(self) -> list[dict]:
+        return [s.snapshot() for s in self._stats]
+
+    def ranked(self) -> list[int]:
+        """
+        Backend indexes, healthy ones first, each group by p50 (untried backends first).
+        """
+        def key(i: int):
+            stats = self._stats[i]
+            p50 = stats.percentile(0.5)
+            return (not stats.healthy(self.max_error_rate), p50 if p50 is not None else 0.0)
+        return sorted(range(len(self.backends)), key=key)
+
+    def _on_error(self, index: int, exc: BaseException) -> None:
+        cooldown = self.cooldown_seconds if is_failover_error(exc) else 0.0
+        self._stats[index].record_error(cooldown)
+        logger.warning(f"LLM backend {self.backend_names[index]} failed ({type(exc).__name__}): {exc}")
+
+    # --- Calls ---
+
+    def _call(self, index: int, messages, stop, routed: Optional[RoutedTools], kwargs: dict) -> ChatResult:
+        backend = self.backends[index]
+        call_kwargs = {**(routed.for_backend(index, backend) if routed else {}), **kwargs}
+        t0 = time.perf_counter()
+        try:
+            # Backend's own _generate: keeps its rate limiter / usage accounting,
+            # without a second set of callbacks (usage would be counted twice)
+            result = backend._generate(messages, stop=stop, **call_kwargs)  # pylint: disable=protected-access
+        except Exception as e:
+            self._on_error(index, e)
+            raise
+        self._stats[index].record_success(time.perf_counter() - t0)
+        return result
+
+    async def _acall(self, index: int, messages, stop, routed: Optional[RoutedTools], kwargs: dict) -> ChatResult:
+        backend = self.backends[index]
+        call_kwargs = {**(routed.for_backend(index, backend) if routed else {}), **kwargs}
+        t0 = time.perf_counter()
+        try:
+            result = await backend._agenerate(messages, stop=stop, **call_kwargs)  # pylint: disable=protected-access
+        except asyncio.CancelledError:
+            # Lost a hedge race: not an error, and the latency is censored
+            raise
+        except Exception as e:
+            self._on_error(index, e)
+            raise
+        self._stats[index].record_success(time.perf_counter() - t0)
+        return result
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        """
+        Blocking path: failover only (hedging needs the async path).
+        """
+        routed = kwargs.pop("routed_tools", None)
+        last_error: Optional[BaseException] = None
+        for index in self.ranked():
+            try:
+                return self._call(index, messages, stop, routed, kwargs)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                if not is_failover_error(e):
+                    raise
+                last_error = e
+        raise last_error
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        routed = kwargs.pop("routed_tools", None)
+        order = self.ranked()
+        last_error: Optional[BaseException] = None
+        pending: dict[asyncio.Task, int] = {}
+        next_backend = 0
+
+        def launch() -> None:
+            nonlocal next_backend
+            index = order[next_backend]
+            next_backend += 1
+            pending[asyncio.create_task(self._acall(index, messages, stop, routed, kwargs))] = index
+
+        launch()
+        try:
+            while pending:
+                can_hedge = self.hedge_after_seconds is not None and next_backend < len(order) and len(pending) == 1
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_after_seconds if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Primary is slow: hedge on the next backend, first answer wins
+                    logger.info(f"Hedging LLM call on {self.backend_names[order[next_backend]]}")
+                    launch()
+                    continue
+                for task in done:
+                    pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    if not is_failover_error(error):
+                        raise error
+                    last_error = error
+                if not pending and next_backend < len(order):
+                    launch()
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
@@ -1,14 +1,167 @@
+from typing import ClassVar, Optional
+
 from langchain_groq import ChatGroq
 from langchain_mistralai import ChatMistralAI
 
 from app.env_settings import env
+from app.services.rate_limiter import (
+    rate_limiters,
+    call_with_limits,
+    acall_with_limits,
+    chat_result_tokens
+)
+from app.services.tokens import estimate_tokens
+from app.services.fake_provider import chat_client_kwargs
+from app.services.llm_cache import llm_cache, CachedStructuredOutput
+from app.services.run_metrics import note_usage, chat_result_usage
+from app.services.llm_router import LLMRouter
+
+BACKEND_PROVIDERS = ("groq", "mistral")
+
+
+class RateLimitedChatMixin:
+    """
+    Routes every chat completion through the shared provider rate limiter.
+    Sits below `with_structured_output`, so structured calls are limited too.
+    """
+    rate_limit_provider: ClassVar[str] = ""
+    # Subclasses declare `rate_limit_retries: Optional[int] = None` (a pydantic field);
+    # None uses RATE_LIMIT_MAX_RETRIES, 0 fails fast so LLMRouter can fail over.
+
+    def _rate_limit_reservation(self, messages) -> int:
+        prompt = sum(estimate_tokens(str(m.content)) for m in messages)
+        return prompt + int(env.RATE_LIMIT_COMPLETION_RESERVE or 1024)
+
+    def _model_id(self) -> str:
+        return getattr(self, "model_name", None) or getattr(self, "model", "")
+
+    def _limiter(self):
+        return rate_limiters.get(self.rate_limit_provider, self._model_id())
+
+    def _record_usage(self, result):
+        # Token usage of the current MoM run step (no-op outside a run)
+        note_usage(self.rate_limit_provider, self._model_id(), *chat_result_usage(result))
+        return result
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        generate = super()._generate
+        return self._record_usage(call_with_limits(
+            self._limiter(),
+            self._rate_limit_reservation(messages),
+            lambda: generate(messages, stop=stop, run_manager=run_manager, **kwargs),
+            usage=chat_result_tokens,
+            max_retries=getattr(self, "rate_limit_retries", None)
+        ))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        agenerate = super()._agenerate
+        return self._record_usage(await acall_with_limits(
+            self._limiter(),
+            self._rate_limit_reservation(messages),
+            lambda: agenerate(messages, stop=stop, run_manager=run_manager, **kwargs),
+            usage=chat_result_tokens,
+            max_retries=getattr(self, "rate_limit_retries", None)
+        ))
+
+
+class RateLimitedChatGroq(RateLimitedChatMixin, ChatGroq):
+    rate_limit_provider: ClassVar[str] = "groq"
+    rate_limit_retries: Optional[int] = None
+
+
+class RateLimitedChatMistralAI(RateLimitedChatMixin, ChatMistralAI):
+    rate_limit_provider: ClassVar[str] = "mistral"
+    rate_limit_retries: Optional[int] = None
+
 
 class LLMService:
     def __init__(self):
         # Centralized Model Setting
-        self.model_name = "llama-3.3-70b-versatile" 
+        self.model_name = "llama-3.3-70b-versatile"
         # self.model_name = "meta-llama/llama-4-maverick-17b-128e-instruct"
-        
-        self.groq_client = ChatGroq(api_key=env.GROQ_API_KEY, model=self.model_name)
+
+        # Retries are handled by the shared rate limiter (429 + retry-after aware)
+        # FAKE_PROVIDER_URL points the client at the local stand-in (benchmarks / CI)
+        self.groq_client = RateLimitedChatGroq(**{
+            "api_key": env.GROQ_API_KEY,
+            "model": self.model_name,
+            "max_retries": 0,
+            **chat_client_kwargs("groq")
+        })
         # self.mistral_client = ChatMistralAI(api_key=env.MISTRAL_API_KEY, model="mistral-large-latest")
-    
+
+        # Chat model used for MoM extraction: groq_client, or a latency-aware
+        # router when several backends are configured (LLM_BACKENDS)
+        self.chat_model = self._build_chat_model()
+
+        # Process-wide cache of validated structured outputs
+        self.cache = llm_cache
+
+    def _backend_specs(self) -> list[tuple[str, str]]:
+        """
+        [(provider, model)] from LLM_BACKENDS, defaulting to Groq (+ Mistral when a key is set).
+        """
+        if env.LLM_BACKENDS:
+            specs = []
+            for item in env.LLM_BACKENDS.split(","):
+                provider, _, model = item.strip().partition(":")
+                if provider not in BACKEND_PROVIDERS or not model:
+                    raise ValueError(f"Invalid LLM_BACKENDS entry {item!r} (expected provider:model, provider in {BACKEND_PROVIDERS})")
+                specs.append((provider, model))
+            return specs
+        specs = [("groq", self.model_name)]
+        if env.MISTRAL_API_KEY:
+            specs.append(("mistral", "mistral-large-latest"))
+        return specs
+
+    def _backend(self, provider: str, model: str, rate_limit_retries: Optional[int]):
+        if provider == "mistral":
+            return RateLimitedChatMistralAI(**{
+                "api_key": env.MISTRAL_API_KEY,
+                "model": model,
+                "max_retries": 1,  # single attempt; retries/failover happen above
+                "rate_limit_retries": rate_limit_retries,
+                **chat_client_kwargs("mistral")
+            })
+        if model == self.model_name and rate_limit_retries is None:
+            return self.groq_client
+        return RateLimitedChatGroq(**{
+            "api_key": env.GROQ_API_KEY,
+            "model": model,
+            "max_retries": 0,
+            "rate_limit_retries": rate_limit_retries,
+            **chat_client_kwargs("groq")
+        })
+
+    def _build_chat_model(self):
+        specs = self._backend_specs()
+        if len(specs) == 1:
+            return self._backend(*specs[0], rate_limit_retries=None)
+
+        # Routed backends fail fast on 429 / 5xx so the router can fail over
+        # instead of sleeping on a backend that is struggling
+        names = [f"{provider}:{model}" for provider, model in specs]
+        hedge_after = env.LLM_HEDGE_AFTER_SECONDS
+        return LLMRouter(
+            backends=[self._backend(provider, model, rate_limit_retries=0) for provider, model in specs],
+            backend_names=names,
+            model_name=f"router({','.join(names)})",
+            hedge_after_seconds=float(hedge_after) if hedge_after else None,
+            window=int(env.LLM_ROUTER_WINDOW or 100),
+            max_error_rate=float(env.LLM_ROUTER_MAX_ERROR_RATE or 0.5),
+            cooldown_seconds=float(env.LLM_BACKEND_COOLDOWN_SECONDS or 30),
+        )
+
+    def backend_stats(self) -> list[dict]:
+        """
+        Rolling latency / error stats per backend (empty without a router).
+        """
+        return self.chat_model.stats() if isinstance(self.chat_model, LLMRouter) else []
+
+    def structured_chain(self, prompt, schema, llm=None) -> CachedStructuredOutput:
+        """
+        prompt | llm.with_structured_output(schema), answered from the cache when possible.
+        """
+        llm = llm or self.chat_model
+        model_name = getattr(llm, "model_name", None) or getattr(llm, "model", None) or self.model_name
+        return CachedStructuredOutput(prompt, llm, schema, self.cache, model_name)
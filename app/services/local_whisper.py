@@ -0,0 +1,160 @@
+"""
+Offline Whisper backend running on CPU via transformers.
+
+The checkpoint is loaded once per worker process and shared by every
+TranscriptionService instance. Audio is split into fixed-length chunks that
+are decoded in batches, and the output is reshaped into the same
+verbose_json layout Groq returns, so callers don't need to care which
+backend produced it.
+"""
+import threading
+import logging
+from typing import Optional
+
+import torch
+from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
+
+from app.env_settings import env
+from app.utils.audio import decode_to_pcm
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+# Segment grouping (words -> verbose_json segments)
+SEGMENT_MAX_SECONDS = 30.0
+SEGMENT_MAX_GAP_SECONDS = 1.0
+SENTENCE_ENDINGS = (".", "?", "!")
+
+# One pipeline per (checkpoint, quantization) per process
+_pipelines: dict = {}
+_pipelines_lock = threading.Lock()
+
+
+def _load_pipeline(model_id: str, quantize: str):
+    """
+    Loads (or returns the already loaded) ASR pipeline for a checkpoint.
+    """
+    key = (model_id, quantize)
+    if key in _pipelines:
+        return _pipelines[key]
+
+    with _pipelines_lock:
+        if key in _pipelines:
+            return _pipelines[key]
+
+        if env.LOCAL_WHISPER_THREADS:
+            torch.set_num_threads(int(env.LOCAL_WHISPER_THREADS))
+
+        logger.info(f"Loading local Whisper checkpoint '{model_id}' (quantize={quantize})")
+        model = AutoModelForSpeechSeq2Seq.from_pretrained(
+            model_id,
+            torch_dtype=torch.float32,
+            low_cpu_mem_usage=True
+        )
+        if quantize == "int8":
+            # Dynamic quantisation: Linear weights stored as int8, activations quantised on the fly
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        model.eval()
+
+        processor = AutoProcessor.from_pretrained(model_id)
+        asr = pipeline(
+            "automatic-speech-recognition",
+            model=model,
+            tokenizer=processor.tokenizer,
+            feature_extractor=processor.feature_extractor,
+            chunk_length_s=int(env.LOCAL_WHISPER_CHUNK_SECONDS or 30),
+            batch_size=int(env.LOCAL_WHISPER_BATCH_SIZE or 8),
+            device="cpu",
+        )
+        _pipelines[key] = asr
+        return asr
+
+
+def _group_segments(words: list[dict]) -> list[dict]:
+    """
+    Groups word timestamps into verbose_json style segments.
+    A segment ends on sentence punctuation, a long pause or after SEGMENT_MAX_SECONDS.
+    """
+    segments = []
+    current: list[dict] = []
+
+    def flush():
+        if not current:
+            return
+        segments.append({
+            "id": len(segments),
+            "seek": 0,
+            "start": current[0]["start"],
+            "end": current[-1]["end"],
+            "text": "".join(w["word"] for w in current),
+            "tokens": [],
+            "temperature": 0.0,
+            "avg_logprob": 0.0,
+            "compression_ratio": 0.0,
+            "no_speech_prob": 0.0,
+        })
+        current.clear()
+
+    for word in words:
+        if current:
+            gap = word["start"] - current[-1]["end"]
+            span = word["end"] - current[0]["start"]
+            if gap > SEGMENT_MAX_GAP_SECONDS or span > SEGMENT_MAX_SECONDS:
+                flush()
+        current.append(word)
+        if word["word"].strip().endswith(SENTENCE_ENDINGS):
+            flush()
+    flush()
+    return segments
+
+
+class LocalWhisperTranscriber:
+    """
+    CPU Whisper transcriber producing Groq-compatible verbose_json dicts.
+    """
+    def __init__(self, model_id: Optional[str] = None, quantize: Optional[str] = None):
+        self.model_id = model_id or env.LOCAL_WHISPER_MODEL
+        self.quantize = (quantize or env.LOCAL_WHISPER_QUANTIZE).lower()
+        self.language = env.LOCAL_WHISPER_LANGUAGE
+
+    def transcribe(self, file_content: bytes) -> dict:
+        """
+        Transcribes encoded audio bytes and returns a verbose_json shaped dict.
+        """
+        audio = decode_to_pcm(file_content, rate=SAMPLE_RATE)
+        duration = len(audio) / SAMPLE_RATE
+        if len(audio) == 0:
+            return self._to_verbose_json("", [], duration)
+
+        asr = _load_pipeline(self.model_id, self.quantize)
+
+        generate_kwargs = {"task": "transcribe"}
+        if self.language:
+            generate_kwargs["language"] = self.language
+
+        with torch.inference_mode():
+            output = asr(
+                {"raw": audio, "sampling_rate": SAMPLE_RATE},
+                return_timestamps="word",
+                generate_kwargs=generate_kwargs,
+            )
+
+        words = []
+        for chunk in output.get("chunks", []):
+            start, end = chunk.get("timestamp") or (None, None)
+            start = float(start) if start is not None else (words[-1]["end"] if words else 0.0)
+            end = float(end) if end is not None else duration
+            words.append({"word": chunk["text"], "start": start, "end": end})
+
+        return self._to_verbose_json(output.get("text", ""), words, duration)
+
+    def _to_verbose_json(self, text: str, words: list[dict], duration: float) -> dict:
+        return {
+            "task": "transcribe",
+            "language": self.language,
+            "duration": duration,
+            "text": text,
+            "segments": _group_segments(words),
+            "words": words,
+        }
@@ -0,0 +1,141 @@
+"""
+Full-text search over meetings (GET /meetings/search).
+
+Matching and ranking use the weighted Mongo text index declared on
+MeetingCollection (`meeting_text_search`). Its textScore is term-frequency
+based with per-field weights and stemming, not true BM25, but it gives the
+same ordering for the short keyword queries users type ("AWS migration").
+
+Snippets: Mongo cuts a short window of the transcript around the first
+matching term, so full transcripts never leave the database; the section
+fields are small and are highlighted in Python. Snippet text is HTML-escaped
+before matched terms are wrapped in <mark>.
+"""
+import re
+import html
+from datetime import date, datetime, time
+from typing import Optional
+
+from app.schemas.meetings_schema import SearchSnippet
+
+# Characters of transcript kept around the first match
+SNIPPET_CONTEXT = 120
+SNIPPET_LENGTH = 300
+MAX_SNIPPETS = 3
+
+# Section fields used for snippets, in the order they are shown
+SECTION_FIELDS = {
+    "decisions": "$decisions.decisions.decision_headline",
+    "action_items": "$action_items.action_items.task_title",
+    "topic_summaries": "$topic_summaries.topic_summaries.related_topic_title",
+    "facts": "$facts.facts.description",
+}
+
+_WORD = re.compile(r"-?\"[^\"]+\"|-?\S+")
+
+
+def search_terms(query: str) -> list[str]:
+    """
+    Lower-cased terms of a $text query, without negated terms; phrases are split into words.
+    Long words are cut to a rough stem so "decided" also highlights "decide".
+    """
+    terms = []
+    for token in _WORD.findall(query):
+        if token.startswith("-"):
+            continue
+        for word in re.findall(r"\w+", token.lower()):
+            if len(word) < 2:
+                continue
+            stem = word[:-2] if len(word) > 5 else word
+            if stem not in terms:
+                terms.append(stem)
+    return terms
+
+
+def highlight(text: str, terms: list[str]) -> str:
+    escaped = html.escape(text)
+    if not terms:
+        return escaped
+    pattern = re.compile(r"\b(" + "|".join(re.escape(html.escape(t)) for t in terms) + r")\w*", re.IGNORECASE)
+    return pattern.sub(lambda m: f"<mark>{m.group(0)}</mark>", escaped)
+
+
+def _transcript_window(terms: list[str]) -> dict:
+    """
+    $project expression: SNIPPET_LENGTH characters of transcript around the first term found.
+    """
+    lower = {"$toLower": {"$ifNull": ["$transcription", ""]}}
+    positions = [{"$indexOfCP": ["$$lower", term]} for term in terms] or [0]
+    first = {"$min": {"$filter": {"input": positions, "as": "pos", "cond": {"$gte": ["$$pos", 0]}}}}
+    start = {"$max": [{"$subtract": [{"$ifNull": [first, 0]}, SNIPPET_CONTEXT]}, 0]}
+    return {"$let": {
+        "vars": {"lower": lower},
+        "in": {"$substrCP": [{"$ifNull": ["$transcription", ""]}, start, SNIPPET_LENGTH]},
+    }}
+
+
+def build_search_pipeline(
+    query: str,
+    scope: dict,
+    projection: dict,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    attendee: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20
+) -> list[dict]:
+    """
+    Aggregation returning `projection` + score + raw snippet sources, best match first.
+    """
+    match: dict = {"$text": {"$search": query}, **scope}
+    if date_from or date_to:
+        match["created_on"] = {}
+        if date_from:
+            match["created_on"]["$gte"] = datetime.combine(date_from, time.min)
+        if date_to:
+            match["created_on"]["$lte"] = datetime.combine(date_to, time.max)
+    if attendee:
+        match["attendees.attendees.name"] = {"$regex": re.escape(attendee), "$options": "i"}
+
+    return [
+        {"$match": match},
+        {"$sort": {"score": {"$meta": "textScore"}, "_id": -1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$project": {
+            **projection,
+            "score": {"$meta": "textScore"},
+            "transcript_window": _transcript_window(search_terms(query)),
+            **{f"section_{name}": {"$ifNull": [path, []]} for name, path in SECTION_FIELDS.items()},
+        }},
+    ]
+
+
+def snippets_for(row: dict, terms: list[str]) -> list[SearchSnippet]:
+    """
+    Highlighted snippets from the matching section items first, then the transcript.
+    """
+    found = []
+    for name in SECTION_FIELDS:
+        for text in row.get(f"section_{name}") or []:
+            if text and any(t in text.lower() for t in terms):
+                found.append(SearchSnippet(field=name, text=highlight(text, terms)))
+    window = row.get("transcript_window")
+    if window and any(t in window.lower() for t in terms):
+        found.append(SearchSnippet(field="transcription", text=f"…{highlight(window.strip(), terms)}…"))
+    return found[:MAX_SNIPPETS]
+
+
+def to_hits(rows: list[dict], query: str) -> list[dict]:
+    """
+    Replaces the raw snippet sources of each row with `snippets` (MeetingSearchHit shape).
+    """
+    terms = search_terms(query)
+    hits = []
+    for row in rows:
+        snippets = snippets_for(row, terms)
+        hit = {k: v for k, v in row.items() if k != "transcript_window" and not k.startswith("section_")}
+        hit["score"] = round(hit.get("score", 0.0), 4)
+        hit["snippets"] = [s.model_dump() for s in snippets]
+        hits.append(hit)
+    return hits
@@ -0,0 +1,155 @@
+"""
+Printable MoM HTML (GET /meetings/{meeting_id}/print).
+
+The Jinja environment is built once per process. Compiled templates stay in
+its in-memory cache and in a bytecode cache on disk, so other workers and
+restarts skip compilation too.
+
+Rendered pages are cached by version: meeting id, meeting updated_on, the
+render date (the footer prints it) and a fingerprint of the template source.
+The version is also the ETag, so a client revalidating an unchanged meeting
+gets a 304 without the meeting document even being loaded. A cache miss is
+streamed with Template.generate() and stored once it completes.
+"""
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterator, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from app.env_settings import env
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+TEMPLATE_NAME = "mom.html"
+# Jinja yields many tiny strings; send them in chunks of about this many characters
+STREAM_CHUNK_CHARS = 16 * 1024
+
+templates = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    bytecode_cache=FileSystemBytecodeCache(env.JINJA_BYTECODE_CACHE_DIR) if env.JINJA_BYTECODE_CACHE_DIR else FileSystemBytecodeCache(),
+    # Templates ship with the code: never stat them again after the first load
+    auto_reload=False,
+)
+
+
+def _template_fingerprint() -> str:
+    source, _, _ = templates.loader.get_source(templates, TEMPLATE_NAME)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:12]
+
+
+TEMPLATE_FINGERPRINT = _template_fingerprint()
+
+
+class PrintVersion:
+    """
+    What a rendered page depends on; doubles as its ETag / Last-Modified.
+    """
+    def __init__(self, meeting_id, updated_on: datetime, current_date: Optional[str] = None):
+        self.meeting_id = str(meeting_id)
+        self.updated_on = updated_on
+        self.current_date = current_date or datetime.now().strftime("%Y-%m-%d")
+
+    @property
+    def key(self) -> str:
+        return f"{self.meeting_id}:{self.updated_on.isoformat()}:{self.current_date}:{TEMPLATE_FINGERPRINT}"
+
+    @property
+    def etag(self) -> str:
+        return '"' + hashlib.sha256(self.key.encode("utf-8")).hexdigest()[:32] + '"'
+
+    @property
+    def modified_on(self) -> datetime:
+        """
+        When the page last changed, in UTC: the meeting update, or midnight when the footer date rolled over.
+        """
+        midnight = datetime.strptime(self.current_date, "%Y-%m-%d")
+        # Stored dates are naive local time
+        return max(self.updated_on, midnight).astimezone(timezone.utc).replace(microsecond=0)
+
+    @property
+    def last_modified(self) -> str:
+        return format_datetime(self.modified_on, usegmt=True)
+
+    def not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        """
+        Conditional GET: If-None-Match wins over If-Modified-Since (RFC 9110).
+        """
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag in tags
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return since.tzinfo is not None and self.modified_on <= since
+        return False
+
+
+class RenderedPageCache:
+    """
+    Thread-safe LRU of rendered pages, bounded by entry count and total characters.
+    """
+    def __init__(self, max_entries: int, max_chars: int):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def set(self, key: str, page: str) -> None:
+        if len(page) > self.max_chars:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous)
+            self._entries[key] = page
+            self._chars += len(page)
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+
+
+page_cache = RenderedPageCache(
+    max_entries=int(env.PRINT_CACHE_MAX_ENTRIES or 256),
+    max_chars=int(env.PRINT_CACHE_MAX_CHARS or 32 * 1024 * 1024),
+)
+
+
+def render_stream(meeting, version: PrintVersion) -> Iterator[str]:
+    """
+    Renders the page in chunks and caches it once the render completed.
+    Sync generator: Starlette iterates it in the threadpool, off the event loop.
+    """
+    template = templates.get_template(TEMPLATE_NAME)
+    parts, pending, size = [], [], 0
+    for piece in template.generate(meeting=meeting, current_date=version.current_date):
+        pending.append(piece)
+        size += len(piece)
+        if size >= STREAM_CHUNK_CHARS:
+            chunk = "".join(pending)
+            parts.append(chunk)
+            yield chunk
+            pending, size = [], 0
+    if pending:
+        chunk = "".join(pending)
+        parts.append(chunk)
+        yield chunk
+    page_cache.set(version.key, "".join(parts))
@@ -0,0 +1,152 @@
+"""
+Helpers for long transcripts: token-budgeted windowing and merging of
+per-window MoM extractions (the map-reduce "reduce" step).
+"""
+import re
+from typing import Iterable, Optional
+
+from app.services.tokens import estimate_tokens
+from app.schemas import (
+    Attendee,
+    Attendees,
+    TopicSummary,
+    TopicSummaries,
+    Fact,
+    Facts,
+    Decision,
+    Decisions,
+    ActionItem,
+    ActionItems
+)
+
+MAX_KEY_TAKEAWAYS = 5
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+
+def split_windows(transcription: str, window_tokens: int, overlap_tokens: int) -> list[str]:
+    """
+    Splits a transcript on sentence boundaries into windows of ~window_tokens,
+    each starting with ~overlap_tokens of the previous window's tail.
+    """
+    sentences = [s for s in _SENTENCE_SPLIT.split(transcription) if s.strip()]
+    windows: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+
+    for sentence in sentences:
+        tokens = estimate_tokens(sentence) + 1
+        if current and current_tokens + tokens > window_tokens:
+            windows.append(" ".join(current))
+            # Carry the tail over so statements spanning the boundary are seen whole
+            tail: list[str] = []
+            tail_tokens = 0
+            for previous in reversed(current):
+                previous_tokens = estimate_tokens(previous) + 1
+                if tail_tokens + previous_tokens > overlap_tokens:
+                    break
+                tail.insert(0, previous)
+                tail_tokens += previous_tokens
+            current, current_tokens = tail, tail_tokens
+        current.append(sentence)
+        current_tokens += tokens
+
+    if current:
+        windows.append(" ".join(current))
+    return windows
+
+
+def normalize(text: Optional[str]) -> str:
+    """
+    Comparison key: case-folded, punctuation stripped, whitespace collapsed.
+    """
+    return _SPACES.sub(" ", _NON_WORD.sub("", (text or "").casefold())).strip()
+
+
+def _union(*lists: Optional[Iterable[str]]) -> Optional[list[str]]:
+    seen: dict[str, str] = {}
+    for items in lists:
+        for item in items or []:
+            seen.setdefault(normalize(item), item)
+    return list(seen.values()) or None
+
+
+def merge_attendees(parts: Iterable[Optional[Attendees]]) -> Attendees:
+    merged: dict[str, Attendee] = {}
+    for part in parts:
+        for attendee in (part.attendees if part else []):
+            key = normalize(attendee.name)
+            if key not in merged:
+                merged[key] = attendee.model_copy()
+                continue
+            existing = merged[key]
+            existing.designation = existing.designation or attendee.designation
+            existing.company = existing.company or attendee.company
+    return Attendees(attendees=list(merged.values()))
+
+
+def merge_facts(parts: Iterable[Optional[Facts]]) -> Facts:
+    merged: dict[str, Fact] = {}
+    for part in parts:
+        for fact in (part.facts if part else []):
+            merged.setdefault(normalize(fact.description), fact)
+    return Facts(facts=list(merged.values()))
+
+
+def merge_decisions(parts: Iterable[Optional[Decisions]]) -> Decisions:
+    merged: dict[str, Decision] = {}
+    for part in parts:
+        for decision in (part.decisions if part else []):
+            key = normalize(decision.decision_headline)
+            if key not in merged:
+                merged[key] = decision.model_copy()
+                continue
+            existing = merged[key]
+            existing.rationale = existing.rationale or decision.rationale
+            existing.stakeholders = _union(existing.stakeholders, decision.stakeholders)
+    return Decisions(decisions=list(merged.values()))
+
+
+def merge_action_items(parts: Iterable[Optional[ActionItems]]) -> ActionItems:
+    merged: dict[str, ActionItem] = {}
+    for part in parts:
+        for item in (part.action_items if part else []):
+            key = normalize(item.task_title)
+            if key not in merged:
+                merged[key] = item.model_copy()
+                continue
+            existing = merged[key]
+            existing.assignees = _union(existing.assignees, item.assignees)
+            existing.due_date = existing.due_date or item.due_date
+    return ActionItems(action_items=list(merged.values()))
+
+
+def merge_topic_summaries(parts: Iterable[Optional[TopicSummaries]]) -> TopicSummaries:
+    merged: dict[str, TopicSummary] = {}
+    for part in parts:
+        for topic in (part.topic_summaries if part else []):
+            key = normalize(topic.related_topic_title)
+            if key not in merged:
+                merged[key] = topic.model_copy()
+                continue
+            existing = merged[key]
+            if normalize(topic.description) not in normalize(existing.description):
+                existing.description = f"{existing.description} {topic.description}"
+            existing.key_takeaways = (_union(existing.key_takeaways, topic.key_takeaways) or [])[:MAX_KEY_TAKEAWAYS]
+    return TopicSummaries(topic_summaries=list(merged.values()))
+
+
+def merge_sections(states: list[dict]) -> dict:
+    """
+    Merges the list sections of several partial MomStates (general summaries excluded:
+    those are condensed by an LLM call in MoMService).
+    """
+    return {
+        "attendees": merge_attendees(s.get("attendees") for s in states),
+        "facts": merge_facts(s.get("facts") for s in states),
+        "topic_summaries": merge_topic_summaries(s.get("topic_summaries") for s in states),
+        "decisions": merge_decisions(s.get("decisions") for s in states),
+        "action_items": merge_action_items(s.get("action_items") for s in states),
+    }
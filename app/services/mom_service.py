@@ -1,17 +1,27 @@
 
-from typing import TypedDict
+import asyncio
+from enum import Enum
+from typing import AsyncIterator, Optional, TypedDict
 from langgraph.graph import StateGraph, END, START
 
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
 
+from app.env_settings import env
 from app.services.llms import LLMService
+from app.services.llm_cache import BYPASS_KEY
+from app.services.job_progress import track_stage
+from app.services.run_metrics import measure_step
+from app.services.mom_reduce import split_windows, merge_sections
+from app.services.tokens import count_tokens
 from app.schemas import (
     Attendees,
     GeneralSummaries,
     TopicSummaries,
     Facts,
     Decisions,
-    ActionItems
+    ActionItems,
+    MeetingMinutes
 )
 
 # Define the State
@@ -30,73 +40,60 @@ class MomState(TypedDict):
     action_items: ActionItems
 
 
-class MoMService:
-    def __init__(self):
-        self.llm_service = LLMService()
-        # Use Groq for speed, or Mistral if preferred. 
-        # Using a model with good context window and instruction following is key.
-        # whisper-large-v3 is for audio, we need text model here.
-        # Assuming LLMService initializes ChatGroq with a text model (e.g. llama3-70b-8192 or similar default)
-        # We might need to specify model name if not default. 
-        # For now using the client as is.
-        self.llm = self.llm_service.groq_client 
-        # self.llm = self.llm_service.mistral_client 
+class MomMode(str, Enum):
+    """
+    How the MoM is extracted. AUTO picks by transcript size.
+    """
+    AUTO = "auto"
+    COMBINED = "combined"      # one structured call for every section (short meetings)
+    GRAPH = "graph"            # six-node extraction graph
+    MAP_REDUCE = "map_reduce"  # graph per overlapping window, then merge (long meetings)
 
-    # --- Node Functions ---
 
-    def extract_attendees(self, state: MomState) -> dict:
-        print("   -> Extracting Attendees...")
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are an expert at extracting meeting attendees from transcripts."),
-            ("human", "Extract all attendees from the following transcript:\n\n{transcription}")
-        ])
-        chain = prompt | self.llm.with_structured_output(Attendees)
-        result = chain.invoke({"transcription": state["transcription"]})
-        return {"attendees": result}
-
-    def extract_general_summaries(self, state: MomState) -> dict:
-        print("   -> Extracting General Summaries...")
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are an expert at summarizing meetings. Create a high-level executive summary."),
-            ("human", "Summarize the following transcript:\n\n{transcription}")
-        ])
-        chain = prompt | self.llm.with_structured_output(GeneralSummaries)
-        result = chain.invoke({"transcription": state["transcription"]})
-        return {"general_summaries": result}
-
-    def extract_topic_summaries(self, state: MomState) -> dict:
-        print("   -> Extracting Topic Summaries...")
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are an expert at summarizing specific topics from meetings."),
-            ("human", "Identify and summarize key topics from the following transcript:\n\n{transcription}")
-        ])
-        chain = prompt | self.llm.with_structured_output(TopicSummaries)
-        result = chain.invoke({"transcription": state["transcription"]})
-        return {"topic_summaries": result}
-
-    def extract_facts(self, state: MomState) -> dict:
-        print("   -> Extracting Facts...")
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are an expert at extracting objective facts and metrics from meetings."),
-            ("human", "Extract verifiable facts and data points from the following transcript:\n\n{transcription}")
-        ])
-        chain = prompt | self.llm.with_structured_output(Facts)
-        result = chain.invoke({"transcription": state["transcription"]})
-        return {"facts": result}
-
-    def extract_decisions(self, state: MomState) -> dict:
-        print("   -> Extracting Decisions (Context Aware)...")
-        # Context building
-        context = {
-            "attendees": state.get("attendees").model_dump_json() if state.get("attendees") else "None",
-            "general_summaries": state.get("general_summaries").model_dump_json() if state.get("general_summaries") else "None",
-            "facts": state.get("facts").model_dump_json() if state.get("facts") else "None",
-             # Topic summaries might be too large, but useful. Let's include if size permits.
-             # For now, let's include it.
-            "topic_summaries": state.get("topic_summaries").model_dump_json() if state.get("topic_summaries") else "None"
-        }
-        
-        prompt_text = """
+class MomSection(str, Enum):
+    """
+    Extracted MomState sections, in graph (topological) order.
+    """
+    ATTENDEES = "attendees"
+    GENERAL_SUMMARIES = "general_summaries"
+    TOPIC_SUMMARIES = "topic_summaries"
+    FACTS = "facts"
+    DECISIONS = "decisions"
+    ACTION_ITEMS = "action_items"
+
+
+# Sections each node reads as context besides the transcript (mirrors the graph edges)
+SECTION_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "decisions": ("attendees", "general_summaries", "facts", "topic_summaries"),
+    "action_items": ("attendees", "decisions", "facts"),
+}
+
+
+# --- Prompts ---
+
+ATTENDEES_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert at extracting meeting attendees from transcripts."),
+    ("human", "Extract all attendees from the following transcript:\n\n{transcription}")
+])
+
+GENERAL_SUMMARIES_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert at summarizing meetings. Create a high-level executive summary."),
+    ("human", "Summarize the following transcript:\n\n{transcription}")
+])
+
+TOPIC_SUMMARIES_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert at summarizing specific topics from meetings."),
+    ("human", "Identify and summarize key topics from the following transcript:\n\n{transcription}")
+])
+
+FACTS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert at extracting objective facts and metrics from meetings."),
+    ("human", "Extract verifiable facts and data points from the following transcript:\n\n{transcription}")
+])
+
+DECISIONS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert at identifying binding decisions in meetings. Use the provided context to aid extraction."),
+    ("human", """
         Based on the transcript and the following context, extract the key decisions made.
         
         Context:
@@ -107,30 +104,12 @@ class MoMService:
         
         Transcript:
         {transcription}
-        """
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are an expert at identifying binding decisions in meetings. Use the provided context to aid extraction."),
-            ("human", prompt_text)
-        ])
-        
-        chain = prompt | self.llm.with_structured_output(Decisions)
-        result = chain.invoke({
-            "transcription": state["transcription"],
-            **context
-        })
-        return {"decisions": result}
+        """)
+])
 
-    def extract_action_items(self, state: MomState) -> dict:
-        print("   -> Extracting Action Items (Full Context)...")
-        # Context building including decisions now
-        context = {
-            "attendees": state.get("attendees").model_dump_json() if state.get("attendees") else "None",
-            "decisions": state.get("decisions").model_dump_json() if state.get("decisions") else "None",
-            "facts": state.get("facts").model_dump_json() if state.get("facts") else "None"
-        }
-
-        prompt_text = """
+ACTION_ITEMS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert at tracking action items and assigning tasks. Ensure action items align with decisions made."),
+    ("human", """
         Based on the transcript and the following context (including decisions made), extract actionable tasks and action items.
         
         Context:
@@ -140,49 +119,167 @@ class MoMService:
         
         Transcript:
         {transcription}
-        """
+        """)
+])
+
+
+GENERAL_SUMMARIES_REDUCE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert at summarizing meetings. Create a high-level executive summary."),
+    ("human", """
+        The following are executive summaries of consecutive parts of one long meeting.
+        Combine them into a single executive summary of the whole meeting.
+
+        Partial summaries:
+        {general_summaries}
+        """)
+])
+
+
+COMBINED_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert at writing minutes of meetings. Extract every section accurately and consistently; action items must align with the decisions made."),
+    ("human", """
+        From the following transcript, extract:
+        - all attendees
+        - a high-level executive summary
+        - summaries of the key topics
+        - verifiable facts and data points
+        - the key decisions made
+        - actionable tasks and action items
+
+        Transcript:
+        {transcription}
+        """)
+])
+
+
+def _dump(value) -> str:
+    return value.model_dump_json() if value else "None"
+
+
+class MoMService:
+    def __init__(self, llm=None):
+        self.llm_service = LLMService()
+        # Use Groq for speed, or Mistral if preferred. 
+        # Using a model with good context window and instruction following is key.
+        # whisper-large-v3 is for audio, we need text model here.
+        # Assuming LLMService initializes ChatGroq with a text model (e.g. llama3-70b-8192 or similar default)
+        # We might need to specify model name if not default. 
+        # For now using the client as is.
+        self.llm = llm or self.llm_service.chat_model
+        # self.llm = self.llm_service.mistral_client 
+        # Max nodes running at the same time in the fan-out stage
+        self.max_concurrency = int(env.MOM_MAX_CONCURRENCY or 4)
+
+        # Long transcripts are split into overlapping windows (map) and merged (reduce)
+        self.long_transcript_tokens = int(env.MOM_LONG_TRANSCRIPT_TOKENS or 24000)
+        self.window_tokens = int(env.MOM_WINDOW_TOKENS or 8000)
+        self.window_overlap_tokens = int(env.MOM_WINDOW_OVERLAP_TOKENS or 400)
+        # Short transcripts are extracted in a single combined call
+        self.combined_max_tokens = int(env.MOM_COMBINED_MAX_TOKENS or 4000)
+
+        # Prompt -> structured LLM runnables and the graph are built once per process
+        # (with_structured_output regenerates the tool JSON schema on every call).
+        self.chains = self._build_chains()
+        self.nodes = self._build_nodes()
+        self.app = self.build_graph()
+
+    def _build_chains(self) -> dict:
+        # Every chain goes through the LLMService structured-output cache
+        structured = lambda prompt, schema: self.llm_service.structured_chain(prompt, schema, llm=self.llm)
+        return {
+            "attendees": structured(ATTENDEES_PROMPT, Attendees),
+            "general_summaries": structured(GENERAL_SUMMARIES_PROMPT, GeneralSummaries),
+            "topic_summaries": structured(TOPIC_SUMMARIES_PROMPT, TopicSummaries),
+            "facts": structured(FACTS_PROMPT, Facts),
+            "decisions": structured(DECISIONS_PROMPT, Decisions),
+            "action_items": structured(ACTION_ITEMS_PROMPT, ActionItems),
+            "general_summaries_reduce": structured(GENERAL_SUMMARIES_REDUCE_PROMPT, GeneralSummaries),
+            "combined": structured(COMBINED_PROMPT, MeetingMinutes),
+        }
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are an expert at tracking action items and assigning tasks. Ensure action items align with decisions made."),
-            ("human", prompt_text)
-        ])
+    # --- Node Inputs ---
 
-        chain = prompt | self.llm.with_structured_output(ActionItems)
-        result = chain.invoke({
+    @staticmethod
+    def transcript_inputs(state: MomState) -> dict:
+        return {"transcription": state["transcription"]}
+
+    @staticmethod
+    def decisions_inputs(state: MomState) -> dict:
+        # Context building
+        return {
+            "transcription": state["transcription"],
+            "attendees": _dump(state.get("attendees")),
+            "general_summaries": _dump(state.get("general_summaries")),
+            "facts": _dump(state.get("facts")),
+            # Topic summaries might be too large, but useful. Let's include if size permits.
+            "topic_summaries": _dump(state.get("topic_summaries"))
+        }
+
+    @staticmethod
+    def action_items_inputs(state: MomState) -> dict:
+        # Context building including decisions now
+        return {
             "transcription": state["transcription"],
-            **context
-        })
-        return {"action_items": result}
+            "attendees": _dump(state.get("attendees")),
+            "decisions": _dump(state.get("decisions")),
+            "facts": _dump(state.get("facts"))
+        }
+
+    # --- Node Functions ---
+
+    def _node(self, section: str, label: str, inputs) -> RunnableLambda:
+        """
+        Graph node extracting one MomState section, usable from both invoke and ainvoke.
+        """
+        chain = self.chains[section]
+
+        def run(state: MomState) -> dict:
+            print(f"   -> Extracting {label}...")
+            with measure_step(f"extract_{section}"):
+                return {section: chain.invoke(inputs(state))}
+
+        async def arun(state: MomState) -> dict:
+            print(f"   -> Extracting {label}...")
+            async with track_stage(f"extracting_{section}"):
+                with measure_step(f"extract_{section}"):
+                    return {section: await chain.ainvoke(inputs(state))}
+
+        return RunnableLambda(run, afunc=arun, name=f"extract_{section}")
+
+    def _build_nodes(self) -> dict[str, RunnableLambda]:
+        # One node per section; shared by the graph and single-section regeneration
+        return {
+            "attendees": self._node("attendees", "Attendees", self.transcript_inputs),
+            "general_summaries": self._node("general_summaries", "General Summaries", self.transcript_inputs),
+            "topic_summaries": self._node("topic_summaries", "Topic Summaries", self.transcript_inputs),
+            "facts": self._node("facts", "Facts", self.transcript_inputs),
+            "decisions": self._node("decisions", "Decisions (Context Aware)", self.decisions_inputs),
+            "action_items": self._node("action_items", "Action Items (Full Context)", self.action_items_inputs),
+        }
 
     # --- Graph Construction ---
     def build_graph(self):
         workflow = StateGraph(MomState)
 
         # Add Nodes
-        workflow.add_node("extract_attendees", self.extract_attendees)
-        workflow.add_node("extract_general_summaries", self.extract_general_summaries)
-        workflow.add_node("extract_topic_summaries", self.extract_topic_summaries)
-        workflow.add_node("extract_facts", self.extract_facts)
-        
-        workflow.add_node("extract_decisions", self.extract_decisions)
-        workflow.add_node("extract_action_items", self.extract_action_items)
+        for section, node in self.nodes.items():
+            workflow.add_node(f"extract_{section}", node)
 
         # Edges
-        # START -> Attendees
-        workflow.add_edge(START, "extract_attendees")
-        
-        # Sequential Execution to avoid Rate Limits
-        # Attendees -> Facts
-        workflow.add_edge("extract_attendees", "extract_facts")
-        
-        # Facts -> General Summaries
-        workflow.add_edge("extract_facts", "extract_general_summaries")
-        
-        # General Summaries -> Topic Summaries
-        workflow.add_edge("extract_general_summaries", "extract_topic_summaries")
-        
-        # Topic Summaries -> Decisions (Context is built sequentially if needed, or state is accumulated)
-        workflow.add_edge("extract_topic_summaries", "extract_decisions")
+        # Attendees, facts, general and topic summaries only read the transcript,
+        # so they fan out from START and run concurrently (capped by MOM_MAX_CONCURRENCY).
+        # Provider quotas are enforced by the shared rate limiter, not by serialising nodes.
+        independent_nodes = [
+            "extract_attendees",
+            "extract_facts",
+            "extract_general_summaries",
+            "extract_topic_summaries",
+        ]
+        for node in independent_nodes:
+            workflow.add_edge(START, node)
+
+        # Join: Decisions wait for all four (they use their results as context)
+        workflow.add_edge(independent_nodes, "extract_decisions")
 
         # Decisions -> Action Items
         workflow.add_edge("extract_decisions", "extract_action_items")
@@ -192,10 +289,178 @@ class MoMService:
 
         return workflow.compile()
 
-    def generate_mom(self, transcription: str) -> MomState:
+    def select_mode(self, transcription: str, mode: Optional[MomMode] = None) -> MomMode:
+        if mode and mode != MomMode.AUTO:
+            return mode
+        tokens = count_tokens(transcription)
+        if tokens <= self.combined_max_tokens:
+            return MomMode.COMBINED
+        if tokens > self.long_transcript_tokens:
+            return MomMode.MAP_REDUCE
+        return MomMode.GRAPH
+
+    async def aselect_mode(self, transcription: str, mode: Optional[MomMode] = None) -> MomMode:
+        """
+        select_mode off the event loop: counting tokens of a full transcript (and loading
+        the tokenizer on first use) is CPU / IO bound.
+        """
+        if mode and mode != MomMode.AUTO:
+            return mode
+        return await asyncio.to_thread(self.select_mode, transcription, mode)
+
+    def _windows(self, transcription: str) -> list[dict]:
+        windows = split_windows(transcription, self.window_tokens, self.window_overlap_tokens)
+        print(f"   -> Long transcript: {len(windows)} windows of ~{self.window_tokens} tokens")
+        return [{"transcription": window} for window in windows]
+
+    @staticmethod
+    def _reduce_inputs(partials: list[MomState]) -> dict:
+        summaries = [s for p in partials if p.get("general_summaries") for s in p["general_summaries"].general_summaries]
+        return {"general_summaries": GeneralSummaries(general_summaries=summaries).model_dump_json()}
+
+    @staticmethod
+    def _from_minutes(transcription: str, minutes: MeetingMinutes) -> MomState:
+        return {"transcription": transcription, **{key: getattr(minutes, key) for key in MeetingMinutes.model_fields}}
+
+    def _config(self, bypass_cache: bool = False) -> dict:
+        # bypass_cache skips the structured-output cache lookup (fresh results are still stored)
+        return {"max_concurrency": self.max_concurrency, "configurable": {BYPASS_KEY: bypass_cache}}
+
+    def generate_mom(self, transcription: str, mode: Optional[MomMode] = None, bypass_cache: bool = False) -> MomState:
         """
         Executes the MoM generation workflow.
         """
-        app = self.build_graph()
-        result = app.invoke({"transcription": transcription})
-        return result
+        mode = self.select_mode(transcription, mode)
+        print(f"   -> MoM mode: {mode.value}")
+        config = self._config(bypass_cache)
+        if mode == MomMode.COMBINED:
+            with measure_step("extract_combined"):
+                minutes = self.chains["combined"].invoke({"transcription": transcription}, config=config)
+            return self._from_minutes(transcription, minutes)
+        if mode == MomMode.GRAPH:
+            return self.app.invoke({"transcription": transcription}, config=config)
+
+        # Map: full graph per window, reduce: merge sections + condense summaries
+        partials = self.app.batch(self._windows(transcription), config=config)
+        with measure_step("reduce_general_summaries"):
+            general_summaries = self.chains["general_summaries_reduce"].invoke(self._reduce_inputs(partials), config=config)
+        return {"transcription": transcription, "general_summaries": general_summaries, **merge_sections(partials)}
+
+    async def agenerate_mom(self, transcription: str, mode: Optional[MomMode] = None, bypass_cache: bool = False) -> MomState:
+        """
+        Async MoM generation: every node and LLM call is awaited, so the event loop
+        stays free. Cancelling the awaiting task cancels in-flight LLM calls.
+        """
+        mode = await self.aselect_mode(transcription, mode)
+        print(f"   -> MoM mode: {mode.value}")
+        config = self._config(bypass_cache)
+        if mode == MomMode.COMBINED:
+            with measure_step("extract_combined"):
+                minutes = await self.chains["combined"].ainvoke({"transcription": transcription}, config=config)
+            return self._from_minutes(transcription, minutes)
+        if mode == MomMode.GRAPH:
+            return await self.app.ainvoke({"transcription": transcription}, config=config)
+
+        partials = await self.app.abatch(self._windows(transcription), config=config)
+        with measure_step("reduce_general_summaries"):
+            general_summaries = await self.chains["general_summaries_reduce"].ainvoke(self._reduce_inputs(partials), config=config)
+        return {"transcription": transcription, "general_summaries": general_summaries, **merge_sections(partials)}
+
+    async def astream_mom(self, transcription: str, mode: Optional[MomMode] = None, bypass_cache: bool = False) -> AsyncIterator[dict]:
+        """
+        Yields partial MomState updates ({section: value}) as soon as they are extracted.
+        In graph mode each node's section is yielded when that node finishes; the other
+        modes produce every section at once.
+        """
+        mode = await self.aselect_mode(transcription, mode)
+        if mode != MomMode.GRAPH:
+            state = await self.agenerate_mom(transcription, mode=mode, bypass_cache=bypass_cache)
+            yield {key: value for key, value in state.items() if key != "transcription"}
+            return
+
+        print(f"   -> MoM mode: {mode.value} (streaming)")
+        async for update in self.app.astream({"transcription": transcription}, config=self._config(bypass_cache), stream_mode="updates"):
+            # {node_name: {section: value}}
+            for sections in update.values():
+                if sections:
+                    yield sections
+
+    # --- Incremental Updates ---
+
+    def _merge_update(self, previous: MomState, partial: MomState, general_summaries: GeneralSummaries, delta: str) -> MomState:
+        transcription = "\n".join(t for t in (previous.get("transcription"), delta) if t)
+        return {"transcription": transcription, "general_summaries": general_summaries, **merge_sections([previous, partial])}
+
+    def _needs_summary_reduce(self, previous: MomState) -> bool:
+        return bool(previous.get("general_summaries") and previous["general_summaries"].general_summaries)
+
+    def update_mom(self, previous: MomState, delta: str, bypass_cache: bool = False) -> MomState:
+        """
+        Incremental MoM: extracts from the new transcript `delta` only and merges the
+        result into `previous`. Cost is proportional to the delta; the executive
+        summary is re-condensed from the old and new summaries (not the transcript).
+        """
+        partial = self.generate_mom(delta, bypass_cache=bypass_cache)
+        general_summaries = partial["general_summaries"]
+        if self._needs_summary_reduce(previous):
+            with measure_step("reduce_general_summaries"):
+                general_summaries = self.chains["general_summaries_reduce"].invoke(
+                    self._reduce_inputs([previous, partial]), config=self._config(bypass_cache)
+                )
+        return self._merge_update(previous, partial, general_summaries, delta)
+
+    async def aupdate_mom(self, previous: MomState, delta: str, bypass_cache: bool = False) -> MomState:
+        """
+        Async version of update_mom.
+        """
+        partial = await self.agenerate_mom(delta, bypass_cache=bypass_cache)
+        general_summaries = partial["general_summaries"]
+        if self._needs_summary_reduce(previous):
+            with measure_step("reduce_general_summaries"):
+                general_summaries = await self.chains["general_summaries_reduce"].ainvoke(
+                    self._reduce_inputs([previous, partial]), config=self._config(bypass_cache)
+                )
+        return self._merge_update(previous, partial, general_summaries, delta)
+
+    # --- Single Section Regeneration ---
+
+    @staticmethod
+    def regeneration_plan(section: MomSection, include_dependents: bool = False) -> list[str]:
+        """
+        Sections to re-extract, in graph order: `section`, plus (optionally) every
+        section that reads it as context, transitively (e.g. decisions -> action_items).
+        """
+        plan = [section.value]
+        if include_dependents:
+            for candidate in MomSection:
+                if candidate.value not in plan and any(dep in plan for dep in SECTION_DEPENDENCIES.get(candidate.value, ())):
+                    plan.append(candidate.value)
+        return plan
+
+    def regenerate_sections(self, state: MomState, sections: list[str], bypass_cache: bool = True) -> dict:
+        """
+        Re-runs only the given nodes against a MomState rebuilt from a stored meeting.
+        Returns {section: value} for the regenerated sections. The cache is bypassed by
+        default, since the same inputs would otherwise return the same answer.
+        """
+        state = dict(state)
+        config = self._config(bypass_cache)
+        changes = {}
+        for section in sections:
+            update = self.nodes[section].invoke(state, config=config)
+            state.update(update)
+            changes.update(update)
+        return changes
+
+    async def aregenerate_sections(self, state: MomState, sections: list[str], bypass_cache: bool = True) -> dict:
+        """
+        Async version of regenerate_sections.
+        """
+        state = dict(state)
+        config = self._config(bypass_cache)
+        changes = {}
+        for section in sections:
+            update = await self.nodes[section].ainvoke(state, config=config)
+            state.update(update)
+            changes.update(update)
+        return changes
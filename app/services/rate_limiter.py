@@ -0,0 +1,315 @@
+"""
+Shared, adaptive rate limiting for provider API calls (Groq, Mistral).
+
+Every (provider, model) pair gets one limiter per process with:
+- a request bucket (requests per minute),
+- a token bucket (tokens per minute, reconciled with the real usage afterwards),
+- an adaptive concurrency limit (AIMD): halved on every 429, grown back on success.
+
+Callers are queued until the limiter admits them instead of failing. When the
+provider still answers 429, the call waits for `retry-after` and is retried.
+"""
+import json
+import time
+import random
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from app.env_settings import env
+from app.services.run_metrics import note_retry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Polling interval while waiting for a concurrency slot
+SLOT_WAIT_SECONDS = 0.05
+# Transient (5xx / connection) errors are retried this many times
+MAX_TRANSIENT_RETRIES = 2
+
+
+@dataclass
+class ModelLimits:
+    rpm: int
+    tpm: Optional[int] = None
+    concurrency: int = 4
+
+
+# Conservative defaults (Groq free tier / Mistral default tier). Override with RATE_LIMITS.
+DEFAULT_LIMITS: dict[str, ModelLimits] = {
+    "groq:llama-3.3-70b-versatile": ModelLimits(rpm=30, tpm=12000),
+    "groq:meta-llama/llama-4-maverick-17b-128e-instruct": ModelLimits(rpm=30, tpm=6000),
+    "groq:whisper-large-v3": ModelLimits(rpm=20),
+    "groq:whisper-large-v3-turbo": ModelLimits(rpm=20),
+    "mistral:mistral-large-latest": ModelLimits(rpm=60, tpm=500000),
+}
+FALLBACK_LIMITS = ModelLimits(rpm=30)
+
+
+def _load_limits() -> dict[str, ModelLimits]:
+    limits = dict(DEFAULT_LIMITS)
+    if env.RATE_LIMITS:
+        for key, value in json.loads(env.RATE_LIMITS).items():
+            limits[key] = ModelLimits(**value)
+    return limits
+
+
+class RateLimiter:
+    """
+    Token-bucket + adaptive concurrency limiter for one provider model.
+    Safe to use from both threads (sync clients) and the event loop.
+    """
+    def __init__(self, key: str, limits: ModelLimits):
+        self.key = key
+        self.limits = limits
+        self._lock = threading.Lock()
+
+        now = time.monotonic()
+        self._requests = float(limits.rpm)
+        self._tokens = float(limits.tpm) if limits.tpm else 0.0
+        self._refilled_at = now
+
+        self._in_flight = 0
+        self._concurrency = float(limits.concurrency)
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._requests = min(self.limits.rpm, self._requests + elapsed * self.limits.rpm / 60)
+        if self.limits.tpm:
+            self._tokens = min(self.limits.tpm, self._tokens + elapsed * self.limits.tpm / 60)
+
+    def _try_acquire(self, tokens: int) -> float:
+        """
+        Takes a slot if possible. Returns 0 on success, otherwise seconds to wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self._in_flight >= max(int(self._concurrency), 1):
+                return SLOT_WAIT_SECONDS
+
+            # A request larger than the whole bucket can never fit; let it through when the bucket is full
+            tokens = min(tokens, self.limits.tpm) if self.limits.tpm else 0
+            waits = []
+            if self._requests < 1:
+                waits.append((1 - self._requests) * 60 / self.limits.rpm)
+            if tokens and self._tokens < tokens:
+                waits.append((tokens - self._tokens) * 60 / self.limits.tpm)
+            if waits:
+                return max(waits)
+
+            self._requests -= 1
+            self._tokens -= tokens
+            self._in_flight += 1
+            return 0.0
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Blocks the calling thread until the request is admitted.
+        """
+        while (wait := self._try_acquire(tokens)) > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """
+        Waits (without blocking the event loop) until the request is admitted.
+        """
+        while (wait := self._try_acquire(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def release(self, reserved: int = 0, used: Optional[int] = None) -> None:
+        """
+        Frees the concurrency slot and reconciles the token reservation with real usage.
+        """
+        with self._lock:
+            self._in_flight = max(self._in_flight - 1, 0)
+            if self.limits.tpm and used is not None:
+                self._tokens = min(self.limits.tpm, self._tokens + min(reserved, self.limits.tpm) - used)
+
+    def on_success(self) -> None:
+        with self._lock:
+            # Additive increase: +1 slot per `concurrency` successful calls
+            self._concurrency = min(self.limits.concurrency, self._concurrency + 1 / max(self._concurrency, 1))
+
+    def on_rate_limited(self, retry_after: Optional[float]) -> None:
+        with self._lock:
+            # Multiplicative decrease and a global pause for this model
+            self._concurrency = max(self._concurrency / 2, 1)
+            pause = retry_after if retry_after is not None else 60 / self.limits.rpm
+            self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+            self._requests = 0
+        logger.warning(f"429 from {self.key}: pausing {pause:.1f}s, concurrency -> {int(self._concurrency)}")
+
+
+class RateLimiterRegistry:
+    """
+    Process-wide registry, one limiter per provider model.
+    """
+    def __init__(self):
+        self._limiters: dict[str, RateLimiter] = {}
+        self._limits = _load_limits()
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, model: str) -> RateLimiter:
+        key = f"{provider}:{model}"
+        with self._lock:
+            if key not in self._limiters:
+                self._limiters[key] = RateLimiter(key, self._limits.get(key, FALLBACK_LIMITS))
+            return self._limiters[key]
+
+
+rate_limiters = RateLimiterRegistry()
+
+
+# --- Error inspection ---
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    return _status_code(exc) == 429
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    status = _status_code(exc)
+    if status is not None:
+        return status >= 500
+    return type(exc).__name__ in ("APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout")
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    Reads `retry-after` (seconds or HTTP date) from the error's response headers.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0.5, 1.0) * min(2 ** attempt, 30)
+
+
+# --- Call wrappers ---
+
+def _retry_budget(max_retries: Optional[int]) -> tuple[int, int]:
+    """
+    (429 retries, transient-error retries) for one call.
+    """
+    if max_retries is None:
+        return int(env.RATE_LIMIT_MAX_RETRIES or 6), MAX_TRANSIENT_RETRIES
+    return max_retries, min(max_retries, MAX_TRANSIENT_RETRIES)
+
+
+def call_with_limits(
+    limiter: RateLimiter,
+    tokens: int,
+    fn: Callable[[], T],
+    usage: Optional[Callable[[T], Optional[int]]] = None,
+    max_retries: Optional[int] = None
+) -> T:
+    """
+    Runs a blocking provider call under the limiter, retrying 429s and transient errors.
+    `usage` extracts the real token usage from the result to reconcile the bucket.
+    `max_retries` overrides RATE_LIMIT_MAX_RETRIES (0: fail fast, e.g. behind LLMRouter).
+    """
+    max_retries, max_transient = _retry_budget(max_retries)
+    rate_limited = transient = 0
+    while True:
+        limiter.acquire(tokens)
+        used = None
+        try:
+            result = fn()
+            used = usage(result) if usage else None
+            limiter.on_success()
+            return result
+        except Exception as e:
+            if is_rate_limit_error(e) and rate_limited < max_retries:
+                rate_limited += 1
+                note_retry()
+                limiter.on_rate_limited(retry_after_seconds(e))
+                continue
+            if is_transient_error(e) and transient < max_transient:
+                transient += 1
+                note_retry()
+                time.sleep(_backoff(transient))
+                continue
+            raise
+        finally:
+            limiter.release(tokens, used)
+
+
+async def acall_with_limits(
+    limiter: RateLimiter,
+    tokens: int,
+    fn: Callable[[], Awaitable[T]],
+    usage: Optional[Callable[[T], Optional[int]]] = None,
+    max_retries: Optional[int] = None
+) -> T:
+    """
+    Async counterpart of `call_with_limits`.
+    """
+    max_retries, max_transient = _retry_budget(max_retries)
+    rate_limited = transient = 0
+    while True:
+        await limiter.aacquire(tokens)
+        used = None
+        try:
+            result = await fn()
+            used = usage(result) if usage else None
+            limiter.on_success()
+            return result
+        except Exception as e:
+            if is_rate_limit_error(e) and rate_limited < max_retries:
+                rate_limited += 1
+                note_retry()
+                limiter.on_rate_limited(retry_after_seconds(e))
+                continue
+            if is_transient_error(e) and transient < max_transient:
+                transient += 1
+                note_retry()
+                await asyncio.sleep(_backoff(transient))
+                continue
+            raise
+        finally:
+            limiter.release(tokens, used)
+
+
+def chat_result_tokens(result: Any) -> Optional[int]:
+    """
+    Total tokens reported by a LangChain ChatResult, if any.
+    """
+    token_usage = (getattr(result, "llm_output", None) or {}).get("token_usage") or {}
+    total = token_usage.get("total_tokens")
+    if total is None:
+        for generation in getattr(result, "generations", []):
+            usage_metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage_metadata:
+                total = (total or 0) + usage_metadata.get("total_tokens", 0)
+    return total
@@ -0,0 +1,201 @@
+"""
+Per-step token / latency / retry / cache instrumentation of MoM runs.
+
+A RunRecorder lives in a context variable for the duration of one MoM request
+or job. Graph nodes and the transcription call open a step with
+`measure_step(...)`; the layers underneath (rate-limited chat model, limiter
+retries, structured-output cache) report into the current step without any
+plumbing. Outside a run everything is a no-op.
+"""
+import time
+import functools
+from contextvars import ContextVar
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from beanie import PydanticObjectId
+
+from app.schemas.metrics_schema import StepMetrics, ModelUsage, StepUsage, MetricsSummary
+from app.models.database.mom_runs_collection import MomRunCollection
+
+
+class RunRecorder:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.steps: list[StepMetrics] = []
+
+    def to_document(self, **fields) -> MomRunCollection:
+        return MomRunCollection(
+            total_seconds=round(time.perf_counter() - self.started, 3),
+            prompt_tokens=sum(s.prompt_tokens for s in self.steps),
+            completion_tokens=sum(s.completion_tokens for s in self.steps),
+            steps=self.steps,
+            **fields
+        )
+
+
+current_run: ContextVar[Optional[RunRecorder]] = ContextVar("current_run", default=None)
+current_step: ContextVar[Optional[StepMetrics]] = ContextVar("current_step", default=None)
+
+
+@contextmanager
+def recording_run():
+    """
+    Starts a run, or joins the one already recording (nested controller calls).
+    """
+    run = current_run.get()
+    if run is not None:
+        yield run
+        return
+    run = RunRecorder()
+    token = current_run.set(run)
+    try:
+        yield run
+    finally:
+        try:
+            current_run.reset(token)
+        except ValueError:
+            # Async generator finalised from another context (client went away mid-stream)
+            pass
+
+
+def records_run(fn):
+    """
+    Decorator: the wrapped coroutine runs inside `recording_run()`.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        with recording_run():
+            return await fn(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def measure_step(name: str, provider: Optional[str] = None, model: Optional[str] = None):
+    """
+    Times a step of the current run and makes it the target of note_* calls.
+    """
+    run = current_run.get()
+    if run is None:
+        yield None
+        return
+    step = StepMetrics(name=name, provider=provider, model=model)
+    run.steps.append(step)
+    token = current_step.set(step)
+    t0 = time.perf_counter()
+    try:
+        yield step
+    finally:
+        step.seconds = round(time.perf_counter() - t0, 3)
+        current_step.reset(token)
+
+
+def note_usage(provider: str, model: str, prompt_tokens: int, completion_tokens: int) -> None:
+    step = current_step.get()
+    if step is None:
+        return
+    step.provider = step.provider or provider
+    step.model = step.model or model
+    step.calls += 1
+    step.prompt_tokens += prompt_tokens
+    step.completion_tokens += completion_tokens
+
+
+def note_retry() -> None:
+    step = current_step.get()
+    if step is not None:
+        step.retries += 1
+
+
+def note_cache_hit(model: Optional[str] = None) -> None:
+    step = current_step.get()
+    if step is not None:
+        step.model = step.model or model
+        step.cache_hits += 1
+
+
+def chat_result_usage(result: Any) -> tuple[int, int]:
+    """
+    (prompt, completion) tokens from a ChatResult's usage metadata.
+    """
+    prompt = completion = 0
+    for generation in getattr(result, "generations", []):
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+        prompt += usage.get("input_tokens", 0)
+        completion += usage.get("output_tokens", 0)
+    return prompt, completion
+
+
+async def save_run(
+    kind: str,
+    meeting_id: Optional[PydanticObjectId],
+    org_id: Optional[PydanticObjectId],
+    created_by: Optional[PydanticObjectId]
+) -> Optional[MomRunCollection]:
+    """
+    Persists the current run record (if a run is being recorded).
+    """
+    run = current_run.get()
+    if run is None:
+        return None
+    doc = run.to_document(kind=kind, meeting_id=meeting_id, org_id=org_id, created_by=created_by)
+    await doc.insert()
+    return doc
+
+
+async def summarize_runs(scope: dict, days: int) -> MetricsSummary:
+    """
+    Aggregates run records matching `scope` (org or creator) over the last `days`.
+    """
+    match = {**scope, "created_on": {"$gte": datetime.now() - timedelta(days=days)}}
+    totals = await MomRunCollection.aggregate([
+        {"$match": match},
+        {"$group": {
+            "_id": None,
+            "runs": {"$sum": 1},
+            "total_seconds": {"$sum": "$total_seconds"},
+            "prompt_tokens": {"$sum": "$prompt_tokens"},
+            "completion_tokens": {"$sum": "$completion_tokens"},
+        }},
+    ]).to_list()
+
+    by_model = await MomRunCollection.aggregate([
+        {"$match": match},
+        {"$unwind": "$steps"},
+        {"$match": {"steps.model": {"$ne": None}}},
+        {"$group": {
+            "_id": {"provider": "$steps.provider", "model": "$steps.model"},
+            "calls": {"$sum": "$steps.calls"},
+            "prompt_tokens": {"$sum": "$steps.prompt_tokens"},
+            "completion_tokens": {"$sum": "$steps.completion_tokens"},
+            "retries": {"$sum": "$steps.retries"},
+            "cache_hits": {"$sum": "$steps.cache_hits"},
+            "seconds": {"$sum": "$steps.seconds"},
+        }},
+        {"$sort": {"prompt_tokens": -1}},
+    ]).to_list()
+
+    by_step = await MomRunCollection.aggregate([
+        {"$match": match},
+        {"$unwind": "$steps"},
+        {"$group": {
+            "_id": "$steps.name",
+            "count": {"$sum": 1},
+            "avg_seconds": {"$avg": "$steps.seconds"},
+            "max_seconds": {"$max": "$steps.seconds"},
+            "avg_prompt_tokens": {"$avg": "$steps.prompt_tokens"},
+            "avg_completion_tokens": {"$avg": "$steps.completion_tokens"},
+            "retries": {"$sum": "$steps.retries"},
+            "cache_hits": {"$sum": "$steps.cache_hits"},
+        }},
+        {"$sort": {"avg_seconds": -1}},
+    ]).to_list()
+
+    summary = {k: v for k, v in (totals[0] if totals else {}).items() if k != "_id"}
+    return MetricsSummary(
+        days=days,
+        **summary,
+        by_model=[ModelUsage(**row["_id"], **{k: v for k, v in row.items() if k != "_id"}) for row in by_model],
+        by_step=[StepUsage(name=row["_id"], **{k: v for k, v in row.items() if k != "_id"}) for row in by_step],
+    )
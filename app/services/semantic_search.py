@@ -0,0 +1,267 @@
+"""
+Semantic search over meetings (GET /meetings/semantic-search).
+
+Opt-in (SEMANTIC_SEARCH_ENABLED=true): embedding runs on the CPU of the API
+process, so it is off unless a deployment asks for it.
+
+At save time (generate / update / regenerate) each meeting is cut into
+passages - one per MoM section item plus overlapping transcript chunks - that
+are embedded locally on CPU (app.services.embeddings) in a background task and
+stored as float16 in MeetingEmbeddingCollection.
+
+Queries are answered from an in-process VectorIndex per scope (org, or user
+without an org), loaded from Mongo on first use and kept in sync incrementally:
+before a search, embeddings updated since the last sync (by any process) are
+re-added, which replaces the previous rows of those meetings. Results are
+joined with the meetings collection under the same scope, so a deleted
+meeting never surfaces even while its rows are still in another process' index.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+from beanie import PydanticObjectId
+
+from app.env_settings import env
+from app.models.database.meeting_collection import MeetingCollection
+from app.models.database.meeting_embeddings_collection import MeetingEmbeddingCollection
+from app.services.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+# Characters of passage text stored for snippets
+PASSAGE_LENGTH = 300
+# Overlap between consecutive transcript chunks (fraction of EMBEDDING_CHUNK_WORDS)
+CHUNK_OVERLAP = 0.2
+# Re-read embeddings written slightly before the last sync (clock skew between processes)
+SYNC_MARGIN = timedelta(seconds=5)
+
+_embedder = None
+# One embedding batch at a time per process: torch already uses every core
+_embedding_slot = asyncio.Semaphore(1)
+# Strong references to background embedding tasks (the loop only keeps weak ones)
+_pending: set = set()
+
+
+def enabled() -> bool:
+    return (env.SEMANTIC_SEARCH_ENABLED or "false").lower() == "true"
+
+
+def _get_embedder():
+    global _embedder  # pylint: disable=global-statement
+    if _embedder is None:
+        # Imported lazily so nodes that never embed don't load torch/transformers
+        from app.services.embeddings import LocalEmbedder
+        _embedder = LocalEmbedder()
+    return _embedder
+
+
+# --- Passages ---
+
+def _transcript_chunks(transcription: str) -> list[str]:
+    words = (transcription or "").split()
+    size = int(env.EMBEDDING_CHUNK_WORDS or 120)
+    step = max(1, int(size * (1 - CHUNK_OVERLAP)))
+    return [" ".join(words[i:i + size]) for i in range(0, max(len(words) - size + step, 1), step) if words[i:i + size]]
+
+
+def meeting_passages(meeting: MeetingCollection) -> list[tuple[str, str]]:
+    """
+    (field, text) passages of a meeting: MoM section items first, then transcript chunks.
+    """
+    passages = []
+
+    def add(field: str, *parts: Optional[str]) -> None:
+        text = ": ".join(p.strip() for p in parts if p and p.strip())
+        if text:
+            passages.append((field, text))
+
+    if meeting.general_summaries:
+        for item in meeting.general_summaries.general_summaries:
+            add("general_summaries", item.executive_overview)
+    if meeting.topic_summaries:
+        for item in meeting.topic_summaries.topic_summaries:
+            add("topic_summaries", item.related_topic_title, item.description)
+    if meeting.decisions:
+        for item in meeting.decisions.decisions:
+            add("decisions", item.decision_headline, item.description)
+    if meeting.action_items:
+        for item in meeting.action_items.action_items:
+            add("action_items", item.task_title, item.description)
+    if meeting.facts:
+        for item in meeting.facts.facts:
+            add("facts", item.topic_context, item.description)
+    for chunk in _transcript_chunks(meeting.transcription):
+        add("transcription", chunk)
+    return passages
+
+
+# --- Save time ---
+
+async def embed_meeting(meeting: MeetingCollection) -> MeetingEmbeddingCollection:
+    """
+    Embeds the passages of a meeting and upserts its MeetingEmbeddingCollection document.
+    """
+    passages = meeting_passages(meeting)
+    embedder = _get_embedder()
+    async with _embedding_slot:
+        t0 = time.perf_counter()
+        vectors = await asyncio.to_thread(embedder.embed, [text for _, text in passages])
+    logger.info(f"Embedded {len(passages)} passages of meeting {meeting.id} in {time.perf_counter() - t0:.2f}s")
+
+    data = {
+        "org_id": meeting.org_id,
+        "created_by": meeting.created_by,
+        "model": embedder.model_id,
+        "dim": int(vectors.shape[1]),
+        "fields": [field for field, _ in passages],
+        "passages": [text[:PASSAGE_LENGTH] for _, text in passages],
+        "vectors": vectors.astype(np.float16).tobytes(),
+        "updated_on": datetime.now(),
+    }
+    doc = await MeetingEmbeddingCollection.find_one(MeetingEmbeddingCollection.meeting_id == meeting.id)
+    if doc:
+        await doc.set(data)
+    else:
+        doc = MeetingEmbeddingCollection(meeting_id=meeting.id, **data)
+        await doc.insert()
+    # Searchable in this process right away (other processes pick it up on their next sync)
+    semantic_index.add_meeting(meeting.id, vectors, {"org_id": meeting.org_id, "created_by": meeting.created_by})
+    return doc
+
+
+def schedule_embedding(meeting: MeetingCollection) -> None:
+    """
+    Embeds a saved meeting in the background (best effort: failures are logged,
+    the meeting is saved either way and simply stays out of semantic results).
+    """
+    if not enabled():
+        return
+
+    async def run():
+        try:
+            await embed_meeting(meeting)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning(f"Embedding meeting {meeting.id} failed: {e}")
+
+    task = asyncio.create_task(run())
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+# --- Search ---
+
+class _ScopeIndex:
+    def __init__(self, dim: int):
+        self.index = VectorIndex(
+            dim,
+            ivf_min_vectors=int(env.VECTOR_INDEX_IVF_MIN_VECTORS or 20000),
+            nprobe=int(env.VECTOR_INDEX_NPROBE or 32),
+        )
+        self.synced_at: Optional[datetime] = None
+        self.checked_at = 0.0
+        self.lock = asyncio.Lock()
+
+
+def _add_rows(index: VectorIndex, rows: list[dict]) -> None:
+    for row in rows:
+        vectors = np.frombuffer(row["vectors"], dtype=np.float16).reshape(-1, row["dim"])
+        index.add(str(row["meeting_id"]), vectors)
+
+
+class SemanticIndex:
+    """
+    In-process vector indexes, one per scope, least recently used evicted first.
+    """
+    def __init__(self, max_scopes: int = 64, sync_seconds: float = 2.0):
+        self.max_scopes = max_scopes
+        self.sync_seconds = sync_seconds
+        self._scopes: OrderedDict[str, _ScopeIndex] = OrderedDict()
+
+    @staticmethod
+    def _key(scope: dict) -> str:
+        return ",".join(f"{k}={v}" for k, v in sorted(scope.items()))
+
+    def _entry(self, scope: dict, dim: int) -> _ScopeIndex:
+        key = self._key(scope)
+        entry = self._scopes.get(key)
+        if entry is None or entry.index.dim != dim:
+            entry = self._scopes[key] = _ScopeIndex(dim)
+        self._scopes.move_to_end(key)
+        while len(self._scopes) > self.max_scopes:
+            self._scopes.popitem(last=False)
+        return entry
+
+    async def _sync(self, scope: dict, entry: _ScopeIndex, model: str) -> None:
+        """
+        Adds the embeddings of the scope written since the last sync (all of them on first use).
+        """
+        if entry.synced_at and time.monotonic() - entry.checked_at < self.sync_seconds:
+            return
+        async with entry.lock:
+            if entry.synced_at and time.monotonic() - entry.checked_at < self.sync_seconds:
+                return
+            started = datetime.now()
+            match = {**scope, "model": model, "dim": entry.index.dim}
+            if entry.synced_at:
+                match["updated_on"] = {"$gt": entry.synced_at - SYNC_MARGIN}
+            rows = await MeetingEmbeddingCollection.aggregate([
+                {"$match": match},
+                {"$project": {"_id": 0, "meeting_id": 1, "dim": 1, "vectors": 1}},
+            ]).to_list()
+            if rows:
+                await asyncio.to_thread(_add_rows, entry.index, rows)
+            entry.synced_at, entry.checked_at = started, time.monotonic()
+
+    async def search(self, scope: dict, query: str, limit: int = 10) -> list[tuple[str, float, int]]:
+        """
+        Best meetings of the scope for a free-text query: [(meeting_id, score, passage index)].
+        """
+        embedder = _get_embedder()
+        query_vector = (await asyncio.to_thread(embedder.embed, [query]))[0]
+        entry = self._entry(scope, len(query_vector))
+        await self._sync(scope, entry, embedder.model_id)
+        return await asyncio.to_thread(entry.index.search, query_vector, limit)
+
+    def add_meeting(self, meeting_id, vectors: np.ndarray, owners: dict) -> None:
+        """
+        Adds (or replaces) a meeting in the loaded indexes of the scopes it belongs to.
+        """
+        for field, value in owners.items():
+            entry = self._scopes.get(self._key({field: value})) if value else None
+            if entry and entry.index.dim == vectors.shape[1]:
+                entry.index.add(str(meeting_id), vectors)
+
+    def stats(self) -> dict:
+        return {key: entry.index.stats() for key, entry in self._scopes.items()}
+
+
+async def passages_for(hits: list[tuple[str, float, int]]) -> dict[str, dict]:
+    """
+    {meeting_id: {"field": ..., "text": ...}} of the matched passage of each hit.
+    """
+    if not hits:
+        return {}
+    ids = [meeting_id for meeting_id, _, _ in hits]
+    positions = [position for _, _, position in hits]
+    at = {"$arrayElemAt": [positions, {"$indexOfArray": [ids, {"$toString": "$meeting_id"}]}]}
+    rows = await MeetingEmbeddingCollection.aggregate([
+        {"$match": {"meeting_id": {"$in": [PydanticObjectId(i) for i in ids]}}},
+        {"$project": {
+            "_id": 0,
+            "meeting_id": {"$toString": "$meeting_id"},
+            "field": {"$arrayElemAt": ["$fields", at]},
+            "text": {"$arrayElemAt": ["$passages", at]},
+        }},
+    ]).to_list()
+    return {row["meeting_id"]: row for row in rows}
+
+
+semantic_index = SemanticIndex(
+    max_scopes=int(env.VECTOR_INDEX_MAX_SCOPES or 64),
+    sync_seconds=float(env.VECTOR_INDEX_SYNC_SECONDS or 2),
+)
@@ -0,0 +1,81 @@
+"""
+Token counting helpers.
+
+`estimate_tokens` is the cheap chars/4 heuristic (used in hot loops such as
+window splitting). `count_tokens` uses the real tokenizer of the MoM model
+(TOKENIZER_PATH / TOKENIZER_NAME), loaded once per process, with results
+memoised by a digest of the text (transcripts themselves are not kept); it
+falls back to the estimate when no tokenizer can be loaded.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from app.env_settings import env
+
+logger = logging.getLogger(__name__)
+
+_tokenizer = None
+_tokenizer_loaded = False
+_tokenizer_lock = threading.Lock()
+
+# Memoised counts: 16-byte digest of the text -> token count (LRU)
+COUNT_CACHE_SIZE = 1024
+_counts: OrderedDict[bytes, int] = OrderedDict()
+_counts_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for English text).
+    """
+    return len(text) // 4
+
+
+def get_tokenizer():
+    """
+    The shared `tokenizers.Tokenizer`, or None if unavailable (only tried once).
+    """
+    global _tokenizer, _tokenizer_loaded  # pylint: disable=global-statement
+    if _tokenizer_loaded:
+        return _tokenizer
+    with _tokenizer_lock:
+        if _tokenizer_loaded:
+            return _tokenizer
+        try:
+            from tokenizers import Tokenizer  # pylint: disable=import-outside-toplevel
+            if env.TOKENIZER_PATH:
+                _tokenizer = Tokenizer.from_file(env.TOKENIZER_PATH)
+            elif env.TOKENIZER_NAME.lower() != "none":
+                _tokenizer = Tokenizer.from_pretrained(env.TOKENIZER_NAME)
+            if _tokenizer:
+                logger.info(f"Loaded tokenizer {env.TOKENIZER_PATH or env.TOKENIZER_NAME}")
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning(f"Tokenizer unavailable, falling back to chars/4 estimate: {e}")
+            _tokenizer = None
+        _tokenizer_loaded = True
+    return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    """
+    Token count with the model tokenizer (memoised; chars/4 fallback).
+    """
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    with _counts_lock:
+        if key in _counts:
+            _counts.move_to_end(key)
+            return _counts[key]
+
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        count = estimate_tokens(text)
+    else:
+        count = len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+    with _counts_lock:
+        _counts[key] = count
+        while len(_counts) > COUNT_CACHE_SIZE:
+            _counts.popitem(last=False)
+    return count
@@ -1,33 +1,65 @@
 
 
 import json
+import logging
 from enum import Enum
 # from mistralai import Mistral
 from groq import Groq
 from app.env_settings import env
+from app.services.rate_limiter import rate_limiters, call_with_limits
+from app.services.fake_provider import groq_client_kwargs
+from app.services.run_metrics import measure_step
+
+logger = logging.getLogger(__name__)
 
 class ModelChoices(str,Enum):
     WHISPER_LARGE_TURBO = "whisper-large-v3-turbo"
     WHISPER_LARGE = "whisper-large-v3"
+    # Offline CPU backend, checkpoint is configured via LOCAL_WHISPER_MODEL
+    LOCAL_WHISPER = "local-whisper"
 
 
 class TranscriptionService:
     def __init__(self):
         # self.mistral= Mistral(api_key=env.MISTRAL_API_KEY) if env.MISTRAL_API_KEY else None
-        self.groq= Groq(api_key=env.GROQ_API_KEY)
+        # Retries are handled by the shared rate limiter (429 + retry-after aware)
+        self.groq= Groq(**{"api_key": env.GROQ_API_KEY, "max_retries": 0, **groq_client_kwargs()})
+        self.local_whisper = None
     
     def whisper_transcribe(self, file_content: bytes, filename: str, model: ModelChoices = ModelChoices.WHISPER_LARGE):
-        print(model)
         # Handle model being an Enum or a string
         model_id = model.value if hasattr(model, 'value') else model
-        print(f"Using model ID: {model_id}")
-        transcription = self.groq.audio.transcriptions.create(
-            file=(filename, file_content),
-            response_format='verbose_json',
-            model=model_id,
-            timestamp_granularities=["word", "segment"]
-        )
-        return transcription.to_dict()
+        logger.debug(f"Transcribing {filename} with model {model_id}")
+        provider = "local" if model_id == ModelChoices.LOCAL_WHISPER.value else "groq"
+        with measure_step("transcribe", provider=provider, model=model_id) as step:
+            if provider == "local":
+                result = self.local_transcribe(file_content)
+            else:
+                transcription = call_with_limits(
+                    rate_limiters.get("groq", model_id),
+                    0,
+                    lambda: self.groq.audio.transcriptions.create(
+                        file=(filename, file_content),
+                        response_format='verbose_json',
+                        model=model_id,
+                        timestamp_granularities=["word", "segment"]
+                    )
+                )
+                result = transcription.to_dict()
+            if step:
+                step.calls += 1
+                step.audio_seconds = result.get("duration")
+        return result
+
+    def local_transcribe(self, file_content: bytes) -> dict:
+        """
+        Transcribes on CPU with the local Whisper checkpoint (same verbose_json shape as Groq).
+        """
+        if self.local_whisper is None:
+            # Imported lazily so API nodes that only use Groq never load torch/transformers
+            from app.services.local_whisper import LocalWhisperTranscriber
+            self.local_whisper = LocalWhisperTranscriber()
+        return self.local_whisper.transcribe(file_content)
 
 
 
@@ -0,0 +1,164 @@
+"""
+Deterministic transcript clean-up run before MoM extraction.
+
+Whisper output carries filler words, stuttered repetitions and, on silence,
+hallucinated loops ("Thank you. Thank you. Thank you."). None of it helps the
+extraction prompts, and every node pays for it. Steps, in order:
+1. drop hallucination loops (a run of 1-3 sentences repeated back to back;
+   only units with words count, so numbers and IPs are never touched)
+2. remove disfluencies (um, uh, erm, hmm, ...), never right after a number
+   ("5 mm" is a unit)
+3. collapse immediate word / short-phrase repetitions ("I think I think"),
+   except numbers and meaningful doubles ("had had", "that that", "bye bye")
+4. normalise whitespace
+
+The stored meeting keeps the raw transcript; only the LLM input is cleaned.
+"""
+import re
+from typing import Optional
+
+from app.services.tokens import count_tokens
+from app.services.mom_reduce import normalize
+from app.schemas import TranscriptStats
+
+# Sentence-ish units, keeping their terminator and trailing whitespace
+# (a "." not followed by whitespace, as in 10.0.0.1 or 3.5, doesn't end a unit)
+_UNITS = re.compile(r"(?:[^.!?\n]|[.!?]+(?=[^\s.!?]))+(?:[.!?]+|$)[ \t]*|\n+")
+_LETTER = re.compile(r"[^\W\d_]")
+
+# Filler words (optionally followed by a comma), whole words only. Hums need an
+# "h" ("mm" is millimetres), and nothing directly after a number is a filler.
+_FILLERS = re.compile(
+    r"(?<![\w'-])(?<!\d )(?:u+h+m*|u+m+|e+r+m+|a+h+|h+m+|m+h+m+|uh-huh)\b,?\s*",
+    re.IGNORECASE
+)
+# Same word or 2-4 word phrase repeated back to back
+_REPEATS = re.compile(r"\b((?:\w+[\s,]+){0,3}?\w+)(?:[\s,]+\1\b)+", re.IGNORECASE)
+_DIGIT = re.compile(r"\d")
+# Words that mean something when doubled ("it had had an effect", "I said that that was fine", "bye bye")
+MEANINGFUL_DOUBLES = {"had", "that", "bye"}
+
+_SPACES = re.compile(r"[ \t]+")
+_SPACE_BEFORE_PUNCT = re.compile(r"[ \t]+([,.!?;:])")
+# Comma left in front of closing punctuation by a removed filler ("3 ms, hmm.")
+_DANGLING_COMMA = re.compile(r",+([.!?;:])")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+# Longest repeated cycle (in sentences) treated as a loop, and how many
+# back-to-back repeats make a multi-sentence cycle a loop
+LOOP_MAX_PERIOD = 3
+LOOP_MIN_REPEATS = 3
+# Shortest unit (in words) that can be part of a loop: a clause, not a lone number or "Yes."
+LOOP_MIN_WORDS = 2
+
+
+def _loop_key(unit: str) -> str:
+    """
+    Comparison key of a unit that may be part of a loop, "" for units that never are.
+    """
+    key = normalize(unit)
+    if not _LETTER.search(key) or len(key.split()) < LOOP_MIN_WORDS:
+        return ""
+    return key
+
+
+def _drop_loops(text: str) -> tuple[str, int]:
+    units = _UNITS.findall(text)
+    keys = [_loop_key(u) for u in units]
+    kept: list[str] = []
+    dropped = 0
+    i = 0
+    while i < len(units):
+        if not keys[i]:
+            kept.append(units[i])
+            i += 1
+            continue
+        skipped = False
+        for period in range(1, LOOP_MAX_PERIOD + 1):
+            cycle = keys[i:i + period]
+            if len(cycle) < period or not all(cycle):
+                break
+            repeats = 1
+            while keys[i + repeats * period:i + (repeats + 1) * period] == cycle:
+                repeats += 1
+            # An immediately repeated sentence is always a loop; longer cycles need more repeats
+            if repeats > 1 and (period == 1 or repeats >= LOOP_MIN_REPEATS):
+                kept.extend(units[i:i + period])
+                dropped += (repeats - 1) * period
+                i += repeats * period
+                skipped = True
+                break
+        if not skipped:
+            kept.append(units[i])
+            i += 1
+    return "".join(kept), dropped
+
+
+def _remove_fillers(text: str) -> tuple[str, int]:
+    return _FILLERS.subn("", text)
+
+
+def _collapse_repeats(text: str) -> tuple[str, int]:
+    collapsed = 0
+
+    def collapse(match: re.Match) -> str:
+        nonlocal collapsed
+        phrase = match.group(1)
+        # Numbers are content ("5, 5 and 5 percent", "10 10"), never a stutter
+        if _DIGIT.search(phrase):
+            return match.group(0)
+        if phrase.lower() in MEANINGFUL_DOUBLES and len(match.group(0).split()) == 2:
+            return match.group(0)
+        collapsed += 1
+        return phrase
+
+    return _REPEATS.sub(collapse, text), collapsed
+
+
+def _normalize_whitespace(text: str) -> str:
+    lines = [_SPACES.sub(" ", line).strip() for line in text.splitlines()]
+    text = "\n".join(lines)
+    text = _SPACE_BEFORE_PUNCT.sub(r"\1", text)
+    text = _DANGLING_COMMA.sub(r"\1", text)
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def preprocess_transcript(transcription: str) -> tuple[str, TranscriptStats]:
+    """
+    Returns the cleaned transcript and the reduction stats.
+    """
+    text, loop_sentences = _drop_loops(transcription)
+    text, fillers = _remove_fillers(text)
+    text, repetitions = _collapse_repeats(text)
+    text = _normalize_whitespace(text)
+
+    original_tokens = count_tokens(transcription)
+    processed_tokens = count_tokens(text)
+    stats = TranscriptStats(
+        original_tokens=original_tokens,
+        processed_tokens=processed_tokens,
+        reduction_pct=reduction_pct(original_tokens, processed_tokens),
+        fillers_removed=fillers,
+        repetitions_collapsed=repetitions,
+        loop_sentences_dropped=loop_sentences,
+    )
+    return text, stats
+
+
+def reduction_pct(original_tokens: int, processed_tokens: int) -> float:
+    if not original_tokens:
+        return 0.0
+    return round(100 * (1 - processed_tokens / original_tokens), 2)
+
+
+def combine_stats(previous: Optional[TranscriptStats], delta: TranscriptStats) -> TranscriptStats:
+    """
+    Stats of a transcript grown incrementally (see MoMService.update_mom).
+    """
+    if previous is None:
+        return delta
+    totals = {
+        field: getattr(previous, field) + getattr(delta, field)
+        for field in ("original_tokens", "processed_tokens", "fillers_removed", "repetitions_collapsed", "loop_sentences_dropped")
+    }
+    return TranscriptStats(**totals, reduction_pct=reduction_pct(totals["original_tokens"], totals["processed_tokens"]))
@@ -0,0 +1,161 @@
+"""
+Packing and querying of word/segment timestamps in columnar form.
+
+verbose_json spends ~100 bytes of JSON per word and several hundred per
+segment. Here every word costs 12 bytes (start, end, token index) plus its
+share of a deduplicated token table, and a segment costs 12 bytes since its
+text is rebuilt from its word range. Time-range lookups are two binary
+searches over the sorted start/end arrays.
+"""
+import math
+from typing import Optional
+
+import numpy as np
+
+from app.models.database.transcript_timings_collection import TranscriptTimingsCollection
+
+TOKEN_SEPARATOR = "\x00"
+
+
+def _words_from_result(result: dict) -> list[dict]:
+    words = result.get("words")
+    if words is None:
+        # Some providers nest words inside segments
+        words = [w for seg in result.get("segments") or [] for w in seg.get("words") or []]
+    return sorted(words, key=lambda w: w["start"])
+
+
+def pack_timings(result: dict) -> dict:
+    """
+    Converts a verbose_json transcription into TranscriptTimingsCollection fields.
+    """
+    words = _words_from_result(result)
+    segments = sorted(result.get("segments") or [], key=lambda s: s["start"])
+
+    token_index: dict[str, int] = {}
+    word_token = np.empty(len(words), dtype=np.int32)
+    for i, word in enumerate(words):
+        text = word["word"].strip()
+        word_token[i] = token_index.setdefault(text, len(token_index))
+
+    word_start = np.fromiter((w["start"] for w in words), dtype=np.float32, count=len(words))
+    word_end = np.fromiter((w["end"] for w in words), dtype=np.float32, count=len(words))
+    # Keep end times monotonic so range lookups can binary search them too
+    np.maximum.accumulate(word_end, out=word_end)
+
+    segment_start = np.fromiter((s["start"] for s in segments), dtype=np.float32, count=len(segments))
+    segment_end = np.fromiter((s["end"] for s in segments), dtype=np.float32, count=len(segments))
+    segment_word_offset = np.searchsorted(word_start, segment_start, side="left").astype(np.int32)
+
+    return {
+        "language": result.get("language"),
+        "duration": float(result.get("duration") or 0.0),
+        "word_count": len(words),
+        "segment_count": len(segments),
+        "tokens": TOKEN_SEPARATOR.join(token_index).encode("utf-8"),
+        "word_start": word_start.tobytes(),
+        "word_end": word_end.tobytes(),
+        "word_token": word_token.tobytes(),
+        "segment_start": segment_start.tobytes(),
+        "segment_end": segment_end.tobytes(),
+        "segment_word_offset": segment_word_offset.tobytes(),
+    }
+
+
+class TranscriptTimings:
+    """
+    Read-only view over a stored TranscriptTimingsCollection (zero-copy arrays).
+    """
+    def __init__(self, doc: TranscriptTimingsCollection):
+        self.doc = doc
+        self.tokens = doc.tokens.decode("utf-8").split(TOKEN_SEPARATOR) if doc.tokens else []
+        self.word_start = np.frombuffer(doc.word_start, dtype=np.float32)
+        self.word_end = np.frombuffer(doc.word_end, dtype=np.float32)
+        self.word_token = np.frombuffer(doc.word_token, dtype=np.int32)
+        self.segment_start = np.frombuffer(doc.segment_start, dtype=np.float32)
+        self.segment_end = np.frombuffer(doc.segment_end, dtype=np.float32)
+        self.segment_word_offset = np.frombuffer(doc.segment_word_offset, dtype=np.int32)
+        # Segments may overlap (merged chunks), so their ends aren't sorted: binary search
+        # the running maximum instead (any segment ending after `start` is at or after lo)
+        self._segment_end_max = np.maximum.accumulate(self.segment_end) if len(self.segment_end) else self.segment_end
+
+    def _word_range(self, start: float, end: float) -> tuple[int, int]:
+        # Words overlapping [start, end]: ends after `start` and starts before `end`
+        lo = int(np.searchsorted(self.word_end, start, side="left"))
+        hi = int(np.searchsorted(self.word_start, end, side="right"))
+        return lo, max(lo, hi)
+
+    def _text(self, lo: int, hi: int) -> str:
+        return " ".join(self.tokens[i] for i in self.word_token[lo:hi])
+
+    def words_between(self, start: float, end: float) -> list[dict]:
+        lo, hi = self._word_range(start, end)
+        return [
+            {
+                "word": self.tokens[self.word_token[i]],
+                "start": float(self.word_start[i]),
+                "end": float(self.word_end[i]),
+            }
+            for i in range(lo, hi)
+        ]
+
+    def text_between(self, start: float, end: float) -> str:
+        return self._text(*self._word_range(start, end))
+
+    def segments_between(self, start: float, end: float) -> list[dict]:
+        lo = int(np.searchsorted(self._segment_end_max, start, side="left"))
+        hi = int(np.searchsorted(self.segment_start, end, side="right"))
+        segments = []
+        for i in range(lo, max(lo, hi)):
+            if self.segment_end[i] < start:
+                # Before the range, but inside the lookup window because of an earlier long segment
+                continue
+            first = int(self.segment_word_offset[i])
+            last = int(self.segment_word_offset[i + 1]) if i + 1 < len(self.segment_word_offset) else len(self.word_start)
+            segments.append({
+                "id": i,
+                "start": float(self.segment_start[i]),
+                "end": float(self.segment_end[i]),
+                "text": self._text(first, last),
+            })
+        return segments
+
+
+def parse_timestamp(value: str) -> float:
+    """
+    Parses '750', '750.5', '12:30' or '01:12:30' into seconds.
+    Raises ValueError for anything else, including 'inf', 'nan' and negative times.
+    """
+    seconds = 0.0
+    for part in value.strip().split(":"):
+        number = float(part)
+        if not math.isfinite(number) or number < 0:
+            raise ValueError(f"Invalid timestamp: {value}")
+        seconds = seconds * 60 + number
+    return seconds
+
+
+async def save_timings(
+    result: dict,
+    recording_id=None,
+    meeting_id=None,
+    org_id: Optional[str] = None,
+    created_by: Optional[str] = None
+) -> TranscriptTimingsCollection:
+    """
+    Stores (or replaces) the timings for a recording / meeting.
+    """
+    fields = pack_timings(result)
+    doc = None
+    if recording_id:
+        doc = await TranscriptTimingsCollection.find_one(TranscriptTimingsCollection.recording_id == recording_id)
+    if doc is None:
+        doc = TranscriptTimingsCollection(recording_id=recording_id)
+
+    for key, value in fields.items():
+        setattr(doc, key, value)
+    doc.meeting_id = meeting_id or doc.meeting_id
+    doc.org_id = str(org_id) if org_id else doc.org_id
+    doc.created_by = str(created_by) if created_by else doc.created_by
+    await doc.save()
+    return doc
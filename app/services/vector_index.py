@@ -0,0 +1,234 @@
+"""
+In-process vector index over meeting passages (one per org, see semantic_search).
+
+Vectors are unit-length float16 rows in one growable matrix; a dot product is
+the cosine similarity. Rows belong to a meeting and are added / removed per
+meeting (re-adding a meeting replaces its rows).
+
+- Small indexes are searched exactly (blocked float32 matmul over every row).
+- From `ivf_min_vectors` live rows on, an IVF layer is trained: spherical
+  k-means centroids over a sample, every row assigned to its nearest centroid,
+  and a query only scans the rows of its `nprobe` nearest lists. New rows are
+  assigned on add; the centroids are retrained once the index has doubled.
+
+Removed rows are tombstoned and compacted away once they make up a quarter of
+the matrix. Thread-safe: mutations and searches hold the same lock.
+"""
+import math
+import threading
+from typing import Optional
+
+import numpy as np
+
+# Rows converted to float32 at a time when scanning
+SCAN_BLOCK_ROWS = 8192
+# Candidate rows kept per requested meeting before grouping rows by meeting
+ROWS_PER_MEETING = 8
+# k-means training
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+COMPACT_DEAD_RATIO = 0.25
+
+
+class VectorIndex:
+    """
+    Per-meeting rows of unit vectors with exact or IVF top-k search.
+    """
+    def __init__(self, dim: int, ivf_min_vectors: int = 20000, nprobe: int = 32, seed: int = 0):
+        self.dim = dim
+        self.ivf_min_vectors = ivf_min_vectors
+        self.nprobe = nprobe
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.RLock()
+
+        self._vectors = np.zeros((0, dim), dtype=np.float16)
+        self._owners = np.zeros(0, dtype=np.int32)      # row -> meeting slot
+        self._positions = np.zeros(0, dtype=np.int32)   # row -> passage index in the meeting
+        self._alive = np.zeros(0, dtype=bool)
+        self._lists = np.zeros(0, dtype=np.int32)       # row -> IVF list (when trained)
+        self._size = 0
+        self._dead = 0
+
+        self._meeting_ids: list[str] = []
+        self._slots: dict[str, int] = {}
+        self._rows: dict[str, np.ndarray] = {}
+
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_on = 0
+
+    # --- Introspection ---
+
+    def __len__(self) -> int:
+        return self._size - self._dead
+
+    def __contains__(self, meeting_id: str) -> bool:
+        return meeting_id in self._rows
+
+    @property
+    def is_ivf(self) -> bool:
+        return self._centroids is not None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "meetings": len(self._rows),
+                "vectors": len(self),
+                "mode": "ivf" if self.is_ivf else "exact",
+                "lists": 0 if self._centroids is None else len(self._centroids),
+                "memory_kib": round(self._vectors.nbytes / 1024, 1),
+            }
+
+    # --- Mutations ---
+
+    def add(self, meeting_id: str, vectors: np.ndarray) -> None:
+        """
+        Adds (or replaces) the passage vectors of a meeting; row i is passage i.
+        """
+        vectors = np.asarray(vectors, dtype=np.float16).reshape(-1, self.dim)
+        with self._lock:
+            self.remove(meeting_id)
+            if not len(vectors):
+                return
+            slot = self._slots.get(meeting_id)
+            if slot is None:
+                slot = len(self._meeting_ids)
+                self._meeting_ids.append(meeting_id)
+                self._slots[meeting_id] = slot
+
+            start, end = self._size, self._size + len(vectors)
+            self._reserve(end)
+            self._vectors[start:end] = vectors
+            self._owners[start:end] = slot
+            self._positions[start:end] = np.arange(len(vectors), dtype=np.int32)
+            self._alive[start:end] = True
+            self._size = end
+            self._rows[meeting_id] = np.arange(start, end)
+
+            if self._centroids is not None:
+                self._lists[start:end] = self._assign(self._vectors[start:end])
+            if len(self) >= self.ivf_min_vectors and len(self) >= 2 * self._trained_on:
+                self._train()
+
+    def remove(self, meeting_id: str) -> bool:
+        with self._lock:
+            rows = self._rows.pop(meeting_id, None)
+            if rows is None:
+                return False
+            self._alive[rows] = False
+            self._dead += len(rows)
+            if self._dead > COMPACT_DEAD_RATIO * self._size:
+                self._compact()
+            return True
+
+    def _reserve(self, rows: int) -> None:
+        capacity = len(self._vectors)
+        if rows <= capacity:
+            return
+        # Amortised growth: adds stay O(rows added), not O(index size)
+        capacity = max(rows, 2 * capacity, 1024)
+
+        def grow(array: np.ndarray) -> np.ndarray:
+            grown = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            return grown
+
+        self._vectors = grow(self._vectors)
+        self._owners = grow(self._owners)
+        self._positions = grow(self._positions)
+        self._alive = grow(self._alive)
+        self._lists = grow(self._lists)
+
+    def _compact(self) -> None:
+        keep = np.flatnonzero(self._alive[:self._size])
+        self._vectors = self._vectors[keep].copy()
+        self._owners = self._owners[keep].copy()
+        self._positions = self._positions[keep].copy()
+        self._lists = self._lists[keep].copy()
+        self._alive = np.ones(len(keep), dtype=bool)
+        self._size, self._dead = len(keep), 0
+
+        # Renumber meeting slots and rows
+        meeting_ids = [self._meeting_ids[slot] for slot in np.unique(self._owners)]
+        remap = np.zeros(len(self._meeting_ids), dtype=np.int32)
+        for new_slot, meeting_id in enumerate(meeting_ids):
+            remap[self._slots[meeting_id]] = new_slot
+        self._owners = remap[self._owners]
+        self._meeting_ids = meeting_ids
+        self._slots = {meeting_id: slot for slot, meeting_id in enumerate(meeting_ids)}
+        order = np.argsort(self._owners, kind="stable")
+        bounds = np.searchsorted(self._owners[order], np.arange(len(meeting_ids) + 1))
+        self._rows = {meeting_id: order[bounds[slot]:bounds[slot + 1]] for slot, meeting_id in enumerate(meeting_ids)}
+
+        if len(self) < self.ivf_min_vectors // 2:
+            self._centroids, self._trained_on = None, 0
+
+    # --- IVF ---
+
+    def _train(self) -> None:
+        live = np.flatnonzero(self._alive[:self._size])
+        n_lists = max(1, min(int(4 * math.sqrt(len(live))), len(live)))
+        sample = self._rng.choice(live, size=min(len(live), n_lists * KMEANS_SAMPLE_PER_LIST), replace=False)
+        points = self._vectors[sample].astype(np.float32)
+
+        centroids = points[self._rng.choice(len(points), size=n_lists, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(points @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, points)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty lists keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        self._centroids = centroids
+        self._trained_on = len(live)
+        self._lists[:self._size] = self._assign(self._vectors[:self._size])
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        lists = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), SCAN_BLOCK_ROWS):
+            block = vectors[start:start + SCAN_BLOCK_ROWS].astype(np.float32)
+            lists[start:start + SCAN_BLOCK_ROWS] = np.argmax(block @ self._centroids.T, axis=1)
+        return lists
+
+    # --- Search ---
+
+    def _candidates(self, query: np.ndarray) -> np.ndarray:
+        live = self._alive[:self._size]
+        if self._centroids is None:
+            return np.flatnonzero(live)
+        nprobe = min(self.nprobe, len(self._centroids))
+        probes = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        return np.flatnonzero(live & np.isin(self._lists[:self._size], probes))
+
+    def search(self, query: np.ndarray, k: int = 10) -> list[tuple[str, float, int]]:
+        """
+        Best `k` meetings for a unit query vector: [(meeting_id, score, passage index)],
+        scored by their best-matching passage, best first.
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        with self._lock:
+            rows = self._candidates(query)
+            if not len(rows):
+                return []
+            scores = np.empty(len(rows), dtype=np.float32)
+            for start in range(0, len(rows), SCAN_BLOCK_ROWS):
+                block = rows[start:start + SCAN_BLOCK_ROWS]
+                scores[start:start + len(block)] = self._vectors[block].astype(np.float32) @ query
+
+            # Top rows first; widen to every candidate if they cover fewer than k meetings
+            top = min(len(rows), k * ROWS_PER_MEETING)
+            for limit in (top, len(rows)):
+                best = np.argpartition(-scores, limit - 1)[:limit] if limit < len(rows) else np.arange(len(rows))
+                best = best[np.argsort(-scores[best], kind="stable")]
+                hits, seen = [], set()
+                for i in best:
+                    slot = self._owners[rows[i]]
+                    if slot in seen:
+                        continue
+                    seen.add(slot)
+                    hits.append((self._meeting_ids[slot], float(scores[i]), int(self._positions[rows[i]])))
+                    if len(hits) == k:
+                        return hits
+                if limit == len(rows):
+                    break
+            return hits
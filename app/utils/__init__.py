@@ -1,4 +1,4 @@
 """
     Initialize utils
 """
-from app.utils.audio import convert_to_opus, convert
+from app.utils.audio import convert_to_opus, convert, decode_to_pcm
@@ -3,6 +3,7 @@ Audio utility functions for transcoding and processing.
 """
 import io
 import av
+import numpy as np
 from fastapi import UploadFile
 import soundfile as sf
 import librosa
@@ -62,4 +63,33 @@ def convert_to_opus(input_data: bytes) -> bytes:
         output_container.mux(packet)
 
     output_container.close()
-    return output_buffer.getvalue()
\ No newline at end of file
+    return output_buffer.getvalue()
+
+
+def decode_to_pcm(input_data: bytes, rate: int = 16000) -> np.ndarray:
+    """
+    Decodes audio bytes (ogg, webm, mp4a, wav...) to mono float32 PCM at `rate` Hz.
+    Used by the local Whisper backend, which expects raw 16kHz samples.
+    """
+    input_container = av.open(io.BytesIO(input_data))
+    input_stream = input_container.streams.audio[0]
+
+    resampler = av.AudioResampler(
+        format=av.AudioFormat('flt'),
+        layout='mono',
+        rate=rate,
+    )
+
+    chunks = []
+    for frame in input_container.decode(input_stream):
+        for resampled_frame in resampler.resample(frame):
+            chunks.append(resampled_frame.to_ndarray().reshape(-1))
+
+    # Flush
+    for resampled_frame in resampler.resample(None):
+        chunks.append(resampled_frame.to_ndarray().reshape(-1))
+
+    input_container.close()
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks).astype(np.float32, copy=False)
@@ -0,0 +1,45 @@
+"""
+Cancel long-running request work when the HTTP client goes away.
+"""
+import asyncio
+from typing import Awaitable, Optional, TypeVar
+
+from fastapi import HTTPException, Request
+
+T = TypeVar("T")
+
+# Non-standard "Client Closed Request" status (nginx convention)
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def cancel_on_disconnect(request: Optional[Request], work: Awaitable[T], poll_interval: float = 1.0) -> T:
+    """
+    Awaits `work`, cancelling it as soon as the client disconnects.
+    Without a request (e.g. background worker) it simply awaits the work.
+    """
+    task = asyncio.ensure_future(work)
+    if request is None:
+        return await task
+
+    disconnected = False
+
+    async def watch():
+        nonlocal disconnected
+        while not task.done():
+            if await request.is_disconnected():
+                disconnected = True
+                task.cancel()
+                return
+            await asyncio.sleep(poll_interval)
+
+    watcher = asyncio.create_task(watch())
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if disconnected:
+            raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client disconnected") from None
+        raise
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
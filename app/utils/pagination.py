@@ -0,0 +1,65 @@
+"""
+Opaque keyset cursors for list endpoints.
+
+Lists are sorted by (<date field> desc, _id desc). A cursor encodes the sort key
+of the last row of a page; the next page starts strictly after it, so every page
+is an index range scan instead of skipping over all previous rows.
+"""
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: datetime, doc_id) -> str:
+    payload = json.dumps([sort_value.isoformat(), str(doc_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, doc_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(sort_value), ObjectId(doc_id)
+    except (ValueError, TypeError, InvalidId, binascii.Error, UnicodeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def keyset_pipeline(query: dict, sort_field: str, cursor: Optional[str], skip: int, limit: int) -> list[dict]:
+    """
+    $match / $sort / $skip / $limit stages for one page. With a cursor, `skip` is ignored.
+    One extra row is fetched to know whether there is a next page (see page_with_cursor).
+    """
+    match = dict(query)
+    if cursor:
+        sort_value, doc_id = decode_cursor(cursor)
+        # The $lte gives the planner a single index range; $or settles ties on _id
+        match[sort_field] = {"$lte": sort_value}
+        match["$or"] = [
+            {sort_field: {"$lt": sort_value}},
+            {sort_field: sort_value, "_id": {"$lt": doc_id}},
+        ]
+    stages = [{"$match": match}, {"$sort": {sort_field: -1, "_id": -1}}]
+    if skip and not cursor:
+        stages.append({"$skip": skip})
+    stages.append({"$limit": limit + 1})
+    return stages
+
+
+def page_with_cursor(rows: list[dict], sort_field: str, limit: int) -> tuple[list[dict], Optional[str]]:
+    """
+    Trims the look-ahead row and returns (page, next_cursor or None).
+    """
+    if len(rows) <= limit or limit < 1:
+        return rows[:max(limit, 0)], None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last[sort_field], last["_id"])
@@ -0,0 +1,60 @@
+"""
+explain() helpers: check that a query is served by an index.
+
+Used by verification/verify_indexes.py and the tests. Works on the raw output
+of the `explain` command for find / count and of an aggregate with
+explain=True (where the query plan sits in the `$cursor` stage).
+"""
+
+
+def plan_stages(plan) -> list[dict]:
+    """
+    Every {"stage": ...} node of an explain() output (find or aggregate).
+    """
+    found = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            found.append(plan)
+        for value in plan.values():
+            found.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            found.extend(plan_stages(value))
+    return found
+
+
+def winning_plan(explain: dict):
+    """
+    The winning plan(s) of an explain() output: rejected plans may contain anything.
+    """
+    if "queryPlanner" in explain:
+        return explain["queryPlanner"].get("winningPlan")
+    return [winning_plan(stage["$cursor"]) for stage in explain.get("stages", []) if "$cursor" in stage] or explain
+
+
+def assert_uses_index(explain: dict, label: str, allow_sort: bool = True) -> str:
+    """
+    Raises AssertionError unless the winning plan scans an index (no COLLSCAN),
+    and, with allow_sort=False, sorts by index order (no blocking SORT stage).
+    Returns the index name(s) used.
+    """
+    stages = plan_stages(winning_plan(explain))
+    names = {s["stage"] for s in stages}
+    assert "COLLSCAN" not in names, f"{label}: collection scan ({sorted(names)})"
+    assert any("IXSCAN" in n or n in ("IDHACK", "EXPRESS_IXSCAN", "EXPRESS_CLUSTERED_IXSCAN") for n in names), \
+        f"{label}: no index scan ({sorted(names)})"
+    if not allow_sort:
+        assert "SORT" not in names, f"{label}: in-memory sort ({sorted(names)})"
+    return ", ".join(sorted({s["indexName"] for s in stages if "indexName" in s})) or "_id"
+
+
+async def explain_find(db, collection: str, query: dict) -> dict:
+    return await db.command("explain", {"find": collection, "filter": query, "limit": 1}, verbosity="queryPlanner")
+
+
+async def explain_count(db, collection: str, query: dict) -> dict:
+    return await db.command("explain", {"count": collection, "query": query}, verbosity="queryPlanner")
+
+
+async def explain_aggregate(db, collection: str, pipeline: list[dict]) -> dict:
+    return await db.command("aggregate", collection, pipeline=pipeline, explain=True)
@@ -0,0 +1,61 @@
+"""
+Worker entry point: processes queued transcription / MoM jobs.
+
+Usage:
+    python -m app.worker --concurrency 4
+"""
+import signal
+import asyncio
+import logging
+import argparse
+
+from app.env_settings import env
+from app.models.database.connection import init_db
+from app.services.job_queue import JobQueue, JobWorker
+from app.services.tokens import get_tokenizer
+from app.controllers.jobs_ctrl import JOB_HANDLERS, JOB_DEAD_HOOKS
+
+
+async def main(concurrency: int, kinds: list[str]) -> None:
+    await init_db()
+    print("✅ Worker: Connected to Database")
+    await asyncio.to_thread(get_tokenizer)
+
+    handlers = {kind: JOB_HANDLERS[kind] for kind in kinds} if kinds else JOB_HANDLERS
+    worker = JobWorker(JobQueue(), handlers, concurrency=concurrency, on_dead=JOB_DEAD_HOOKS)
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # Windows: fall back to KeyboardInterrupt
+            pass
+
+    await worker.run(stop_event)
+    print("🛑 Worker: Shut down")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Eazzmeetings background worker")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(env.WORKER_CONCURRENCY or 2),
+        help="Number of jobs processed concurrently by this worker"
+    )
+    parser.add_argument(
+        "--kinds",
+        nargs="*",
+        default=[],
+        choices=list(JOB_HANDLERS),
+        help="Only process these job kinds (default: all)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(main(args.concurrency, args.kinds))
+    except KeyboardInterrupt:
+        pass
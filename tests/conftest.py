@@ -0,0 +1,13 @@
+"""
+Shared test setup: no network, no model downloads.
+"""
+import os
+import sys
+
+# Set before app.env_settings is imported (it reads the environment once)
+os.environ.setdefault("TOKENIZER_NAME", "none")
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("FAKE_PROVIDER_URL", "inprocess")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
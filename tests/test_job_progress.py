@@ -0,0 +1,30 @@
+import asyncio
+
+from app.services.job_progress import JobProgress, current_job, reserve_job_meeting_id
+
+
+def test_no_reservation_outside_a_job():
+    assert asyncio.run(reserve_job_meeting_id()) is None
+
+
+def test_meeting_id_is_recorded_once_and_reused():
+    writes = []
+
+    async def write(update):
+        writes.append(update)
+
+    async def run(progress):
+        token = current_job.set(progress)
+        try:
+            return await reserve_job_meeting_id(), await reserve_job_meeting_id()
+        finally:
+            current_job.reset(token)
+
+    first, again = asyncio.run(run(JobProgress(write)))
+    assert first == again
+    assert writes == [{"meeting_id": str(first)}]
+
+    # A retry starts from the id stored on the job and writes nothing new
+    retried, _ = asyncio.run(run(JobProgress(write, meeting_id=str(first))))
+    assert retried == first
+    assert len(writes) == 1
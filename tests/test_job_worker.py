@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from beanie import PydanticObjectId
+
+from app.controllers.jobs_ctrl import JOB_DEAD_HOOKS, MOM_FROM_AUDIO
+from app.models.database.jobs_collection import JobCollection, JobStatus
+from app.services.job_queue import JobQueue, JobWorker, PermanentJobError
+
+
+class MemoryQueue(JobQueue):
+    """
+    JobQueue whose state transitions are recorded instead of written to Mongo.
+    """
+    def __init__(self):
+        super().__init__()
+        self.statuses = []
+
+    async def update_progress(self, job, worker_id, update):
+        pass
+
+    async def extend_lease(self, job, worker_id):
+        return True
+
+    async def complete(self, job, worker_id, result):
+        self.statuses.append(JobStatus.SUCCEEDED)
+
+    async def fail(self, job, worker_id, error, permanent=False):
+        status = JobStatus.DEAD if permanent or job.attempts >= job.max_attempts else JobStatus.QUEUED
+        self.statuses.append(status)
+        return status
+
+
+def run_job(tmp_path, error: Exception, attempts: int = 1):
+    upload = tmp_path / "upload.ogg"
+    upload.write_bytes(b"audio")
+    job = JobCollection.model_construct(
+        id=PydanticObjectId(), kind=MOM_FROM_AUDIO, payload={"file_path": str(upload)},
+        attempts=attempts, max_attempts=3, meeting_id=None, last_error=None,
+    )
+
+    async def handler(job):
+        raise error
+
+    queue = MemoryQueue()
+    worker = JobWorker(queue, {MOM_FROM_AUDIO: handler}, concurrency=1, on_dead=JOB_DEAD_HOOKS)
+    asyncio.run(worker.process(job))
+    return queue.statuses, upload.exists()
+
+
+def test_upload_is_kept_for_a_retry(tmp_path):
+    assert run_job(tmp_path, RuntimeError("timeout")) == ([JobStatus.QUEUED], True)
+
+
+@pytest.mark.parametrize("error, attempts", [
+    (PermanentJobError("bad input"), 1),
+    (RuntimeError("timeout"), 3),
+])
+def test_upload_is_deleted_when_the_job_is_dead(tmp_path, error, attempts):
+    assert run_job(tmp_path, error, attempts) == ([JobStatus.DEAD], False)
+
+
+def test_upload_is_deleted_when_the_last_lease_expired(tmp_path):
+    # attempts > max_attempts: the worker running the final attempt crashed
+    assert run_job(tmp_path, RuntimeError("never called"), attempts=4) == ([JobStatus.DEAD], False)
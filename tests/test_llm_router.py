@@ -0,0 +1,106 @@
+import asyncio
+from typing import Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.services.llm_router import LLMRouter
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FakeBackend(BaseChatModel):
+    reply: str
+    delay: float = 0.0
+    error_status: Optional[int] = None
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _result(self) -> ChatResult:
+        self.calls += 1
+        if self.error_status:
+            raise ProviderError(self.error_status)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return self._result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.delay)
+        return self._result()
+
+
+def router(*backends, **kwargs) -> LLMRouter:
+    return LLMRouter(backends=list(backends), backend_names=[b.reply for b in backends], **kwargs)
+
+
+def test_fails_over_on_429_and_cools_the_backend_down():
+    primary, secondary = FakeBackend(reply="primary", error_status=429), FakeBackend(reply="secondary")
+    llm = router(primary, secondary, cooldown_seconds=60)
+
+    assert llm.invoke("hi").content == "secondary"
+    assert primary.calls == 1
+    # The failed backend is now ranked last
+    assert llm.ranked() == [1, 0]
+    assert llm.stats()[0]["cooling_down"]
+    assert llm.invoke("hi").content == "secondary"
+    assert primary.calls == 1
+
+
+def test_client_errors_do_not_fail_over():
+    primary, secondary = FakeBackend(reply="primary", error_status=400), FakeBackend(reply="secondary")
+    with pytest.raises(ProviderError):
+        router(primary, secondary).invoke("hi")
+    assert secondary.calls == 0
+
+
+def test_all_backends_failing_raises_the_last_error():
+    llm = router(FakeBackend(reply="a", error_status=503), FakeBackend(reply="b", error_status=429))
+    with pytest.raises(ProviderError) as e:
+        llm.invoke("hi")
+    assert e.value.status_code == 429
+
+
+def test_routes_to_the_lowest_p50():
+    slow, fast = FakeBackend(reply="slow"), FakeBackend(reply="fast")
+    llm = router(slow, fast)
+    for _ in range(5):
+        llm._stats[0].record_success(2.0)
+        llm._stats[1].record_success(0.5)
+    assert llm.invoke("hi").content == "fast"
+
+
+def test_slow_primary_is_hedged():
+    slow, fast = FakeBackend(reply="slow", delay=5), FakeBackend(reply="fast")
+    llm = router(slow, fast, hedge_after_seconds=0.05)
+
+    async def run():
+        return await asyncio.wait_for(llm.ainvoke("hi"), timeout=2)
+
+    assert asyncio.run(run()).content == "fast"
+    assert fast.calls == 1
+    # The cancelled primary is neither a success nor an error
+    assert llm.stats()[0]["samples"] == 0
+
+
+def test_async_failover_without_hedging():
+    llm = router(FakeBackend(reply="a", error_status=502), FakeBackend(reply="b"))
+    assert asyncio.run(llm.ainvoke("hi")).content == "b"
+
+
+@pytest.mark.parametrize("backends, names", [
+    ([], []),
+    ([FakeBackend(reply="a")], ["a", "b"]),
+])
+def test_invalid_config_fails_when_built(backends, names):
+    with pytest.raises(ValueError):
+        LLMRouter(backends=backends, backend_names=names)
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+from beanie import PydanticObjectId
+from fastapi import HTTPException
+
+from app.controllers import mom_ctrl
+from app.controllers.meetings_ctrl import MeetingsController
+
+
+def test_scope_prefers_org_then_creator():
+    org, user = PydanticObjectId(), PydanticObjectId()
+    assert MeetingsController.scope({"org_id": str(org), "sub": str(user)}) == {"org_id": org}
+    assert MeetingsController.scope({"sub": str(user)}) == {"created_by": user}
+    assert MeetingsController.scope({}) is None
+
+
+def test_scoped_meeting_filters_by_scope(monkeypatch):
+    queries = []
+
+    async def find_one(query):
+        queries.append(query)
+        return None
+
+    monkeypatch.setattr(mom_ctrl.MeetingCollection, "find_one", find_one)
+    meeting_id, user = PydanticObjectId(), PydanticObjectId()
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(mom_ctrl._scoped_meeting(meeting_id, {"created_by": user}))
+    assert e.value.status_code == 404
+    assert queries == [{"_id": meeting_id, "created_by": user}]
+
+
+def test_scoped_meeting_without_scope_is_not_found(monkeypatch):
+    async def find_one(query):
+        raise AssertionError("must not query without a scope")
+
+    monkeypatch.setattr(mom_ctrl.MeetingCollection, "find_one", find_one)
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(mom_ctrl._scoped_meeting(PydanticObjectId(), None))
+    assert e.value.status_code == 404
@@ -0,0 +1,30 @@
+import asyncio
+import threading
+
+from app.services import mom_service as mom_module
+from app.services.mom_service import MoMService, MomMode
+
+
+def test_auto_mode_counts_tokens_off_the_event_loop(monkeypatch):
+    service = MoMService.__new__(MoMService)
+    service.combined_max_tokens, service.long_transcript_tokens = 100, 1000
+    threads = []
+
+    def count_tokens(text):
+        threads.append(threading.current_thread())
+        return len(text)
+
+    monkeypatch.setattr(mom_module, "count_tokens", count_tokens)
+
+    async def run():
+        return [await service.aselect_mode("x" * n) for n in (50, 500, 5000)], threading.current_thread()
+
+    modes, loop_thread = asyncio.run(run())
+    assert modes == [MomMode.COMBINED, MomMode.GRAPH, MomMode.MAP_REDUCE]
+    assert threads and all(t is not loop_thread for t in threads)
+
+
+def test_explicit_mode_skips_counting(monkeypatch):
+    service = MoMService.__new__(MoMService)
+    monkeypatch.setattr(mom_module, "count_tokens", lambda text: (_ for _ in ()).throw(AssertionError("counted")))
+    assert asyncio.run(service.aselect_mode("text", MomMode.GRAPH)) == MomMode.GRAPH
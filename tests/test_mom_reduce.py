@@ -0,0 +1,90 @@
+from app.schemas import ActionItem, ActionItems, Attendee, Attendees, Decision, Decisions, TopicSummary, TopicSummaries
+from app.services.mom_reduce import merge_sections, normalize, split_windows
+
+
+def sentence(i: int) -> str:
+    # 38 characters: 9 estimated tokens, 10 with the separator
+    return f"Sentence number {i:03d} of the transcript."
+
+
+def sentences_of(window: str) -> list[str]:
+    return [s if s.endswith(".") else s + "." for s in window.split(". ")]
+
+
+def test_short_transcript_is_one_window():
+    text = " ".join(sentence(i) for i in range(3))
+    assert split_windows(text, window_tokens=1000, overlap_tokens=100) == [text]
+
+
+def test_windows_respect_the_budget_and_overlap():
+    sentences = [sentence(i) for i in range(20)]
+    windows = [sentences_of(w) for w in split_windows(" ".join(sentences), window_tokens=50, overlap_tokens=22)]
+
+    assert windows[0] == sentences[:5]
+    assert all(len(window) <= 5 for window in windows)
+    # Each window starts with the last two sentences of the previous one
+    for previous, window in zip(windows, windows[1:]):
+        assert window[:2] == previous[-2:]
+    assert windows[-1][-1] == sentences[-1]
+    assert {s for window in windows for s in window} == set(sentences)
+
+
+def test_oversized_sentence_gets_its_own_window():
+    long_sentence = "word " * 400 + "end."
+    windows = split_windows(f"Short one. {long_sentence.strip()} Short two.", window_tokens=50, overlap_tokens=0)
+    assert windows == ["Short one.", long_sentence.strip(), "Short two."]
+
+
+def test_normalize():
+    assert normalize("  Ship the  NEW build!  ") == "ship the new build"
+    assert normalize(None) == ""
+
+
+def test_merge_sections_deduplicates_across_windows():
+    first = {
+        "attendees": Attendees(attendees=[Attendee(name="Asha Rao")]),
+        "decisions": Decisions(decisions=[
+            Decision(decision_headline="Use Postgres", description="DB choice", stakeholders=["Asha"]),
+        ]),
+        "action_items": ActionItems(action_items=[
+            ActionItem(task_title="Write the RFC", description="Draft", assignees=["Asha"]),
+        ]),
+        "topic_summaries": TopicSummaries(topic_summaries=[
+            TopicSummary(related_topic_title="Storage", description="Compared databases.", key_takeaways=["a", "b"]),
+        ]),
+    }
+    second = {
+        "attendees": Attendees(attendees=[Attendee(name="asha rao", designation="CTO")]),
+        "decisions": Decisions(decisions=[
+            Decision(decision_headline="use postgres.", description="Again", rationale="Team knows it", stakeholders=["asha", "Ben"]),
+        ]),
+        "action_items": ActionItems(action_items=[
+            ActionItem(task_title="Write the RFC!", description="Draft", assignees=["Ben"], due_date="Friday"),
+        ]),
+        "topic_summaries": TopicSummaries(topic_summaries=[
+            TopicSummary(related_topic_title="storage", description="Picked Postgres.", key_takeaways=["B", "c", "d", "e", "f"]),
+        ]),
+        "facts": None,
+    }
+
+    merged = merge_sections([first, second])
+
+    attendees = merged["attendees"].attendees
+    assert [(a.name, a.designation) for a in attendees] == [("Asha Rao", "CTO")]
+
+    [decision] = merged["decisions"].decisions
+    assert decision.decision_headline == "Use Postgres"
+    assert decision.rationale == "Team knows it"
+    assert decision.stakeholders == ["Asha", "Ben"]
+
+    [item] = merged["action_items"].action_items
+    assert item.assignees == ["Asha", "Ben"]
+    assert item.due_date == "Friday"
+
+    [topic] = merged["topic_summaries"].topic_summaries
+    assert topic.description == "Compared databases. Picked Postgres."
+    assert topic.key_takeaways == ["a", "b", "c", "d", "e"]
+
+    assert merged["facts"].facts == []
+    # Inputs are not modified
+    assert first["attendees"].attendees[0].designation is None
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_pipeline, page_with_cursor
+
+
+def rows(n: int) -> list[dict]:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    return [{"_id": ObjectId(), "created_on": now - timedelta(minutes=i)} for i in range(n)]
+
+
+def test_cursor_round_trip():
+    when, doc_id = datetime(2026, 3, 4, 5, 6, 7, 890), ObjectId()
+    assert decode_cursor(encode_cursor(when, doc_id)) == (when, doc_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "bm90IGpzb24", encode_cursor(datetime.now(), ObjectId())[:-4]])
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor)
+    assert e.value.status_code == 400
+
+
+def test_first_page_fetches_one_extra_row():
+    stages = keyset_pipeline({"org_id": 1}, "created_on", None, 10, 5)
+    assert stages == [
+        {"$match": {"org_id": 1}},
+        {"$sort": {"created_on": -1, "_id": -1}},
+        {"$skip": 10},
+        {"$limit": 6},
+    ]
+
+
+def test_cursor_page_ignores_skip_and_breaks_ties_on_id():
+    when, doc_id = datetime(2026, 1, 1), ObjectId()
+    match, sort, limit = keyset_pipeline({"org_id": 1}, "created_on", encode_cursor(when, doc_id), 10, 5)
+    assert match["$match"]["created_on"] == {"$lte": when}
+    assert match["$match"]["$or"] == [
+        {"created_on": {"$lt": when}},
+        {"created_on": when, "_id": {"$lt": doc_id}},
+    ]
+    assert sort == {"$sort": {"created_on": -1, "_id": -1}}
+    assert limit == {"$limit": 6}
+
+
+def test_page_with_cursor_trims_look_ahead_row():
+    data = rows(6)
+    page, cursor = page_with_cursor(data, "created_on", 5)
+    assert page == data[:5]
+    assert decode_cursor(cursor) == (data[4]["created_on"], data[4]["_id"])
+
+
+def test_last_page_has_no_cursor():
+    data = rows(3)
+    assert page_with_cursor(data, "created_on", 5) == (data, None)
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_empty_page_has_no_cursor(limit):
+    assert page_with_cursor(rows(3), "created_on", limit) == ([], None)
@@ -0,0 +1,92 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.env_settings import env
+from app.utils.query_plans import assert_uses_index, plan_stages
+
+COLLSCAN = {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN", "direction": "forward"}, "rejectedPlans": []}}
+IXSCAN = {"queryPlanner": {
+    "winningPlan": {"stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "email_1"}}},
+    # Rejected plans are ignored
+    "rejectedPlans": [{"stage": "COLLSCAN"}],
+}}
+SORTED = {"queryPlanner": {"winningPlan": {
+    "stage": "SORT",
+    "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "org_id_1"}},
+}}}
+# Slot-based engine: the classic plan is nested under queryPlan
+SBE = {"queryPlanner": {"winningPlan": {
+    "queryPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "org_id_1_created_on_-1"}},
+    "slotBasedPlan": {"slots": "...", "stages": "..."},
+}}}
+
+
+def aggregate(explain: dict) -> dict:
+    return {"stages": [{"$cursor": explain}, {"$project": {"transcription": 0}}]}
+
+
+def test_plan_stages_walks_nested_stages():
+    assert [s["stage"] for s in plan_stages(IXSCAN["queryPlanner"]["winningPlan"])] == ["LIMIT", "FETCH", "IXSCAN"]
+
+
+def test_index_scan_passes():
+    assert assert_uses_index(IXSCAN, "login") == "email_1"
+    assert assert_uses_index(SBE, "page", allow_sort=False) == "org_id_1_created_on_-1"
+    assert assert_uses_index({"queryPlanner": {"winningPlan": {"stage": "IDHACK"}}}, "by id") == "_id"
+
+
+def test_collection_scan_fails():
+    with pytest.raises(AssertionError, match="collection scan"):
+        assert_uses_index(COLLSCAN, "login")
+
+
+def test_in_memory_sort_fails_only_when_not_allowed():
+    assert assert_uses_index(SORTED, "count") == "org_id_1"
+    with pytest.raises(AssertionError, match="in-memory sort"):
+        assert_uses_index(SORTED, "page", allow_sort=False)
+
+
+def test_aggregate_cursor_stage():
+    assert assert_uses_index(aggregate(IXSCAN), "page") == "email_1"
+    with pytest.raises(AssertionError, match="collection scan"):
+        assert_uses_index(aggregate(COLLSCAN), "page")
+
+
+def test_plan_without_index_scan_fails():
+    with pytest.raises(AssertionError, match="no index scan"):
+        assert_uses_index({"queryPlanner": {"winningPlan": {"stage": "EOF"}}}, "empty")
+
+
+def _mongodb_url():
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+
+    url = env.MONGODB_URL or "mongodb://localhost:27017"
+    try:
+        with MongoClient(url, serverSelectionTimeoutMS=500) as client:
+            client.admin.command("ping")
+    except PyMongoError:
+        return None
+    return url
+
+
+def test_controller_queries_use_indexes():
+    url = _mongodb_url()
+    if url is None:
+        pytest.skip("MongoDB is not reachable")
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from verification.verify_indexes import check_indexes
+
+    database = f"eazzmeetings_test_{uuid.uuid4().hex[:8]}"
+
+    async def run():
+        client = AsyncIOMotorClient(url)
+        try:
+            return await check_indexes(client[database])
+        finally:
+            await client.drop_database(database)
+
+    failures = [detail for _, ok, detail in asyncio.run(run()) if not ok]
+    assert not failures
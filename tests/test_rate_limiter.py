@@ -0,0 +1,92 @@
+import pytest
+
+from app.services import rate_limiter
+from app.services.rate_limiter import ModelLimits, RateLimiter, call_with_limits, retry_after_seconds
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+
+def test_concurrency_halves_on_429_and_grows_back():
+    limiter = RateLimiter("test", ModelLimits(rpm=600, concurrency=8))
+    limiter.on_rate_limited(0)
+    assert limiter._concurrency == 4
+    limiter.on_rate_limited(0)
+    limiter.on_rate_limited(0)
+    limiter.on_rate_limited(0)
+    assert limiter._concurrency == 1  # never below one slot
+
+    for _ in range(200):
+        limiter.on_success()
+    assert limiter._concurrency == 8  # capped at the configured limit
+
+
+def test_slots_are_bounded_by_the_adaptive_limit():
+    limiter = RateLimiter("test", ModelLimits(rpm=600, concurrency=2))
+    assert limiter._try_acquire(0) == 0
+    assert limiter._try_acquire(0) == 0
+    assert limiter._try_acquire(0) > 0
+    limiter.release()
+    assert limiter._try_acquire(0) == 0
+
+
+def test_429_pauses_the_model():
+    limiter = RateLimiter("test", ModelLimits(rpm=600))
+    limiter.on_rate_limited(5)
+    assert limiter._try_acquire(0) == pytest.approx(5, abs=0.1)
+
+
+def test_token_bucket_waits_and_reconciles_usage():
+    limiter = RateLimiter("test", ModelLimits(rpm=600, tpm=1000))
+    assert limiter._try_acquire(800) == 0
+    # 200 tokens left: the next 800 must wait for the refill
+    assert limiter._try_acquire(800) > 0
+    # The first call only used 100 of its 800 tokens
+    limiter.release(reserved=800, used=100)
+    assert limiter._tokens == pytest.approx(900, abs=1)
+
+
+def test_retry_after_header():
+    assert retry_after_seconds(ProviderError(429, {"retry-after": "2.5"})) == 2.5
+    assert retry_after_seconds(ProviderError(429, {"retry-after": "soon"})) is None
+    assert retry_after_seconds(ProviderError(429)) is None
+
+
+def test_call_retries_429_then_gives_up(monkeypatch):
+    monkeypatch.setattr(rate_limiter.time, "sleep", lambda seconds: None)
+    limiter = RateLimiter("test", ModelLimits(rpm=6000, concurrency=4))
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ProviderError(429, {"retry-after": "0"})
+        return "ok"
+
+    assert call_with_limits(limiter, 0, flaky, max_retries=5) == "ok"
+    assert len(calls) == 3
+    assert limiter._in_flight == 0
+
+    def always_limited():
+        raise ProviderError(429, {"retry-after": "0"})
+
+    with pytest.raises(ProviderError):
+        call_with_limits(limiter, 0, always_limited, max_retries=0)
+    assert limiter._in_flight == 0
+
+
+def test_client_errors_are_not_retried():
+    limiter = RateLimiter("test", ModelLimits(rpm=6000))
+    calls = []
+
+    def bad_request():
+        calls.append(1)
+        raise ProviderError(400)
+
+    with pytest.raises(ProviderError):
+        call_with_limits(limiter, 0, bad_request)
+    assert len(calls) == 1
@@ -0,0 +1,19 @@
+from app.services import tokens
+
+
+def test_count_tokens_falls_back_to_estimate():
+    assert tokens.count_tokens("a" * 40) == 10
+
+
+def test_count_cache_keeps_digests_not_texts():
+    text = "word " * 1000
+    tokens.count_tokens(text)
+    assert all(isinstance(key, bytes) and len(key) == 16 for key in tokens._counts)
+    assert text not in tokens._counts
+
+
+def test_count_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(tokens, "COUNT_CACHE_SIZE", 3)
+    for i in range(10):
+        tokens.count_tokens(f"text {i}")
+    assert len(tokens._counts) <= 3
@@ -0,0 +1,59 @@
+import pytest
+
+from app.services.transcript_preprocess import preprocess_transcript
+
+
+def clean(text: str) -> str:
+    return preprocess_transcript(text)[0]
+
+
+@pytest.mark.parametrize("text", [
+    "Server at 10.0.0.0 and 192.168.1.1",
+    "Revenue is 5, 5 and 5 percent.",
+    "the mmr score is 10 10.",
+    "It had had an effect.",
+    "I said that that was fine.",
+    "Version 3.5 shipped.",
+    "Yes. Yes. We agreed.",
+    "Cut it to 5 mm wide.",
+    "Bye bye.",
+])
+def test_content_is_kept(text):
+    assert clean(text) == text
+
+
+def test_stutters_are_collapsed():
+    text, stats = preprocess_transcript("I think I think we should go to to the office.")
+    assert text == "I think we should go to the office."
+    assert stats.repetitions_collapsed == 2
+
+
+def test_tripled_grammatical_double_is_collapsed():
+    assert clean("that that that") == "that"
+
+
+def test_fillers_are_removed():
+    text, stats = preprocess_transcript("So, um, we uh ship on Friday.")
+    assert text == "So, we ship on Friday."
+    assert stats.fillers_removed == 2
+
+
+def test_filler_before_closing_punctuation_leaves_no_comma():
+    assert clean("The latency is 3 ms, hmm.") == "The latency is 3 ms."
+    assert clean("Mm, we agreed, mhm, hmm!") == "Mm, we agreed!"
+
+
+def test_sentence_loop_is_dropped():
+    text, stats = preprocess_transcript("We ship Friday. Thank you. Thank you. Thank you.")
+    assert text == "We ship Friday. Thank you."
+    assert stats.loop_sentences_dropped == 2
+
+
+def test_multi_sentence_loop_needs_three_repeats():
+    twice = "Okay then. See you soon. Okay then. See you soon."
+    assert clean(twice) == twice
+    assert clean(twice + " Okay then. See you soon.") == "Okay then. See you soon."
+
+
+def test_loop_next_to_numbers_keeps_the_numbers():
+    assert clean("Version 3.5 shipped. Thank you. Thank you.") == "Version 3.5 shipped. Thank you."
@@ -0,0 +1,50 @@
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.transcript_timings import TranscriptTimings, pack_timings, parse_timestamp
+
+
+def timings(result: dict) -> TranscriptTimings:
+    return TranscriptTimings(SimpleNamespace(**pack_timings(result)))
+
+
+def word(text: str, start: float, end: float) -> dict:
+    return {"word": text, "start": start, "end": end}
+
+
+def test_words_and_text_between():
+    t = timings({"words": [word("hello", 0, 1), word("big", 1, 2), word("world", 2, 3)], "segments": []})
+    assert t.text_between(1.5, 2.5) == "big world"
+    assert [w["word"] for w in t.words_between(0, 0.5)] == ["hello"]
+
+
+def test_overlapping_segments_are_not_dropped():
+    # A long first segment (merged chunks) overlaps the next ones, so segment ends aren't sorted
+    words = [word(f"w{i}", i, i + 1) for i in range(10)]
+    segments = [
+        {"start": 0.0, "end": 9.0},
+        {"start": 1.0, "end": 2.0},
+        {"start": 5.0, "end": 6.0},
+        {"start": 7.0, "end": 8.0},
+    ]
+    t = timings({"words": words, "segments": segments})
+    found = [(s["start"], s["end"]) for s in t.segments_between(5.5, 7.5)]
+    assert found == [(0.0, 9.0), (5.0, 6.0), (7.0, 8.0)]
+
+
+def test_segments_between_empty():
+    t = timings({"words": [], "segments": []})
+    assert t.segments_between(0, 10) == []
+
+
+@pytest.mark.parametrize("value,seconds", [("750", 750), ("750.5", 750.5), ("12:30", 750), ("01:12:30", 4350)])
+def test_parse_timestamp(value, seconds):
+    assert math.isclose(parse_timestamp(value), seconds)
+
+
+@pytest.mark.parametrize("value", ["inf", "nan", "-5", "1:inf", "abc", ""])
+def test_parse_timestamp_rejects_non_finite_and_invalid(value):
+    with pytest.raises(ValueError):
+        parse_timestamp(value)
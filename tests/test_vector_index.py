@@ -0,0 +1,86 @@
+import numpy as np
+
+from app.services.vector_index import VectorIndex
+
+DIM = 16
+
+
+def unit(rows: np.ndarray) -> np.ndarray:
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def meetings(count: int, passages: int = 4, seed: int = 1) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return {f"m{i}": unit(rng.normal(size=(passages, DIM))) for i in range(count)}
+
+
+def test_exact_search_returns_best_passage_per_meeting():
+    index = VectorIndex(DIM)
+    data = meetings(5)
+    for meeting_id, vectors in data.items():
+        index.add(meeting_id, vectors)
+
+    hits = index.search(data["m3"][2], k=3)
+    assert not index.is_ivf
+    assert hits[0][0] == "m3" and hits[0][2] == 2
+    assert hits[0][1] > 0.99
+    assert len({meeting_id for meeting_id, _, _ in hits}) == 3
+    assert [score for _, score, _ in hits] == sorted((score for _, score, _ in hits), reverse=True)
+
+
+def test_readding_replaces_rows_and_remove_drops_them():
+    index = VectorIndex(DIM)
+    data = meetings(3)
+    for meeting_id, vectors in data.items():
+        index.add(meeting_id, vectors)
+
+    # m0 now holds a single copy of m1's first passage
+    index.add("m0", data["m1"][:1])
+    assert len(index) == 9
+    hits = index.search(data["m1"][0], k=2)
+    assert {meeting_id for meeting_id, _, _ in hits} == {"m0", "m1"}
+    assert all(score > 0.99 and position == 0 for _, score, position in hits)
+
+    assert index.remove("m1")
+    assert not index.remove("m1")
+    assert "m1" not in index
+    assert all(meeting_id != "m1" for meeting_id, _, _ in index.search(data["m1"][0], k=3))
+
+
+def test_compaction_keeps_results():
+    index = VectorIndex(DIM)
+    data = meetings(8)
+    for meeting_id, vectors in data.items():
+        index.add(meeting_id, vectors)
+    for meeting_id in ("m0", "m1", "m2"):
+        index.remove(meeting_id)
+
+    # 12 of 32 rows dead: compacted
+    assert index._size == len(index) == 20
+    for meeting_id in ("m3", "m7"):
+        best = index.search(data[meeting_id][1], k=1)
+        assert best == [(meeting_id, best[0][1], 1)]
+
+
+def test_ivf_finds_what_exact_search_finds():
+    data = meetings(300, passages=4, seed=2)
+    exact, ivf = VectorIndex(DIM), VectorIndex(DIM, ivf_min_vectors=500, nprobe=8)
+    for meeting_id, vectors in data.items():
+        exact.add(meeting_id, vectors)
+        ivf.add(meeting_id, vectors)
+    assert ivf.is_ivf and not exact.is_ivf
+    assert ivf.stats()["lists"] > 1
+
+    # Queries close to a stored passage land in a probed list
+    rng = np.random.default_rng(3)
+    queries = [("m%d" % i, unit(data["m%d" % i][0][None] + 0.05 * rng.normal(size=(1, DIM)))[0]) for i in range(0, 300, 15)]
+    for meeting_id, query in queries:
+        assert exact.search(query, k=1)[0][0] == meeting_id
+        assert ivf.search(query, k=1)[0][0] == meeting_id
+
+
+def test_empty_index():
+    index = VectorIndex(DIM)
+    assert index.search(unit(np.ones((1, DIM)))[0]) == []
+    index.add("m0", np.zeros((0, DIM)))
+    assert "m0" not in index and len(index) == 0
@@ -0,0 +1,91 @@
+"""
+Benchmark: combined (single call) vs graph (six nodes) MoM extraction.
+
+Reports wall time and input/output tokens per mode for
+transcripts of increasing size. Runs against whatever provider the env points
+at; for an offline run use the fake provider:
+
+    FAKE_PROVIDER_URL=inprocess FAKE_PROVIDER_CHAT_LATENCY=lognormal:900,0.3 \\
+        python verification/bench_mom_modes.py --sizes 500 2000 4000
+"""
+import os
+import sys
+import time
+import json
+import asyncio
+import argparse
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_core.callbacks import get_usage_metadata_callback
+
+from app.services.mom_service import MoMService, MomMode
+from app.services.tokens import estimate_tokens
+
+SAMPLE_LINES = [
+    "Alice: Let's start the meeting. The main goal today is to decide on the UI framework for the new dashboard.",
+    "Bob: I suggest we use React because the team is already familiar with it.",
+    "Charlie: Vue might be lighter. However, React has better library support.",
+    "Alice: Okay, agreed. Let's go with React.",
+    "Bob: I will set up the repository by tomorrow.",
+    "Charlie: I'll have the wireframes ready by Wednesday.",
+    "Alice: Great. Also, we need to hire a new backend dev. The budget is approved.",
+    "Alice: Bob, can you also look into the CI/CD pipeline issues?",
+    "Bob: Sure, I'll add that to my list.",
+]
+
+
+def make_transcript(tokens: int) -> str:
+    lines = []
+    while estimate_tokens("\n".join(lines)) < tokens:
+        lines.append(SAMPLE_LINES[len(lines) % len(SAMPLE_LINES)])
+    return "\n".join(lines)
+
+
+async def measure(service: MoMService, transcript: str, mode: MomMode) -> dict:
+    with get_usage_metadata_callback() as usage:
+        t0 = time.perf_counter()
+        await service.agenerate_mom(transcript, mode=mode)
+        elapsed = time.perf_counter() - t0
+
+    totals = {"input_tokens": 0, "output_tokens": 0}
+    for model_usage in usage.usage_metadata.values():
+        totals["input_tokens"] += model_usage.get("input_tokens", 0)
+        totals["output_tokens"] += model_usage.get("output_tokens", 0)
+    return {"seconds": round(elapsed, 3), **totals}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 4000], help="Transcript sizes (tokens)")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    service = MoMService()
+    results = []
+    for size in args.sizes:
+        transcript = make_transcript(size)
+        for mode in (MomMode.COMBINED, MomMode.GRAPH):
+            runs = [await measure(service, transcript, mode) for _ in range(args.repeats)]
+            row = {
+                "tokens": size,
+                "mode": mode.value,
+                "seconds": round(sorted(r["seconds"] for r in runs)[len(runs) // 2], 3),
+                "input_tokens": runs[-1]["input_tokens"],
+                "output_tokens": runs[-1]["output_tokens"],
+            }
+            results.append(row)
+            print(json.dumps(row))
+
+    print("\n🔹 Combined vs graph")
+    for size in args.sizes:
+        combined, graph = [r for r in results if r["tokens"] == size]
+        print(
+            f"{size:>6} tokens: latency x{graph['seconds'] / max(combined['seconds'], 1e-9):.1f}, "
+            f"input tokens x{graph['input_tokens'] / max(combined['input_tokens'], 1):.1f} (graph / combined)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
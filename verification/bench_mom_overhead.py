@@ -0,0 +1,99 @@
+"""
+Micro-benchmark: per-request framework overhead of MoM generation.
+
+Uses an instant in-memory chat model (no network), so the measured time is
+LangGraph / LangChain overhead only:
+- "rebuild": what generate_mom used to do per request (rebuild six prompt ->
+  with_structured_output chains, rebuild and compile the graph) + invoke
+- "precompiled": invoke the graph/chains compiled once at service construction
+
+Usage:
+    python verification/bench_mom_overhead.py --iterations 200
+"""
+import os
+import sys
+import time
+import json
+import argparse
+import statistics
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from app.services.fake_provider import example_from_schema
+from app.services.mom_service import MoMService
+
+TRANSCRIPT = """
+Alice: Let's start the meeting. The main goal today is to decide on the UI framework for the new dashboard.
+Bob: I suggest we use React because the team is already familiar with it.
+Charlie: Vue might be lighter. However, React has better library support.
+Alice: Okay, agreed. Let's go with React.
+Bob: I will set up the repository by tomorrow.
+"""
+
+
+class InstantToolChatModel(BaseChatModel):
+    """
+    Answers every structured-output request immediately with a schema-valid tool call.
+    """
+    @property
+    def _llm_type(self) -> str:
+        return "instant-tool"
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        tool = kwargs["tools"][0]["function"]
+        args = example_from_schema(tool["parameters"], tool["parameters"], tool["name"])
+        message = AIMessage(content="", tool_calls=[{"name": tool["name"], "args": args, "id": "call_0"}])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def run(label: str, fn, iterations: int) -> dict:
+    fn()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    stats = {
+        "mean_ms": round(statistics.mean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+    }
+    print(f"{label:<12} {json.dumps(stats)}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    service = MoMService(llm=InstantToolChatModel())
+
+    def rebuild():
+        service.chains = service._build_chains()  # pylint: disable=protected-access
+        app = service.build_graph()
+        app.invoke({"transcription": TRANSCRIPT}, config={"max_concurrency": service.max_concurrency})
+
+    def precompiled():
+        service.generate_mom(TRANSCRIPT)
+
+    print(f"🔹 {args.iterations} iterations, instant LLM (framework overhead only)")
+    before = run("rebuild", rebuild, args.iterations)
+    after = run("precompiled", precompiled, args.iterations)
+    saved = before["mean_ms"] - after["mean_ms"]
+    print(f"✅ Saved {saved:.2f} ms per request ({saved / before['mean_ms'] * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Reproducible MoM pipeline benchmark: record provider responses once, replay them.
+
+1. Record real LLM (and optionally Whisper) responses for a corpus of transcript
+   sizes and every MoM mode into a fixture (uses whatever provider the env points at):
+
+    python verification/bench_mom_replay.py record --sizes 500 2000 8000 30000 --audio sample.ogg
+
+2. Replay them with the recorded latencies (or scaled ones) and measure, per
+   transcript x mode: end-to-end wall time, framework overhead (replay with zero
+   latency), peak Python memory (tracemalloc), LLM calls / tokens, and latency /
+   throughput under N concurrent requests:
+
+    python verification/bench_mom_replay.py run --latency-scale 1.0 --concurrency 1 8 --save-baseline
+    python verification/bench_mom_replay.py run --baseline verification/fixtures/mom_replay_baseline.json
+
+verification/fixtures/ holds a fixture recorded from the in-process fake provider
+(constant 50 ms chat latency, synthetic transcripts of 500 / 2000 / 8000 tokens)
+and the baseline saved from replaying it:
+
+    FAKE_PROVIDER_URL=inprocess FAKE_PROVIDER_CHAT_LATENCY=constant:50 \\
+        python verification/bench_mom_replay.py record --sizes 500 2000 8000
+    python verification/bench_mom_replay.py run --save-baseline
+
+LLM calls and tokens compare across machines; timings and memory only against a
+baseline saved on the same hardware, so re-save it on the machine that runs the check.
+
+With --baseline the run exits with status 1 when a metric regresses by more than
+--tolerance (relative, with a small absolute slack for noise-level timings),
+when the baseline file is missing, or when a scenario is only on one side.
+"""
+import io
+import os
+import sys
+import time
+import json
+import asyncio
+import argparse
+import statistics
+import tracemalloc
+from contextlib import redirect_stdout, nullcontext
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.mom_service import MoMService, MomMode
+from app.services.llms import LLMService
+from app.services.transcribers import TranscriptionService
+from app.services.llm_cache import llm_cache
+from verification.bench_mom_modes import make_transcript
+from verification.mom_replay import (
+    Fixture,
+    RecordingChatModel,
+    ReplayChatModel,
+    RecordingTranscriber,
+    ReplayTranscriber
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_FIXTURE = os.path.join(FIXTURES_DIR, "mom_replay.json")
+DEFAULT_BASELINE = os.path.join(FIXTURES_DIR, "mom_replay_baseline.json")
+
+# Absolute slack below which a difference is treated as noise
+SLACK = {"ms": 2.0, "kib": 64.0}
+
+
+def _quiet(verbose: bool):
+    # MoMService prints a line per node; keep it out of the measurements unless asked
+    return nullcontext() if verbose else redirect_stdout(io.StringIO())
+
+
+def _median(values: list[float]) -> float:
+    return round(statistics.median(values), 3)
+
+
+def _p95(values: list[float]) -> float:
+    ordered = sorted(values)
+    return round(ordered[min(int(0.95 * len(ordered)), len(ordered) - 1)], 3)
+
+
+def _read_audio(item: dict) -> bytes:
+    with open(item["path"], "rb") as f:
+        return f.read()
+
+
+# --- Record ---
+
+async def record(args) -> None:
+    fixture = Fixture()
+    service = MoMService(llm=RecordingChatModel(inner=LLMService().chat_model, fixture=fixture))
+    modes = [MomMode(m) for m in args.modes]
+
+    corpus = [{"name": f"synthetic_{size}", "kind": "text", "transcript": make_transcript(size)} for size in args.sizes]
+    for path in args.corpus or []:
+        with open(path, "r", encoding="utf-8") as f:
+            corpus.append({"name": os.path.basename(path), "kind": "text", "transcript": f.read()})
+
+    transcriber = RecordingTranscriber(TranscriptionService(), fixture)
+    for path in args.audio or []:
+        print(f"🎙️ Recording transcription of {path}")
+        item = {"name": os.path.basename(path), "kind": "audio", "path": os.path.abspath(path)}
+        result = await asyncio.to_thread(transcriber.whisper_transcribe, _read_audio(item), item["name"])
+        item["transcript"] = result["text"]
+        corpus.append(item)
+
+    for item in corpus:
+        for mode in modes:
+            print(f"🔹 Recording {item['name']} / {mode.value}")
+            t0 = time.perf_counter()
+            with _quiet(args.verbose):
+                await service.agenerate_mom(item["transcript"], mode=mode, bypass_cache=True)
+            print(f"   {time.perf_counter() - t0:.2f}s")
+
+    fixture.data["corpus"] = corpus
+    fixture.data["modes"] = [m.value for m in modes]
+    os.makedirs(os.path.dirname(os.path.abspath(args.fixture)), exist_ok=True)
+    fixture.save(args.fixture)
+    print(f"✅ Recorded {sum(len(v) for v in fixture.data['chat'].values())} chat responses, "
+          f"{len(fixture.data['transcriptions'])} transcriptions -> {args.fixture}")
+
+
+# --- Replay ---
+
+class ReplayBench:
+    def __init__(self, fixture: Fixture, latency_scale: float, verbose: bool):
+        self.fixture = fixture
+        self.latency_scale = latency_scale
+        self.verbose = verbose
+        self.llm = ReplayChatModel(fixture=fixture, latency_scale=latency_scale)
+        self.service = MoMService(llm=self.llm)
+        self.transcriber = ReplayTranscriber(fixture, latency_scale)
+
+    def _set_scale(self, scale: float) -> None:
+        self.llm.latency_scale = scale
+        self.transcriber.latency_scale = scale
+
+    async def run_once(self, item: dict, mode: MomMode, audio: bytes | None) -> float:
+        t0 = time.perf_counter()
+        transcript = item["transcript"]
+        if audio is not None:
+            result = await asyncio.to_thread(self.transcriber.whisper_transcribe, audio, item["name"])
+            transcript = result["text"]
+        await self.service.agenerate_mom(transcript, mode=mode, bypass_cache=True)
+        return (time.perf_counter() - t0) * 1000
+
+    async def scenario(self, item: dict, mode: MomMode, repeats: int, concurrency: list[int]) -> dict:
+        audio = _read_audio(item) if item["kind"] == "audio" else None
+        with _quiet(self.verbose):
+            # Warm-up (imports, tokenizer, first-call setup)
+            self._set_scale(0)
+            await self.run_once(item, mode, audio)
+
+            # Framework overhead: replay with zero provider latency
+            overhead = [await self.run_once(item, mode, audio) for _ in range(repeats)]
+
+            # LLM calls / tokens and peak Python memory of one run
+            self.llm.reset_counters()
+            tracemalloc.start()
+            await self.run_once(item, mode, audio)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            counters = self.llm.counters()
+
+            # End-to-end with recorded (scaled) latencies
+            self._set_scale(self.latency_scale)
+            wall = [await self.run_once(item, mode, audio) for _ in range(repeats)]
+
+            row = {
+                "wall_ms": _median(wall),
+                "overhead_ms": _median(overhead),
+                "peak_kib": round(peak / 1024, 1),
+                **counters,
+            }
+            for n in concurrency:
+                t0 = time.perf_counter()
+                latencies = await asyncio.gather(*(self.run_once(item, mode, audio) for _ in range(n)))
+                elapsed = time.perf_counter() - t0
+                row[f"c{n}_p95_ms"] = _p95(latencies)
+                row[f"c{n}_runs_per_s"] = round(n / elapsed, 2)
+        return row
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Regressions of `results` against `baseline` (metrics where lower is better).
+    """
+    regressions = []
+    # Every scenario must be measured on both sides: a skipped one is not a pass
+    for scenario in baseline.keys() - results.keys():
+        regressions.append(f"{scenario}: in the baseline but not measured")
+    for scenario, metrics in results.items():
+        base = baseline.get(scenario)
+        if not base:
+            regressions.append(f"{scenario}: not in the baseline (re-save it with --save-baseline)")
+            continue
+        for metric, value in metrics.items():
+            if metric not in base or metric.endswith("_runs_per_s"):
+                continue
+            if metric in ("llm_calls", "input_tokens", "output_tokens"):
+                limit = base[metric]
+            else:
+                unit = "kib" if metric.endswith("_kib") else "ms"
+                limit = base[metric] * (1 + tolerance) + SLACK[unit]
+            if value > limit:
+                regressions.append(f"{scenario} {metric}: {base[metric]} -> {value}")
+        for metric in (m for m in metrics if m.endswith("_runs_per_s")):
+            if metric in base and metrics[metric] < base[metric] * (1 - tolerance):
+                regressions.append(f"{scenario} {metric}: {base[metric]} -> {metrics[metric]}")
+    return regressions
+
+
+async def run(args) -> int:
+    if args.baseline and not os.path.exists(args.baseline):
+        # Fail before spending minutes on the replay
+        print(f"❌ Baseline {args.baseline} not found")
+        return 1
+    fixture = Fixture.load(args.fixture)
+    # Benchmark the pipeline, not the structured-output cache
+    llm_cache.enabled = False
+
+    bench = ReplayBench(fixture, args.latency_scale, args.verbose)
+    modes = [MomMode(m) for m in (args.modes or fixture.data.get("modes", []))]
+    results = {}
+    for item in fixture.corpus:
+        if item["kind"] == "audio" and not os.path.exists(item["path"]):
+            print(f"⚠️ Skipping {item['name']}: {item['path']} not found")
+            continue
+        for mode in modes:
+            scenario = f"{item['name']}/{mode.value}"
+            results[scenario] = await bench.scenario(item, mode, args.repeats, args.concurrency)
+            print(f"{scenario:<32} {json.dumps(results[scenario])}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"   {line}")
+            status = 1
+        else:
+            print(f"\n✅ No regressions against {args.baseline}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Baseline saved to {args.save_baseline}")
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    modes = [m.value for m in MomMode]
+
+    rec = sub.add_parser("record", help="Record provider responses into a fixture")
+    rec.add_argument("--sizes", type=int, nargs="*", default=[500, 2000, 8000, 30000], help="Synthetic transcript sizes (tokens)")
+    rec.add_argument("--corpus", nargs="*", help="Extra transcript .txt files")
+    rec.add_argument("--audio", nargs="*", help="Audio files (transcribed, then MoM'd)")
+    rec.add_argument("--modes", nargs="+", default=modes, choices=modes)
+    rec.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    rec.add_argument("--verbose", action="store_true")
+
+    rep = sub.add_parser("run", help="Replay a fixture and measure")
+    rep.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    rep.add_argument("--modes", nargs="+", choices=modes, help="Default: the recorded modes")
+    rep.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier on recorded latencies")
+    rep.add_argument("--repeats", type=int, default=3)
+    rep.add_argument("--concurrency", type=int, nargs="*", default=[1, 8])
+    rep.add_argument("--baseline", help="Fail (exit 1) on regressions against this baseline")
+    rep.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help=f"Write results as baseline (default {DEFAULT_BASELINE})")
+    rep.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown")
+    rep.add_argument("--output", help="Write results JSON here")
+    rep.add_argument("--verbose", action="store_true")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        asyncio.run(record(args))
+        return
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Record / replay of LLM and transcription responses for reproducible MoM benchmarks.
+
+- RecordingChatModel wraps the real chat model (LLMService.chat_model) and stores
+  every response with its latency.
+- ReplayChatModel answers the same requests from the fixture, sleeping for the
+  recorded latency times `latency_scale` (0 = instant, framework overhead only).
+- RecordingTranscriber / ReplayTranscriber do the same for Whisper transcription.
+
+Requests are keyed by sha256 of the prompt messages and the requested tool
+names, so replay only works for the prompts that were recorded: re-record after
+changing prompts or schemas. Used by verification/bench_mom_replay.py.
+"""
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import ConfigDict, PrivateAttr
+
+FIXTURE_VERSION = 1
+
+
+def request_key(messages, tool_names: Optional[list[str]] = None) -> str:
+    payload = json.dumps({
+        "messages": [[m.type, m.content] for m in messages],
+        "tools": sorted(tool_names or []),
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def audio_key(file_content: bytes) -> str:
+    return hashlib.sha256(file_content).hexdigest()
+
+
+def _tool_names(tools) -> list[str]:
+    return [convert_to_openai_tool(t)["function"]["name"] for t in tools]
+
+
+class Fixture:
+    """
+    Recorded responses: {"chat": {key: [response, ...]}, "transcriptions": {key: {...}}, "corpus": [...]}.
+    A key seen several times while recording keeps every response; replay cycles through them.
+    """
+    def __init__(self, data: Optional[dict] = None):
+        self.data = data or {
+            "version": FIXTURE_VERSION,
+            "recorded_on": datetime.now().isoformat(timespec="seconds"),
+            "corpus": [],
+            "chat": {},
+            "transcriptions": {},
+        }
+        self._cursor: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "Fixture":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != FIXTURE_VERSION:
+            raise ValueError(f"Unsupported fixture version {data.get('version')} in {path}, re-record it")
+        return cls(data)
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f)
+
+    @property
+    def corpus(self) -> list[dict]:
+        return self.data["corpus"]
+
+    def add_chat(self, key: str, response: dict) -> None:
+        with self._lock:
+            self.data["chat"].setdefault(key, []).append(response)
+
+    def next_chat(self, key: str) -> dict:
+        with self._lock:
+            responses = self.data["chat"].get(key)
+            if not responses:
+                raise KeyError(f"No recorded response for request {key[:12]} (prompts changed? re-record the fixture)")
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            return responses[index % len(responses)]
+
+    def add_transcription(self, key: str, result: dict, seconds: float) -> None:
+        with self._lock:
+            self.data["transcriptions"][key] = {"result": result, "seconds": seconds}
+
+    def transcription(self, key: str) -> dict:
+        recorded = self.data["transcriptions"].get(key)
+        if recorded is None:
+            raise KeyError(f"No recorded transcription for audio {key[:12]}")
+        return recorded
+
+
+def _message_to_dict(message: AIMessage) -> dict:
+    return {
+        "content": message.content,
+        "tool_calls": message.tool_calls,
+        "usage_metadata": message.usage_metadata,
+    }
+
+
+def _message_from_dict(data: dict) -> AIMessage:
+    return AIMessage(
+        content=data.get("content", ""),
+        tool_calls=data.get("tool_calls") or [],
+        usage_metadata=data.get("usage_metadata"),
+    )
+
+
+# --- Chat models ---
+
+class RecordingChatModel(BaseChatModel):
+    """
+    Delegates to `inner` and records every response (and its latency) into `fixture`.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseChatModel
+    fixture: Fixture
+    model_name: str = "recording"
+
+    @property
+    def _llm_type(self) -> str:
+        return "recording"
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        inner_kwargs = self.inner.bind_tools(tools, tool_choice=tool_choice, **kwargs).kwargs
+        # Tracing-only kwargs are consumed by BaseChatModel.generate, which is bypassed below
+        inner_kwargs = {k: v for k, v in inner_kwargs.items() if not k.startswith("ls_")}
+        return self.bind(inner_kwargs=inner_kwargs, tool_names=_tool_names(tools))
+
+    def _record(self, messages, tool_names, result: ChatResult, seconds: float) -> ChatResult:
+        self.fixture.add_chat(request_key(messages, tool_names), {
+            **_message_to_dict(result.generations[0].message),
+            "seconds": round(seconds, 4),
+        })
+        return result
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        inner_kwargs, tool_names = kwargs.pop("inner_kwargs", {}), kwargs.pop("tool_names", None)
+        t0 = time.perf_counter()
+        result = self.inner._generate(messages, stop=stop, **inner_kwargs, **kwargs)  # pylint: disable=protected-access
+        return self._record(messages, tool_names, result, time.perf_counter() - t0)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        inner_kwargs, tool_names = kwargs.pop("inner_kwargs", {}), kwargs.pop("tool_names", None)
+        t0 = time.perf_counter()
+        result = await self.inner._agenerate(messages, stop=stop, **inner_kwargs, **kwargs)  # pylint: disable=protected-access
+        return self._record(messages, tool_names, result, time.perf_counter() - t0)
+
+
+class ReplayChatModel(BaseChatModel):
+    """
+    Answers from `fixture` after the recorded latency x `latency_scale`.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    fixture: Fixture
+    latency_scale: float = 1.0
+    model_name: str = "replay"
+
+    _calls: int = PrivateAttr(default=0)
+    _usage: dict = PrivateAttr(default_factory=lambda: {"input_tokens": 0, "output_tokens": 0})
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        return self.bind(tool_names=_tool_names(tools))
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self._calls = 0
+            self._usage = {"input_tokens": 0, "output_tokens": 0}
+
+    def counters(self) -> dict:
+        with self._lock:
+            return {"llm_calls": self._calls, **self._usage}
+
+    def _replay(self, messages, tool_names) -> tuple[ChatResult, float]:
+        recorded = self.fixture.next_chat(request_key(messages, tool_names))
+        message = _message_from_dict(recorded)
+        with self._lock:
+            self._calls += 1
+            for key in self._usage:
+                self._usage[key] += (message.usage_metadata or {}).get(key, 0)
+        return ChatResult(generations=[ChatGeneration(message=message)]), recorded["seconds"] * self.latency_scale
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        result, delay = self._replay(messages, kwargs.get("tool_names"))
+        if delay:
+            time.sleep(delay)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        result, delay = self._replay(messages, kwargs.get("tool_names"))
+        if delay:
+            await asyncio.sleep(delay)
+        return result
+
+
+# --- Transcription ---
+
+class RecordingTranscriber:
+    """
+    Wraps TranscriptionService.whisper_transcribe and records its results.
+    """
+    def __init__(self, service, fixture: Fixture):
+        self.service = service
+        self.fixture = fixture
+
+    def whisper_transcribe(self, file_content: bytes, filename: str, **kwargs) -> dict:
+        t0 = time.perf_counter()
+        result = self.service.whisper_transcribe(file_content, filename, **kwargs)
+        self.fixture.add_transcription(audio_key(file_content), result, round(time.perf_counter() - t0, 4))
+        return result
+
+
+class ReplayTranscriber:
+    """
+    Returns recorded transcriptions after the recorded latency x `latency_scale`.
+    """
+    def __init__(self, fixture: Fixture, latency_scale: float = 1.0):
+        self.fixture = fixture
+        self.latency_scale = latency_scale
+
+    def whisper_transcribe(self, file_content: bytes, filename: str, **kwargs) -> dict:
+        recorded = self.fixture.transcription(audio_key(file_content))
+        if recorded["seconds"] * self.latency_scale:
+            time.sleep(recorded["seconds"] * self.latency_scale)
+        return recorded["result"]
@@ -0,0 +1,134 @@
+"""
+Checks, via explain(), that every hot controller query is served by an index.
+
+Initialises Beanie (which creates the declared indexes) on a scratch database,
+inserts one sample document per collection and explains:
+- login / register lookups (email, username) and the user secrets lookup
+- meeting and recording list pages (first page and cursor page), which must also
+  avoid an in-memory SORT stage, since keyset pagination relies on index order
+- the recordings dashboard count and the meetings full-text search
+- semantic search index loads / incremental syncs of meeting embeddings
+
+Usage (needs a MongoDB at MONGODB_URL; the scratch database is dropped afterwards):
+    python verification/verify_indexes.py [--database eazzmeetings_index_check]
+
+tests/test_query_plans.py runs the same checks when a MongoDB is reachable.
+"""
+import os
+import sys
+import asyncio
+import argparse
+from datetime import datetime
+
+# Add parent directory to path to allow importing 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from beanie import init_beanie
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.env_settings import env
+from app.models.database.connection import DOCUMENT_MODELS
+from app.models.database import (
+    UserCollection, UserSecretsCollection, MeetingCollection, RecordingCollection, MeetingEmbeddingCollection
+)
+from app.controllers.meetings_ctrl import MEETING_SUMMARY_PROJECTION
+from app.controllers.recordings_ctrl import RECORDING_OUT_PROJECTION
+from app.services.meeting_search import build_search_pipeline
+from app.utils.pagination import keyset_pipeline, encode_cursor
+from app.utils.query_plans import assert_uses_index, explain_find, explain_count, explain_aggregate
+
+
+async def seed(db) -> dict:
+    """
+    One document per collection (an empty collection explains as EOF, not as an index scan).
+    """
+    now = datetime.now()
+    user_id, org_id = ObjectId(), ObjectId()
+    await db[UserCollection.get_collection_name()].insert_one(
+        {"_id": user_id, "username": "index-check", "email": "index-check@example.com", "org_id": org_id, "created_on": now}
+    )
+    await db[UserSecretsCollection.get_collection_name()].insert_one({"user_id": user_id, "password_hash": "x", "org_id": org_id})
+    meeting = await db[MeetingCollection.get_collection_name()].insert_one(
+        {"org_id": org_id, "created_by": user_id, "created_on": now, "transcription": "We agreed to move to AWS"}
+    )
+    await db[MeetingEmbeddingCollection.get_collection_name()].insert_one(
+        {"meeting_id": meeting.inserted_id, "org_id": org_id, "created_by": user_id, "model": "m", "dim": 2, "updated_on": now}
+    )
+    recording = await db[RecordingCollection.get_collection_name()].insert_one(
+        {"org_id": str(org_id), "created_by": str(user_id), "creation_date": now, "name": "x", "file_path": "x"}
+    )
+    return {
+        "user_id": user_id,
+        "org_id": org_id,
+        "meeting_cursor": encode_cursor(now, meeting.inserted_id),
+        "recording_cursor": encode_cursor(now, recording.inserted_id),
+    }
+
+
+async def check_indexes(db) -> list[tuple[str, bool, str]]:
+    """
+    Creates the declared indexes on `db` (a scratch database), seeds it and explains
+    every hot query: [(label, uses an index, index name or failure)].
+    """
+    await init_beanie(database=db, document_models=DOCUMENT_MODELS)
+    ids = await seed(db)
+    users = UserCollection.get_collection_name()
+    secrets = UserSecretsCollection.get_collection_name()
+    meetings = MeetingCollection.get_collection_name()
+    recordings = RecordingCollection.get_collection_name()
+    embeddings = MeetingEmbeddingCollection.get_collection_name()
+
+    def meeting_page(query, cursor=None):
+        return [*keyset_pipeline(query, "created_on", cursor, 0, 50), {"$project": MEETING_SUMMARY_PROJECTION}]
+
+    def recording_page(query, cursor=None):
+        return [*keyset_pipeline(query, "creation_date", cursor, 0, 5), {"$project": RECORDING_OUT_PROJECTION}]
+
+    org, user = ids["org_id"], ids["user_id"]
+    checks = [
+        ("login by email", explain_find(db, users, {"email": "index-check@example.com"}), True),
+        ("login by username", explain_find(db, users, {"username": "index-check"}), True),
+        ("user secrets", explain_find(db, secrets, {"user_id": user}), True),
+        ("meetings by org", explain_aggregate(db, meetings, meeting_page({"org_id": org})), False),
+        ("meetings by org, cursor", explain_aggregate(db, meetings, meeting_page({"org_id": org}, ids["meeting_cursor"])), False),
+        ("meetings by creator", explain_aggregate(db, meetings, meeting_page({"created_by": user})), False),
+        ("recordings by org", explain_aggregate(db, recordings, recording_page({"org_id": str(org)})), False),
+        ("recordings by org, cursor", explain_aggregate(db, recordings, recording_page({"org_id": str(org)}, ids["recording_cursor"])), False),
+        ("recordings by creator", explain_aggregate(db, recordings, recording_page({"created_by": str(user)})), False),
+        ("recordings count", explain_count(db, recordings, {"org_id": str(org)}), True),
+        ("meetings search", explain_aggregate(db, meetings, build_search_pipeline("aws", {"org_id": org}, MEETING_SUMMARY_PROJECTION)), True),
+        ("embeddings sync", explain_find(db, embeddings, {"org_id": org, "model": "m", "dim": 2, "updated_on": {"$gt": datetime.now()}}), True),
+    ]
+    results = []
+    for label, explain, allow_sort in checks:
+        try:
+            results.append((label, True, assert_uses_index(await explain, label, allow_sort=allow_sort)))
+        except AssertionError as e:
+            results.append((label, False, str(e)))
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="eazzmeetings_index_check", help="Scratch database (dropped afterwards)")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(env.MONGODB_URL)
+    await client.drop_database(args.database)
+    try:
+        results = await check_indexes(client[args.database])
+    finally:
+        await client.drop_database(args.database)
+
+    for label, ok, detail in results:
+        print(f"✅ {label:<28} {detail}" if ok else f"❌ {detail}")
+    failures = sum(1 for _, ok, _ in results if not ok)
+    if failures:
+        print(f"\n❌ {failures} quer{'y' if failures == 1 else 'ies'} without a usable index")
+        sys.exit(1)
+    print("\n✅ All controller queries use an index")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())